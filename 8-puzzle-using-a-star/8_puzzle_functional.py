@@ -1,6 +1,10 @@
+import time
 import tkinter as tk
 from tkinter import messagebox
 
+from search_stats import SearchStats
+from solvability import is_solvable
+
 
 def my_reduce(function, iter, accumulator):
     if not iter:
@@ -31,35 +35,6 @@ def compose(f, g):
     return lambda *args: f(g(*args))
 
 
-def flatten(puzzle):
-    return my_reduce(
-        lambda row, acc: acc + tuple(my_filter(lambda x: x != "_", row)),
-        puzzle,
-        tuple(),
-    )
-
-
-def count_inversions(arr):
-    return my_reduce(
-        lambda index, acc: acc
-        + my_reduce(
-            lambda index_inner, inner_acc: inner_acc
-            + (1 if arr[index] > arr[index_inner] else 0),
-            range(index + 1, len(arr)),
-            0,
-        ),
-        range(len(arr)),
-        0,
-    )
-
-
-def is_solvable(puzzle):
-
-    flat_puzzle = flatten(puzzle)
-    inversions = count_inversions(flat_puzzle)
-    return inversions % 2 == 0
-
-
 def find_blank(puz, x="_"):
     if not puz:
         return None
@@ -148,25 +123,42 @@ def heuristic(start, goal):
     return count_misplaced(start, goal)
 
 
-def solve_puzzle(start, goal, heuristic_func):
-    def process(open_list, closed_list):
+def solve_puzzle(start, goal, heuristic_func, stats=False):
+    """Solve the puzzle; with stats=True, return (closed list, SearchStats) instead of the closed list."""
+
+    def process(open_list, closed_list, counts):
+        # counts: (generated, peak size of the open list), carried instead of mutated
         if not open_list:
-            return closed_list
+            return closed_list, counts
         open_list = tuple(sorted(open_list, key=lambda x: x["fval"]))
         current = open_list[0]
         closed_list += (current,)
+        counts = (counts[0], max(counts[1], len(open_list)))
         if heuristic_func(current["data"], goal) == 0:
-            return closed_list
+            return closed_list, counts
         children = generate_children(
             current["data"], current["level"], current["fval"], goal, heuristic_func
         )
         new_open_list = open_list[1:] + children
-        return process(new_open_list, closed_list)
+        return process(new_open_list, closed_list, (counts[0] + len(children), counts[1]))
 
-    if not is_solvable(start):
+    if not is_solvable(start, goal):
         raise ValueError("Puzzle is unsolvable.")
+    began = time.perf_counter()
     start_node = {"data": start, "level": 0, "fval": heuristic_func(start, goal)}
-    return process((start_node,), ())
+    closed_list, (generated, peak_open) = process((start_node,), (), (0, 0))
+    if not stats:
+        return closed_list
+    found = heuristic_func(closed_list[-1]["data"], goal) == 0
+    return closed_list, SearchStats(
+        "functional",
+        expanded=len(closed_list) - found,
+        generated=generated,
+        pushes=generated + 1,
+        pops=len(closed_list),
+        peak_open=peak_open,
+        seconds=time.perf_counter() - began,
+    )
 
 
 def print_solution(solution):
@@ -1,112 +1,117 @@
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
 
+from board import Board
+from heuristics import make_heuristic
+from move_pruning import ROOT, MoveAutomaton
+from open_list import make_open_list
+import pattern_database  # Registers the "pdb" heuristic
+from search_stats import SearchStats
+from solvability import is_solvable
+from symmetry import BoardSymmetry
+from transposition_table import TranspositionTable
+import walking_distance  # Registers the "walking_distance" heuristic
+
+POLL_MS = 50  # How often the GUI checks the solver thread for events
+PROGRESS_EVERY = 2000  # Expansions between two progress events (and cancellation checks)
+
 
 class Node:
     """
     This class represents a node in the puzzle search tree for solving problems like the 8-puzzle.
-    Each node contains a configuration of the puzzle, the depth of the node (level),
-    and a heuristic value (fval), which helps in guiding the search towards the goal.
+    Each node contains a configuration of the puzzle packed into an integer (see board.Board),
+    the depth of the node (level), and a heuristic value (fval), which helps in guiding the search towards the goal.
     """
 
-    def __init__(self, data, level, fval):
+    __slots__ = ("board", "state", "blank", "level", "fval", "move", "fsm")
+
+    def __init__(self, board, state, blank, level, fval, move=None, fsm=ROOT):
         """
         Initializes the node with a given puzzle configuration, its level in the search tree,
         and the associated heuristic value.
 
         Args:
-            data (list of list): 2D list representing the puzzle configuration.
+            board (Board): The layout of the puzzle, shared by every node of a search.
+            state (int): The puzzle configuration packed into an integer.
+            blank (int): The cell index of the blank space ('_').
             level (int): The depth of the current node in the search tree.
             fval (int or float): The heuristic value (or cost) of the node, used in search algorithms like A*.
+            move (str): The move of the blank space that created this node ("L", "R", "U", "D"), None for the root.
+            fsm (int): The state of the move automaton after the moves that led here (see move_pruning).
         """
-        self.data = data  # Current puzzle configuration (2D list)
+        self.board = board  # Layout and move tables of the puzzle
+        self.state = state  # Current puzzle configuration (packed integer)
+        self.blank = blank  # Cell index of the blank space
         self.level = level  # Depth in the search tree (number of moves from root)
         self.fval = fval  # Heuristic value or cost (typically 0 for non-leaf nodes)
+        self.move = move  # Move code that leads here from the parent (parent is not referenced)
+        self.fsm = fsm  # Move automaton state of the path to this node
 
-    def generate_child(self):
+    @property
+    def data(self):
         """
-        Generates child nodes by moving the blank space ('_') in the four possible directions: up, down, left, right.
+        The puzzle configuration as a 2D list of labels, used for display.
 
         Returns:
-            list: A list of child Node objects representing new puzzle configurations.
+            list of list: 2D list representing the puzzle configuration.
         """
-        x, y = self.find(self.data, "_")  # Find the position of the blank space ('_')
-
-        # List of possible moves (up, down, left, right)
-        val_list = [[x, y - 1], [x, y + 1], [x - 1, y], [x + 1, y]]
-        children = []
-
-        # For each possible move, generate a child node if the move is valid
-        for i in val_list:
-            child = self.state_transition(
-                self.data, x, y, i[0], i[1]
-            )  # Try to shuffle the puzzle
-            if child is not None:
-                # Create a new node with the updated puzzle configuration, incremented level, and fval set to 0
-                child_node = Node(child, self.level + 1, 0)
-                children.append(child_node)
+        return self.board.decode(self.state)
 
-        return children
-
-    def state_transition(self, puz, x1, y1, x2, y2):
+    def key(self):
         """
-        Attempts to move the blank space in the puzzle from position (x1, y1) to (x2, y2).
-        Returns a new puzzle configuration if the move is valid, or None if the move is out of bounds.
-
-        Args:
-            puz (list of list): The current puzzle configuration.
-            x1 (int): The current row of the blank space.
-            y1 (int): The current column of the blank space.
-            x2 (int): The target row for the blank space.
-            y2 (int): The target column for the blank space.
+        Returns a hashable key for the puzzle configuration, used by the transposition table.
 
         Returns:
-            list of list or None: A new puzzle configuration after the move, or None if the move is invalid.
+            int: The packed puzzle configuration.
         """
-        if x2 >= 0 and x2 < len(puz) and y2 >= 0 and y2 < len(puz[0]):
-            # Valid move: Create a deep copy of the puzzle and perform the swap
-            temp_puz = self.copy(puz)
-            temp = temp_puz[x2][y2]
-            temp_puz[x2][y2] = temp_puz[x1][y1]
-            temp_puz[x1][y1] = temp
-            return temp_puz
-        else:
-            # Invalid move: Out of bounds
-            return None
+        return self.state
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and self.state == other.state
 
-    def copy(self, root):
+    def __hash__(self):
+        return hash(self.state)
+
+    def generate_child(self, automaton=None):
         """
-        Creates a deep copy of the given puzzle (2D list) to avoid modifying the original puzzle.
+        Generates child nodes by moving the blank space ('_') in the four possible directions: left, right, up, down.
 
         Args:
-            root (list of list): The puzzle to copy.
+            automaton (MoveAutomaton): If given, moves it rejects from this node's automaton state are skipped.
 
         Returns:
-            list of list: A deep copy of the puzzle.
+            list: A list of child Node objects representing new puzzle configurations.
         """
-        temp = []
-        for i in root:
-            t = []
-            for j in i:
-                t.append(j)  # Copy each element
-            temp.append(t)  # Append copied row to the new puzzle
-        return temp
-
-    def find(self, puz, x):
+        children = []
+        row = None if automaton is None else automaton.rows[self.fsm]
+
+        # The move table only lists moves that stay on the board
+        for move, target in self.board.neighbors[self.blank]:
+            fsm = ROOT
+            if row is not None:
+                fsm = row.get(move)
+                if fsm is None:
+                    continue  # The move would complete a redundant sequence
+            child = self.state_transition(target)
+            # Create a new node with the updated puzzle configuration, incremented level, and fval set to 0
+            children.append(Node(self.board, child, target, self.level + 1, 0, move, fsm))
+
+        return children
+
+    def state_transition(self, target):
         """
-        Finds the position of a given element (typically the blank space '_') in the puzzle.
+        Moves the blank space to the neighboring cell target.
 
         Args:
-            puz (list of list): The puzzle configuration to search through.
-            x (str): The element to search for (usually '_').
+            target (int): The cell index the blank space moves to (must be a neighbor of the blank space).
 
         Returns:
-            tuple: A tuple (i, j) representing the row and column index of the element x in the puzzle.
+            int: The packed puzzle configuration after the move.
         """
-        for i in range(len(puz)):
-            for j in range(len(puz[i])):
-                if puz[i][j] == x:
-                    return i, j  # Return the row and column index of the blank space
+        return self.board.slide(self.state, self.blank, target)
 
 
 class Puzzle:
@@ -115,16 +120,46 @@ class Puzzle:
     It manages the puzzle state, processes the algorithm step by step, and calculates the heuristic values.
     """
 
-    def __init__(self, size):
+    def __init__(
+        self,
+        size,
+        open_list="heap",
+        heuristic="misplaced",
+        symmetry=False,
+        stats=False,
+        pruning=2,
+    ):
         """
-        Initializes the puzzle with the specified size and prepares empty lists for open and closed nodes.
+        Initializes the puzzle with the specified size and prepares the open list and the table of seen states.
 
         Args:
             size (int): The size of the puzzle grid (e.g., 3 for a 3x3 puzzle).
+            open_list (str): The default open list backend ("heap", "bucket" or "sorted").
+            heuristic (str): The default heuristic ("misplaced", "manhattan", "linear_conflict", "pdb"
+                or "walking_distance", see heuristics.HEURISTICS).
+            symmetry (bool): Whether states that are mirror images for the goal share one entry
+                of the table of seen states (see symmetry.BoardSymmetry).
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats.
+            pruning (int): The length of the longest move sequence cut by a strict move automaton
+                (see move_pruning); such sequences are never part of a shortest path, so children
+                they lead to are skipped before the table lookup. 2 skips the move that undoes
+                the previous one; 0 generates every move.
         """
         self.n = size  # Puzzle size (n x n)
-        self.open = []  # List of open nodes (nodes to be explored)
-        self.closed = []  # List of closed nodes (nodes already explored)
+        self.open_list = open_list  # Name of the default open list backend
+        self.heuristic_kind = heuristic  # Name of the default heuristic
+        self.use_symmetry = symmetry  # Whether the table of seen states merges symmetric states
+        self.symmetry = None  # Symmetries of the current goal, when they are used
+        self.start = None  # (packed state, blank cell) of the current start configuration
+        self.estimator = None  # Heuristic engine built for the current goal
+        self.expanded = 0  # Number of nodes expanded by the last solve
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.pruning = pruning
+        self.automaton = None  # Move automaton, loaded on the first solve that needs it
+        self.open = make_open_list(open_list)  # Priority queue of open nodes (nodes to be explored)
+        self.closed = TranspositionTable()  # Best g-value of every state seen so far
+        self.board = Board(size)  # Layout of the puzzle being solved
 
     def total_cost(self, start, goal):
         """
@@ -137,118 +172,311 @@ class Puzzle:
 
         Args:
             start (Node): The current node being evaluated.
-            goal (list of list): The goal state of the puzzle.
+            goal (int): The packed goal state of the puzzle.
 
         Returns:
             int: The total cost (f-value) of the current node.
         """
         return (
-            self.heuristic(start.data, goal) + start.level
+            self.heuristic(start.state, goal) + start.level
         )  # Heuristic value + depth (level)
 
     def heuristic(self, start, goal):
         """
-        Heuristic function that calculates the difference (misplaced tiles) between the current state
-        and the goal state of the puzzle.
+        Heuristic function that estimates the number of moves between the current state and the goal state,
+        computed from scratch with the selected heuristic engine (see heuristics.py).
 
-        This heuristic counts the number of tiles that are in the wrong position, excluding the blank space ('_').
+        The default heuristic counts the number of tiles that are in the wrong position, excluding the blank space ('_').
+        During the search, children get their value as a delta from their parent instead (see process).
 
         Args:
-            start (list of list): The current puzzle configuration.
-            goal (list of list): The goal puzzle configuration.
+            start (int): The current packed puzzle configuration.
+            goal (int): The packed goal puzzle configuration.
 
         Returns:
-            int: The number of misplaced tiles (excluding the blank space).
+            int: The estimated number of moves to the goal.
         """
-        temp = 0  # Initialize the count of misplaced tiles
-        for i in range(self.n):
-            for j in range(self.n):
-                # Increment the count if the tile is misplaced and not the blank space
-                if start[i][j] != goal[i][j] and start[i][j] != "_":
-                    temp += 1
-        return temp
-
-    def process(self, start, goal, puzzle_display, next_step_callback):
+        if self.estimator is None or self.estimator_goal != goal:
+            # Build the engine (goal lookup tables) once per goal
+            self.estimator = make_heuristic(
+                self.heuristic_kind, self.board, self.board.unpack(goal)
+            )
+            self.estimator_goal = goal
+        return self.estimator.evaluate(self.board.unpack(start))
+
+    def process(
+        self,
+        start,
+        goal,
+        puzzle_display,
+        next_step_callback,
+        open_list=None,
+        heuristic=None,
+        symmetry=None,
+    ):
         """
         Solves the puzzle step by step using a search algorithm (like A*) and updates the state at each step.
 
         The algorithm processes the puzzle by exploring nodes in the open list and generating child nodes
         until it reaches the goal configuration. After each step, the next step is shown via the callback.
+        This runs search() to the end without progress events; iterate over search() to watch the search.
 
         Args:
             start (list of list): The initial puzzle configuration.
             goal (list of list): The goal puzzle configuration.
             puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
             next_step_callback (function): A callback function to call at each step, passing the puzzle states for display.
+            open_list (str): The open list backend for this solve (defaults to the one given to the constructor).
+            heuristic (str): The heuristic for this solve (defaults to the one given to the constructor).
+            symmetry (bool): Whether to merge symmetric states for this solve (defaults to the constructor setting).
 
         Returns:
-            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+            list: A list of Node objects representing the optimal sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, or the goal cannot be reached.
+        """
+        for event in self.search(start, goal, open_list, heuristic, progress_every=0, symmetry=symmetry):
+            steps = event["steps"]  # Only the final "solution" event is produced
+
+        # Call the callback function to process the next step and display the puzzle state
+        next_step_callback(steps)
+
+        # Return the sequence of steps taken to solve the puzzle
+        return steps
+
+    def search(
+        self,
+        start,
+        goal,
+        open_list=None,
+        heuristic=None,
+        progress_every=1,
+        symmetry=None,
+    ):
         """
+        Runs A* lazily and yields search events as plain dicts. The generator keeps no history,
+        so a consumer can show progress as it happens and stop the search early by closing it
+        (or simply by not asking for the next event).
+
+        Events:
+            {"event": "expanded", "node", "expanded", "frontier", "best_f"}: every progress_every
+                expansions, with the expanded Node, the number of nodes expanded so far, the size of
+                the open list and the f-value of the node (the lowest in the open list).
+            {"event": "solution", "steps", "expanded", "frontier", "best_f", "stats"}: once at the end,
+                with the list of Node objects of the optimal path and the SearchStats of the solve
+                (None unless stats are collected).
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            open_list (str): The open list backend for this solve (defaults to the one given to the constructor).
+            heuristic (str): The heuristic for this solve (defaults to the one given to the constructor).
+            progress_every (int): Yield an "expanded" event every this many expansions (0 for none).
+            symmetry (bool): Whether to merge symmetric states for this solve (defaults to the constructor setting).
+
+        Yields:
+            dict: The search events.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, or the goal cannot
+                be reached (raised from the first next() call, like any generator).
+        """
+        # Pack both configurations; tile codes follow the natural order of the labels
+        self.board = Board.for_states(start, goal)
+        if self.board.rows != self.n or self.board.cols != self.n:
+            raise ValueError(f"Expected a {self.n}x{self.n} puzzle.")
+        if not is_solvable(start, goal):
+            raise ValueError("Puzzle is unsolvable.")  # Fail fast instead of exhausting the search space
+        start_state, start_blank = self.board.encode(start)
+        goal, _ = self.board.encode(goal)
+        self.estimator = make_heuristic(
+            heuristic or self.heuristic_kind, self.board, self.board.unpack(goal)
+        )
+        self.estimator_goal = goal
+        estimator = self.estimator
+        self.expanded = 0
+        self.stats = None
+        self.start = (start_state, start_blank)
+        began = time.perf_counter()
+        generated = pushes = pops = peak_open = 0  # Search counters, kept in locals so they cost next to nothing
+
+        # With symmetry, the table is keyed by canonical states and stores moves in their frame
+        if self.use_symmetry if symmetry is None else symmetry:
+            self.symmetry = BoardSymmetry(self.board, self.board.unpack(goal))
+        else:
+            self.symmetry = None
+        canonical = self.symmetry.canonical if self.symmetry is not None else None
+        if self.pruning and self.automaton is None:
+            self.automaton = MoveAutomaton.open(self.pruning, strict=True)
+
+        # Start every solve with a fresh open list of the requested backend
+        self.open = make_open_list(open_list or self.open_list)
+        self.closed = TranspositionTable()
+
         # Initialize the start node with the initial configuration, level 0, and f-value set to 0
-        start_node = Node(start, 0, 0)
+        start_node = Node(self.board, start_state, start_blank, 0, 0)
         start_node.fval = self.total_cost(
             start_node, goal
         )  # Calculate the f-value of the start node
-        self.open.append(start_node)  # Add the start node to the open list
-
-        steps = []  # List to store the sequence of steps (nodes)
+        self.closed.improve(
+            start_node.key() if canonical is None else canonical(start_state)[0], 0
+        )  # Record the start state
+        self.open.push(
+            start_node, start_node.fval, start_node.fval - start_node.level
+        )  # Add the start node to the open list
+        pushes = 1
 
         # Start the puzzle-solving loop
         while True:
-            # Get the current node from the open list (the node with the lowest f-value)
-            cur = self.open[0]
-            steps.append(cur)  # Add current node to the steps list
-
-            # Check if the goal is reached (no misplaced tiles)
-            if self.heuristic(cur.data, goal) == 0:
+            # Every reachable state was explored without finding the goal
+            if not self.open:
+                raise ValueError("Puzzle is unsolvable.")
+
+            # Get the current node from the open list (the node with the lowest f-value, ties go to the lowest h-value)
+            if len(self.open) > peak_open:
+                peak_open = len(self.open)
+            cur = self.open.pop()
+            pops += 1
+
+            # Skip nodes that were superseded by a cheaper path to the same state
+            key = cur.key() if canonical is None else canonical(cur.state)[0]
+            if self.closed.is_stale(key, cur.level):
+                continue
+            self.expanded += 1
+            if progress_every and self.expanded % progress_every == 0:
+                yield {
+                    "event": "expanded",
+                    "node": cur,
+                    "expanded": self.expanded,
+                    "frontier": len(self.open),
+                    "best_f": cur.fval,
+                }
+
+            # Check if the goal is reached (packed states compare in O(1))
+            if cur.state == goal:
                 break  # Goal reached, stop the loop
 
+            # The heuristic of a child is the heuristic of its parent plus the change caused by the move
+            h = cur.fval - cur.level
+            tiles = self.board.unpack(cur.state) if estimator.uses_tiles else None
+
             # Generate child nodes from the current node
-            for i in cur.generate_child():
-                i.fval = self.total_cost(
-                    i, goal
+            for i in cur.generate_child(self.automaton):
+                generated += 1
+                # Drop the child if its state was already reached at the same or lower cost,
+                # otherwise remember the move that reached it for the path reconstruction
+                if canonical is None:
+                    if not self.closed.improve(i.key(), i.level, i.move):
+                        continue
+                else:
+                    key, index = canonical(i.state)
+                    if not self.closed.improve(key, i.level, self.symmetry.move_to_canonical(index, i.move)):
+                        continue
+                tile = self.board.tile_at(i.state, cur.blank)  # The tile that slid into the old blank cell
+                i.fval = (
+                    h + estimator.delta(tiles, tile, i.blank, cur.blank) + i.level
                 )  # Calculate the f-value for each child
-                self.open.append(i)  # Add the child node to the open list
+                self.open.push(
+                    i, i.fval, i.fval - i.level
+                )  # Add the child node to the open list
+                pushes += 1
+
+        if self.collect_stats:
+            self.stats = SearchStats(
+                "astar",
+                expanded=self.expanded,
+                generated=generated,
+                duplicates=generated - pushes + 1,  # Every child but the start that was not pushed
+                pushes=pushes,
+                pops=pops,
+                peak_open=peak_open,
+                seconds=time.perf_counter() - began,
+            )
+
+        # Walk the recorded moves back from the goal to rebuild only the solution path
+        yield {
+            "event": "solution",
+            "steps": self.reconstruct(cur),
+            "expanded": self.expanded,
+            "frontier": len(self.open),
+            "best_f": cur.fval,
+            "stats": self.stats,
+        }
+
+    def reconstruct(self, node):
+        """
+        Rebuilds the path from the start to a node by undoing the moves recorded in the transposition table.
 
-            # Move the current node to the closed list (explored nodes)
-            self.closed.append(cur)
-            del self.open[0]  # Remove the current node from the open list
+        With symmetry, every recorded move is mapped from the frame of the canonical state to
+        the state at hand. The walk then ends on a mirror image of the start, so the moves are
+        finally mapped to the frame of the start itself; the goal is its own mirror image.
 
-            # Sort the open list based on f-value (lowest f-value first)
-            self.open.sort(key=lambda x: x.fval, reverse=False)
+        Args:
+            node (Node): The last node of the path (usually the goal).
 
-        # Call the callback function to process the next step and display the puzzle state
-        next_step_callback(steps)
+        Returns:
+            list: A list of Node objects from the start to the node.
+        """
+        symmetry = self.symmetry
+        moves = []
+        state, blank = node.state, node.blank
+        if symmetry is None:
+            move = self.closed.move(state)
+            while move is not None:
+                moves.append(move)
+                state, blank = self.board.undo(state, blank, move)
+                move = self.closed.move(state)
+        else:
+            key, index = symmetry.canonical(state)
+            move = self.closed.move(key)
+            while move is not None:
+                move = symmetry.move_from_canonical(index, move)
+                moves.append(move)
+                state, blank = self.board.undo(state, blank, move)
+                key, index = symmetry.canonical(state)
+                move = self.closed.move(key)
+            start_index = symmetry.canonical(self.start[0])[1]
+            moves = [
+                symmetry.move_from_canonical(start_index, symmetry.move_to_canonical(index, move))
+                for move in moves
+            ]
+            state, blank = self.start
+        moves.reverse()
 
-        # Return the sequence of steps taken to solve the puzzle
+        steps = path_from_moves(self.board, state, blank, moves)
+        for step in steps:
+            step.fval = node.level  # Every node of an optimal path shares the solution cost
         return steps
 
 
-def is_solvable(puzzle):
+def path_from_moves(board, state, blank, moves):
     """
-    Checks if the given puzzle is solvable.
-    Solvable condition: Count inversions. If odd, unsolvable; if even, solvable.
+    Replays moves of the blank space from a configuration.
 
     Args:
-        puzzle (list of list): 2D list representing the puzzle configuration.
+        board (Board): The layout of the puzzle.
+        state (int): The packed configuration to start from.
+        blank (int): The cell index of the blank space.
+        moves (iterable of str): The moves of the blank space ("L", "R", "U", "D").
 
     Returns:
-        bool: True if solvable, False otherwise.
+        list: A list of Node objects, one per configuration including the first one.
     """
-    flat_puzzle = [num for row in puzzle for num in row if num != "_"]
-    inversions = 0
-
-    # Count inversions in the flattened puzzle
-    for i in range(len(flat_puzzle)):
-        for j in range(i + 1, len(flat_puzzle)):
-            if flat_puzzle[i] > flat_puzzle[j]:
-                inversions += 1
-
-    return inversions % 2 == 0
+    steps = [Node(board, state, blank, 0, 0)]
+    for move in moves:
+        cur = steps[-1]
+        target = board.targets[cur.blank][move]
+        steps.append(
+            Node(board, cur.state_transition(target), target, cur.level + 1, 0, move)
+        )
+    return steps
 
 
 class PuzzleGUI:
     def __init__(self, master):
+        from solution_cache import SolutionCache  # Imported here because solution_cache imports this module
+
         self.master = master
         self.master.title("8-Puzzle Solver")
         self.master.geometry("500x800")  # Adjust the window size
@@ -257,8 +485,13 @@ class PuzzleGUI:
         # Initialize the puzzle grid size (3x3 for this example)
         self.grid_size = 3
         self.puzzle = Puzzle(self.grid_size)
-        self.steps = []
+        self.steps = []  # Solution path, replayed one state at a time
         self.current_step = 0
+        self.worker = None  # Thread running the current solve
+        self.events = queue.Queue()  # Search events sent by the worker thread
+        self.cancel_event = threading.Event()  # Set to ask the worker thread to stop
+        self.cache = SolutionCache()  # Solutions of earlier solves, kept across restarts
+        self.cache_query = None  # (board, start, goal) of the running solve, to cache its solution
 
         self.create_widgets()
 
@@ -346,6 +579,30 @@ class PuzzleGUI:
         )
         self.solve_button.pack(pady=15)
 
+        # Cancel button, only enabled while a solve is running
+        self.cancel_button = tk.Button(
+            self.master,
+            text="Cancel",
+            font=("Helvetica", 12, "bold"),
+            bg="#e8c8b0",
+            fg="#58554e",
+            relief="flat",
+            state="disabled",
+            command=self.cancel_solve,
+            width=25,
+        )
+        self.cancel_button.pack(pady=5)
+
+        # Progress of the running solve
+        self.status_label = tk.Label(
+            self.master,
+            text="",
+            font=("Helvetica", 11),
+            bg="#f7f0e5",
+            fg="#58554e",
+        )
+        self.status_label.pack(pady=5)
+
         # Next step button with flat style, dark olive green background
         self.next_button = tk.Button(
             self.master,
@@ -376,18 +633,110 @@ class PuzzleGUI:
         self.puzzle_label.pack(pady=10, padx=10, fill="both", expand=True)
 
     def solve_puzzle(self):
-        """Solve the puzzle when button is pressed"""
+        """Start solving the puzzle in a worker thread when button is pressed"""
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showinfo("Solver Busy", "A puzzle is already being solved.")
+            return
+
         start = self.get_puzzle_state(self.start_entries)
         goal = self.get_puzzle_state(self.goal_entries)
 
-        # Validate if the puzzle is solvable
-        if not is_solvable(start):
-            messagebox.showerror("Unsolvable Puzzle", "The puzzle cannot be solved!")
+        try:
+            # Validate if the puzzle is solvable before searching
+            if not is_solvable(start, goal):
+                messagebox.showerror("Unsolvable Puzzle", "The puzzle cannot be solved!")
+                return
+            board = Board.for_states(start, goal)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        self.steps = self.puzzle.process(
-            start, goal, self.update_puzzle_display, self.prepare_next_step
+        # Replay a cached solution instead of searching again
+        start_state, start_blank = board.encode(start)
+        self.cache_query = (board, start_state, board.encode(goal)[0])
+        moves = self.cache.find(*self.cache_query)
+        if moves is not None:
+            steps = path_from_moves(board, start_state, start_blank, moves)
+            self.show_solution(steps, f"Solved in {len(moves)} moves (cached)")
+            return
+
+        # Every solve gets its own queue and cancel flag, so nothing leaks from an earlier one
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = threading.Thread(
+            target=self.run_solver,
+            args=(start, goal, self.events, self.cancel_event),
+            daemon=True,
         )
+        self.solve_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.next_button.config(state="disabled")
+        self.status_label.config(text="Solving...")
+        self.worker.start()
+        self.master.after(POLL_MS, self.poll_solver)
+
+    def run_solver(self, start, goal, events, cancel_event):
+        """Run the search in the worker thread and post its events (Tk widgets are only touched by the main thread)"""
+        try:
+            search = self.puzzle.search(start, goal, progress_every=PROGRESS_EVERY)
+            for event in search:
+                if cancel_event.is_set():
+                    search.close()  # Stops the search and frees its open list
+                    events.put({"event": "cancelled"})
+                    return
+                events.put(event)
+        except ValueError as e:
+            events.put({"event": "error", "message": str(e)})
+
+    def poll_solver(self):
+        """Handle the events posted by the worker thread, then check again later while it runs"""
+        progress = None
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event["event"] == "expanded":
+                progress = event  # Only the latest progress is worth showing
+            elif event["event"] == "solution":
+                steps = event["steps"]
+                self.cache.store(*self.cache_query, "".join(step.move for step in steps[1:]))
+                self.finish_solve("")
+                self.show_solution(steps, f"Solved in {len(steps) - 1} moves ({event['expanded']} nodes expanded)")
+                return
+            elif event["event"] == "error":
+                self.finish_solve("")
+                messagebox.showerror("Error", event["message"])
+                return
+            else:
+                self.finish_solve("Solve cancelled.")
+                return
+
+        if progress is not None:
+            self.status_label.config(
+                text=f"Expanded {progress['expanded']} nodes, {progress['frontier']} open, f = {progress['best_f']}"
+            )
+        self.master.after(POLL_MS, self.poll_solver)
+
+    def cancel_solve(self):
+        """Ask the worker thread to stop; it answers with a "cancelled" event"""
+        if self.worker is None or not self.worker.is_alive():
+            return
+        self.cancel_event.set()
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text="Cancelling...")
+
+    def finish_solve(self, status):
+        """Restore the buttons once the worker thread is done"""
+        self.solve_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text=status)
+
+    def show_solution(self, steps, status):
+        """Show the first state of a solution and enable the Next Step button"""
+        self.status_label.config(text=status)
+        self.prepare_next_step(steps)
+        self.current_step = 0
         self.update_puzzle_display(self.steps[self.current_step])
         self.next_button.config(state="normal")
 
@@ -417,6 +766,7 @@ class PuzzleGUI:
             messagebox.showinfo("Puzzle Solved", "The puzzle has been solved!")
 
 
-root = tk.Tk()
-app = PuzzleGUI(root)
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = PuzzleGUI(root)
+    root.mainloop()
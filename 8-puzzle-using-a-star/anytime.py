@@ -0,0 +1,263 @@
+import time
+
+from a_star_algorithm import path_from_moves
+from board import Board
+from heuristics import make_heuristic
+from open_list import make_open_list
+from search_stats import SearchStats
+from solvability import is_solvable
+from transposition_table import TranspositionTable
+
+
+class AnytimeSearch:
+    """
+    This class solves the puzzle with Anytime Repairing A* (ARA*). A first solution is found
+    quickly by weighted A*, where f = g + weight * h, then the weight is lowered step by step
+    until it reaches 1 (plain A*, optimal) or the deadline passes.
+
+    Search effort is reused between weights: the g-values and moves of the transposition table
+    are kept, states improved after their expansion are parked in an "inconsistent" list instead
+    of being expanded again within the same weight, and the open list is re-sorted with the new
+    weight instead of being rebuilt from the start. Every improved solution is reported with its
+    suboptimality bound: its length divided by the bound is a lower bound of the optimal length.
+    """
+
+    def __init__(
+        self,
+        size,
+        heuristic="manhattan",
+        initial_weight=3.0,
+        weight_step=0.5,
+        deadline=1.0,
+        stats=False,
+    ):
+        """
+        Initializes the solver for a puzzle size.
+
+        Args:
+            size (int): The size of the puzzle grid (e.g., 4 for a 4x4 puzzle).
+            heuristic (str or Heuristic): The heuristic (see heuristics.HEURISTICS); it must be admissible for the bounds to hold.
+            initial_weight (float): The weight of the first search (at least 1).
+            weight_step (float): How much the weight is lowered after every solution.
+            deadline (float): The default time budget of a solve, in seconds.
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats,
+                summed over all the weights (updated with every improved solution).
+        """
+        self.n = size  # Puzzle size (n x n)
+        self.heuristic_kind = heuristic  # Name of the default heuristic
+        self.initial_weight = initial_weight
+        self.weight_step = weight_step
+        self.deadline = deadline
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.solutions = []  # Report of every improved solution of the last solve
+        self.expanded = 0  # Number of nodes expanded by the last solve
+
+    def process(
+        self,
+        start,
+        goal,
+        puzzle_display,
+        next_step_callback,
+        deadline=None,
+        on_solution=None,
+    ):
+        """
+        Solves the puzzle within a time budget and returns the best sequence of puzzle states
+        found, like Puzzle.process.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the final solution path.
+            deadline (float): The time budget of this solve in seconds (defaults to the one given to the constructor).
+            on_solution (function): Called with (steps, report) for every improved solution, where report
+                is a dict with "length", "weight", "bound", "expanded" and "seconds".
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, or the goal cannot be reached.
+            TimeoutError: If no solution was found before the deadline.
+        """
+        board = Board.for_states(start, goal)
+        if board.rows != self.n or board.cols != self.n:
+            raise ValueError(f"Expected a {self.n}x{self.n} puzzle.")
+        if not is_solvable(start, goal):
+            raise ValueError("Puzzle is unsolvable.")
+        start_state, start_blank = board.encode(start)
+        goal_state, _ = board.encode(goal)
+
+        budget = self.deadline if deadline is None else deadline
+        best = None
+        for moves, report in self.search(
+            board, start_state, start_blank, goal_state, time.perf_counter() + budget
+        ):
+            best = path_from_moves(board, start_state, start_blank, moves)
+            if on_solution is not None:
+                on_solution(best, report)
+
+        if best is None:
+            raise TimeoutError(f"No solution found within {budget} seconds.")
+        next_step_callback(best)
+        return best
+
+    def search(self, board, start, blank, goal, deadline):
+        """
+        Runs ARA* and yields every improved solution as soon as it is found.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            blank (int): The cell of the blank space in the start configuration.
+            goal (int): The packed goal configuration.
+            deadline (float): The time.perf_counter() value after which the search stops.
+
+        Yields:
+            tuple: (moves, report) where moves is the string of moves of the blank space.
+        """
+        estimator = make_heuristic(self.heuristic_kind, board, board.unpack(goal))
+        table = TranspositionTable()  # Lowest g-value and move of every state, kept across weights
+        began = time.perf_counter()
+        self.solutions = []
+        self.expanded = 0
+        self.stats = None
+        generated = duplicates = pushes = pops = peak_open = 0  # Search counters, summed over the weights
+
+        def record():
+            if self.collect_stats:
+                self.stats = SearchStats(
+                    "anytime",
+                    expanded=self.expanded,
+                    generated=generated,
+                    duplicates=duplicates,
+                    pushes=pushes,
+                    pops=pops,
+                    peak_open=peak_open,
+                    seconds=time.perf_counter() - began,
+                )
+
+        weight = max(1.0, self.initial_weight)
+        open_list = make_open_list("heap")  # f-values are floats, so the bucket queue does not fit
+        h = estimator.evaluate(board.unpack(start))
+        table.improve(start, 0)
+        open_list.push((start, blank, 0, h), weight * h, h)
+        pushes = 1
+        inconsistent = []  # States improved after they were expanded with the current weight
+        best_length = None
+
+        while True:
+            closed = set()  # States expanded with the current weight
+            timed_out = False
+
+            # Improve the path: weighted A* until the goal is cheaper than every open f-value
+            while open_list:
+                goal_g = table.lookup(goal)
+                if goal_g is not None and goal_g <= open_list.peek():
+                    break
+                if self.expanded & 255 == 0 and time.perf_counter() >= deadline:
+                    timed_out = True
+                    break
+
+                if len(open_list) > peak_open:
+                    peak_open = len(open_list)
+                state, cur, g, h = open_list.pop()
+                pops += 1
+                if table.is_stale(state, g):
+                    continue
+                closed.add(state)
+                self.expanded += 1
+                tiles = board.unpack(state) if estimator.uses_tiles else None
+
+                generated += len(board.neighbors[cur])
+                for move, target in board.neighbors[cur]:
+                    child = board.slide(state, cur, target)
+                    if not table.improve(child, g + 1, move):
+                        duplicates += 1
+                        continue
+                    child_h = h + estimator.delta(tiles, board.tile_at(child, cur), target, cur)
+                    if child in closed:
+                        inconsistent.append((child, target, g + 1, child_h))
+                    else:
+                        open_list.push((child, target, g + 1, child_h), g + 1 + weight * child_h, child_h)
+                        pushes += 1
+
+            if timed_out:
+                record()
+                return  # The bounds only hold once a weight has been searched to the end
+
+            # The remaining open and inconsistent states, without superseded entries
+            pending = [item for item in inconsistent if not table.is_stale(item[0], item[2])]
+            while open_list:
+                item = open_list.pop()
+                if not table.is_stale(item[0], item[2]):
+                    pending.append(item)
+            inconsistent = []
+
+            goal_g = table.lookup(goal)
+            if goal_g is not None and (best_length is None or goal_g < best_length):
+                best_length = goal_g
+                moves = self.moves(board, table, goal)  # Never longer than goal_g
+                # Every unexplored path costs at least the lowest g + h left, and no more than w times it
+                lowest = min((g + h for _, _, g, h in pending), default=goal_g)
+                bound = min(weight, len(moves) / lowest) if lowest else 1.0
+                report = {
+                    "length": len(moves),
+                    "weight": weight,
+                    "bound": max(1.0, bound),
+                    "expanded": self.expanded,
+                    "seconds": time.perf_counter() - began,
+                }
+                self.solutions.append(report)
+                record()
+                yield moves, report
+
+            if weight == 1.0 or not pending:
+                record()
+                return
+
+            # Lower the weight and re-sort the remaining states, keeping everything already learned
+            weight = max(1.0, weight - self.weight_step)
+            for item in pending:
+                open_list.push(item, item[2] + weight * item[3], item[3])
+            pushes += len(pending)
+
+    @staticmethod
+    def moves(board, table, state):
+        """
+        Walks the recorded moves back from a state to the start.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            table (TranspositionTable): The table of the search.
+            state (int): The packed state to walk back from.
+
+        Returns:
+            str: The moves of the blank space from the start to the state.
+        """
+        moves = []
+        blank = board.find_blank(state)
+        move = table.move(state)
+        while move is not None:
+            moves.append(move)
+            state, blank = board.undo(state, blank, move)
+            move = table.move(state)
+        moves.reverse()
+        return "".join(moves)
+
+
+if __name__ == "__main__":
+    start_grid = [["13", "2", "10", "3"], ["1", "12", "8", "4"], ["5", "_", "9", "6"], ["15", "14", "11", "7"]]
+    goal_grid = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "12"], ["13", "14", "15", "_"]]
+
+    def show(steps, report):
+        print(
+            f"weight {report['weight']:.1f}: {report['length']} moves (at most {report['bound']:.2f}x optimal), "
+            f"{report['expanded']} expanded, {report['seconds']:.2f}s"
+        )
+
+    AnytimeSearch(4, heuristic="linear_conflict").process(
+        start_grid, goal_grid, None, lambda steps: None, deadline=5.0, on_solution=show
+    )
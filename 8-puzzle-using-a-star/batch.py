@@ -0,0 +1,284 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from math import isqrt
+
+from a_star_algorithm import Puzzle
+from board import BLANK
+from distance_table import DistanceTableSolver
+from ida_star import DEFAULT_PRUNING, IDAStar
+from move_pruning import MoveAutomaton
+from search_stats import SearchStats, StatsAggregator
+from solution_cache import CachedSolver, SolutionCache
+
+SOLVERS = ("astar", "ida", "table")
+ENGINES = {}  # Solver objects of this process, reused across puzzles (keeps tables mapped)
+
+
+def parse_grid(value):
+    """
+    Converts a puzzle written in an input file into a 2D list of labels.
+
+    Args:
+        value (list of list, list or str): A 2D list, a flat list of labels, a comma-separated
+            string ("1,2,_,...") or a string of one-character labels ("12_...").
+
+    Returns:
+        list of list: The puzzle configuration.
+
+    Raises:
+        ValueError: If the number of tiles is not a square.
+    """
+    if isinstance(value, str):
+        value = value.split(",") if "," in value else list(value)
+    if value and isinstance(value[0], list):
+        return [[str(label) for label in row] for row in value]
+    labels = [str(label).strip() for label in value]
+    size = isqrt(len(labels))
+    if size * size != len(labels) or size < 2:
+        raise ValueError(f"Expected a square number of tiles, got {len(labels)}")
+    return [labels[i : i + size] for i in range(0, len(labels), size)]
+
+
+def default_goal(size):
+    """
+    Returns the usual goal: tiles in order with the blank space in the last cell.
+
+    Args:
+        size (int): The size of the puzzle grid.
+
+    Returns:
+        list of list: The goal configuration.
+    """
+    labels = [str(i) for i in range(1, size * size)] + [BLANK]
+    return [labels[i : i + size] for i in range(0, len(labels), size)]
+
+
+def parse_line(line):
+    """
+    Parses one input line. JSON lines hold an object with "start", an optional "goal" and
+    an optional "id"; plain text lines hold the start and an optional goal separated by
+    whitespace. Blank lines and lines starting with '#' are skipped.
+
+    Args:
+        line (str): The input line.
+
+    Returns:
+        dict or None: {"id", "start", "goal"} or None for a line without a puzzle.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        record = json.loads(line)
+        start = parse_grid(record["start"])
+        goal = parse_grid(record["goal"]) if record.get("goal") else default_goal(len(start))
+        return {"id": record.get("id"), "start": start, "goal": goal}
+    fields = line.split()
+    start = parse_grid(fields[0])
+    goal = parse_grid(fields[1]) if len(fields) > 1 else default_goal(len(start))
+    return {"id": None, "start": start, "goal": goal}
+
+
+def solve_one(line, solver, heuristic, cache=None, stats=False):
+    """
+    Solves the puzzle of one input line and measures it.
+
+    Args:
+        line (str): The input line.
+        solver (str): "astar" (Puzzle), "ida" (IDAStar) or "table" (DistanceTableSolver, 3x3 only).
+        heuristic (str): The heuristic of the "astar" and "ida" solvers.
+        cache (str): The SQLite file of a solution cache shared by the workers (None for no cache).
+        stats (bool): Whether to add the search_stats.SearchStats of the solve (as a dict) under "stats".
+
+    Returns:
+        dict or None: The result, or None for a line without a puzzle.
+    """
+    try:
+        record = parse_line(line)
+    except Exception as e:  # Any malformed line becomes an error result, not a failed run
+        return {"id": None, "error": f"Invalid line: {e}"}
+    if record is None:
+        return None
+
+    try:
+        size = len(record["start"])
+        engine = ENGINES.get((solver, size, stats))
+        if engine is None:
+            if solver == "astar":
+                engine = Puzzle(size, heuristic=heuristic, stats=stats)
+            elif solver == "ida":
+                engine = IDAStar(size, heuristic=heuristic, stats=stats)
+            else:
+                engine = DistanceTableSolver(size, stats=stats)
+            if cache is not None:
+                engine = CachedSolver(engine, SolutionCache(cache))
+            ENGINES[(solver, size, stats)] = engine
+
+        began = time.perf_counter()
+        steps = engine.process(record["start"], record["goal"], None, lambda steps: None)
+        seconds = time.perf_counter() - began
+    except Exception as e:
+        return {"id": record["id"], "error": str(e)}
+
+    result = {
+        "id": record["id"],
+        "moves": "".join(step.move for step in steps[1:]),
+        "length": len(steps) - 1,
+        "expanded": getattr(engine, "expanded", 0),
+        "seconds": round(seconds, 6),
+    }
+    search_stats = getattr(engine, "stats", None)  # None for cache hits
+    if stats and search_stats is not None:
+        result["stats"] = search_stats.as_dict()
+    return result
+
+
+def solve_chunk(chunk, solver, heuristic, cache=None, stats=False):
+    """
+    Solves a chunk of input lines in a worker process.
+
+    Args:
+        chunk (list of tuple): (line number, line) pairs.
+        solver (str): The solver name (see solve_one).
+        heuristic (str): The heuristic name.
+        cache (str): The SQLite file of the solution cache (see solve_one).
+        stats (bool): Whether to add the search stats to the results (see solve_one).
+
+    Returns:
+        list of dict: The results of the chunk in input order (lines without a puzzle are left out).
+    """
+    results = []
+    for number, line in chunk:
+        result = solve_one(line, solver, heuristic, cache, stats)
+        if result is not None:
+            result["line"] = number
+            results.append(result)
+    return results
+
+
+def run(
+    lines,
+    output,
+    solver="astar",
+    heuristic="linear_conflict",
+    workers=None,
+    chunk_size=16,
+    cache=None,
+    stats=False,
+    prometheus=None,
+):
+    """
+    Streams puzzles through a process pool and writes one JSON result per puzzle in input order.
+    A new chunk is submitted as soon as any chunk finishes, and finished chunks wait in a
+    reorder buffer until the chunks before them are written, so a slow puzzle does not leave
+    the other workers idle. The chunks in flight and in the buffer are bounded, so neither the
+    input nor the output is ever held in memory as a whole.
+
+    Args:
+        lines (iterable of str): The input lines (read lazily).
+        output (file): Where to write the JSON lines.
+        solver (str): The solver name (see solve_one).
+        heuristic (str): The heuristic name.
+        workers (int): The number of worker processes (defaults to the number of cores).
+        chunk_size (int): The number of lines sent to a worker at once.
+        cache (str): The SQLite file of a solution cache shared by the workers (None for no cache).
+        stats (bool): Whether to add the search stats of every solve to its result.
+        prometheus (file): Where to write the search stats in the Prometheus text format once
+            the run is over, summed per solver as the results stream through (see
+            search_stats.StatsAggregator); implies stats.
+
+    Returns:
+        int: The number of results written.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}', expected one of {SOLVERS}")
+    workers = workers or os.cpu_count() or 1
+    if solver == "ida":
+        MoveAutomaton.open(DEFAULT_PRUNING)  # Built once here instead of by every worker at the same time
+    max_pending = workers * 2  # Chunks in flight: one running and one queued per worker
+    max_unwritten = workers * 8  # Chunks in flight or waiting in the reorder buffer
+    numbered = enumerate(lines, 1)
+    written = 0
+    stats = stats or prometheus is not None
+    aggregator = StatsAggregator()  # Search stats summed per solver, for the Prometheus export
+
+    def write(results):
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+            if prometheus is not None and "stats" in result:
+                aggregator.add(SearchStats.from_dict(result["stats"]))
+        return len(results)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}  # Future -> chunk index
+        finished = {}  # Chunk index -> results, waiting for the chunks before it
+        submitted = next_write = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending and len(pending) + len(finished) < max_unwritten:
+                chunk = list(islice(numbered, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending[executor.submit(solve_chunk, chunk, solver, heuristic, cache, stats)] = submitted
+                submitted += 1
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[pending.pop(future)] = future.result()
+            while next_write in finished:
+                written += write(finished.pop(next_write))
+                next_write += 1
+    output.flush()
+    if prometheus is not None:
+        prometheus.write(aggregator.to_prometheus())
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Solve sliding puzzles from a JSONL or plain text file across a process pool."
+    )
+    parser.add_argument("input", help="input file, or '-' for standard input")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file (default: standard output)")
+    parser.add_argument("--solver", choices=SOLVERS, default="astar")
+    parser.add_argument("--heuristic", default="linear_conflict")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--cache", default=None, help="SQLite solution cache file shared by the workers")
+    parser.add_argument("--stats", action="store_true", help="add the search stats of every solve to its result")
+    parser.add_argument("--prometheus", default=None, help="write the search stats, summed per solver, in the Prometheus text format to this file")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    target = sys.stdout if args.output == "-" else open(args.output, "w")
+    metrics = open(args.prometheus, "w") if args.prometheus else None
+    try:
+        run(
+            source,
+            target,
+            args.solver,
+            args.heuristic,
+            args.workers,
+            args.chunk_size,
+            args.cache,
+            args.stats,
+            metrics,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        if metrics is not None:
+            metrics.close()
+
+
+if __name__ == "__main__":
+    main()
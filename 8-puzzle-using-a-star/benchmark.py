@@ -0,0 +1,388 @@
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from a_star_algorithm import Puzzle
+from board import Board
+from distance_table import DistanceTableSolver
+from ida_star import IDAStar
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+FUNCTIONAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "8_puzzle_functional.py")
+DEFAULT_DEPTHS = {3: (4, 8, 12, 16, 20, 24), 4: (10, 20, 30, 40)}  # Optimal depths of the corpus by puzzle size
+FUNCTIONAL_MAX_DEPTH = 8  # The functional solver recurses once per expansion, so it only runs short puzzles
+MAX_ATTEMPTS = 2000  # Random walks tried per instance before giving up on a depth
+
+_functional = None  # The functional module, loaded on first use
+_oracles = {}  # Optimal solvers used to label the corpus, by puzzle size
+
+
+def load_functional():
+    """
+    Loads 8_puzzle_functional.py, whose name is not a valid module name.
+
+    Returns:
+        module: The functional solver module.
+    """
+    global _functional
+    if _functional is None:
+        spec = importlib.util.spec_from_file_location("puzzle_functional", FUNCTIONAL_PATH)
+        _functional = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_functional)
+    return _functional
+
+
+def solve_astar(start, goal, heuristic):
+    """
+    Solves a puzzle with Puzzle.process.
+
+    Args:
+        start (list of list): The initial puzzle configuration.
+        goal (list of list): The goal puzzle configuration.
+        heuristic (str): The heuristic name.
+
+    Returns:
+        tuple: (length, nodes) where nodes is the number of nodes expanded.
+    """
+    solver = Puzzle(len(start), heuristic=heuristic)
+    steps = solver.process(start, goal, None, lambda steps: None)
+    return len(steps) - 1, solver.expanded
+
+
+def solve_functional(start, goal, heuristic):
+    """
+    Solves a puzzle with solve_puzzle from 8_puzzle_functional.py, which always counts
+    misplaced tiles (the heuristic name is ignored). Its diagnostics on stdout are dropped.
+
+    Args:
+        start (list of list): The initial puzzle configuration.
+        goal (list of list): The goal puzzle configuration.
+        heuristic (str): Unused.
+
+    Returns:
+        tuple: (length, nodes) where nodes is the size of the closed list.
+    """
+    functional = load_functional()
+    with contextlib.redirect_stdout(io.StringIO()):
+        closed = functional.solve_puzzle(start, goal, functional.heuristic)
+    return closed[-1]["level"], len(closed)
+
+
+SOLVERS = {
+    "astar": solve_astar,
+    "functional": solve_functional,
+}
+
+
+def optimal_depth(start, goal):
+    """
+    Returns the optimal number of moves of a puzzle: a table lookup on 3x3 boards, an IDA*
+    search with linear conflicts on larger ones.
+
+    Args:
+        start (list of list): The initial puzzle configuration.
+        goal (list of list): The goal puzzle configuration.
+
+    Returns:
+        int: The number of moves.
+    """
+    size = len(start)
+    oracle = _oracles.get(size)
+    if oracle is None:
+        oracle = DistanceTableSolver(size) if size == 3 else IDAStar(size, heuristic="linear_conflict")
+        _oracles[size] = oracle
+    if size == 3:
+        return oracle.distance(start, goal)
+    return len(oracle.process(start, goal, None, lambda steps: None)) - 1
+
+
+def make_corpus(size, depths, per_depth=3, seed=0):
+    """
+    Builds a reproducible set of instances with known optimal depths. Each instance is a random
+    walk of the blank space away from the usual goal, kept if its optimal depth is the one wanted.
+
+    Args:
+        size (int): The size of the puzzle grid.
+        depths (sequence of int): The optimal depths to cover.
+        per_depth (int): The number of instances per depth.
+        seed (int): Seed of the random walks.
+
+    Returns:
+        list of dict: {"id", "size", "depth", "start", "goal"} for every instance.
+
+    Raises:
+        ValueError: If no instance of a depth was found within MAX_ATTEMPTS walks.
+    """
+    rng = random.Random(seed)
+    board = Board(size)
+    goal_state = board.pack(list(range(1, board.cells)) + [0])
+    goal = board.decode(goal_state)
+    corpus = []
+    for depth in depths:
+        found = 0
+        for _ in range(MAX_ATTEMPTS):
+            if found == per_depth:
+                break
+            # A walk of length L reaches states of depth L, L - 2, ...: try lengths from depth to twice of it
+            state, blank, previous = goal_state, board.cells - 1, None
+            for _ in range(depth + 2 * rng.randint(0, depth // 2)):
+                choices = [(m, t) for m, t in board.neighbors[blank] if t != previous]
+                move, target = rng.choice(choices)
+                state, previous, blank = board.slide(state, blank, target), blank, target
+            start = board.decode(state)
+            if optimal_depth(start, goal) == depth:
+                found += 1
+                corpus.append(
+                    {"id": f"{size}x{size}-d{depth}-{found}", "size": size, "depth": depth, "start": start, "goal": goal}
+                )
+        if found < per_depth:
+            raise ValueError(f"Found only {found} instances of depth {depth} in {MAX_ATTEMPTS} walks.")
+    return corpus
+
+
+def max_rss():
+    """
+    Returns the peak resident set size of the process so far.
+
+    Returns:
+        int or None: The number of bytes, or None where the resource module is missing.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Kilobytes on Linux
+
+
+def measure(solver, instance, heuristic, repeats=3):
+    """
+    Times one solver on one instance. The time is the median of the repeats; peak Python memory
+    comes from an extra run under tracemalloc, which would slow down the timed runs.
+
+    Args:
+        solver (str): The solver name (see SOLVERS).
+        instance (dict): The instance (see make_corpus).
+        heuristic (str): The heuristic name.
+        repeats (int): The number of timed runs.
+
+    Returns:
+        dict: The measurement, with an "error" entry instead of figures if the solver failed.
+    """
+    solve = SOLVERS[solver]
+    result = {"solver": solver, "id": instance["id"], "size": instance["size"], "depth": instance["depth"]}
+    rss_before = max_rss()
+    try:
+        times = []
+        for _ in range(repeats):
+            began = time.perf_counter()
+            length, nodes = solve(instance["start"], instance["goal"], heuristic)
+            times.append(time.perf_counter() - began)
+        tracemalloc.start()
+        try:
+            solve(instance["start"], instance["goal"], heuristic)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    except Exception as e:  # The functional solver fails with various errors on some inputs
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    seconds = statistics.median(times)
+    result.update(
+        {
+            "length": length,
+            "nodes": nodes,
+            "seconds": round(seconds, 6),
+            "nodes_per_second": round(nodes / seconds) if seconds else None,
+            "peak_bytes": peak,
+            "rss_growth": None if rss_before is None else max_rss() - rss_before,
+        }
+    )
+    return result
+
+
+def summarize(results):
+    """
+    Aggregates the measurements by solver, size and depth.
+
+    Args:
+        results (list of dict): The measurements (see measure).
+
+    Returns:
+        dict: Group key "solver/NxN/dD" -> {"instances", "errors", "seconds", "nodes",
+        "nodes_per_second", "peak_bytes"} with mean time and nodes and the largest peak.
+    """
+    groups = {}
+    for result in results:
+        key = f"{result['solver']}/{result['size']}x{result['size']}/d{result['depth']}"
+        groups.setdefault(key, []).append(result)
+
+    summary = {}
+    for key, members in groups.items():
+        ok = [result for result in members if "error" not in result]
+        seconds = sum(result["seconds"] for result in ok)
+        nodes = sum(result["nodes"] for result in ok)
+        summary[key] = {
+            "instances": len(members),
+            "errors": len(members) - len(ok),
+            "seconds": round(seconds / len(ok), 6) if ok else None,
+            "nodes": round(nodes / len(ok), 1) if ok else None,
+            "nodes_per_second": round(nodes / seconds) if seconds else None,
+            "peak_bytes": max((result["peak_bytes"] for result in ok), default=None),
+        }
+    return summary
+
+
+def compare(summary, baseline, tolerance=0.1):
+    """
+    Compares a summary with the summary of a baseline run. Times are compared as ratios;
+    node counts are exact, so any change in them means the search itself changed.
+
+    Args:
+        summary (dict): The summary of this run (see summarize).
+        baseline (dict): The summary of the baseline run.
+        tolerance (float): The relative change in time that is still considered noise.
+
+    Returns:
+        dict: Group key -> {"speedup", "nodes_change", "status"} for every group in both runs,
+        where status is "faster", "slower", "unchanged" or "broken" (the group has new errors).
+    """
+    comparison = {}
+    for key, current in summary.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if current["errors"] > previous["errors"] or current["seconds"] is None:
+            comparison[key] = {"speedup": None, "nodes_change": None, "status": "broken"}
+            continue
+        if previous["seconds"] is None:
+            continue
+        speedup = previous["seconds"] / current["seconds"] if current["seconds"] else None
+        if speedup is None or speedup > 1 + tolerance:
+            status = "faster"
+        elif speedup < 1 / (1 + tolerance):
+            status = "slower"
+        else:
+            status = "unchanged"
+        comparison[key] = {
+            "speedup": None if speedup is None else round(speedup, 3),
+            "nodes_change": round(current["nodes"] - previous["nodes"], 1),
+            "status": status,
+        }
+    return comparison
+
+
+def run(
+    solvers=("astar", "functional"),
+    sizes=(3, 4),
+    per_depth=3,
+    repeats=3,
+    seed=0,
+    heuristic="manhattan",
+    baseline=None,
+    tolerance=0.1,
+):
+    """
+    Runs the benchmark suite.
+
+    Args:
+        solvers (sequence of str): The solvers to time (see SOLVERS).
+        sizes (sequence of int): The puzzle sizes (see DEFAULT_DEPTHS for the depths of each).
+        per_depth (int): The number of instances per depth.
+        repeats (int): The number of timed runs per instance.
+        seed (int): Seed of the corpus.
+        heuristic (str): The heuristic of the A* solver.
+        baseline (dict): A previous report to compare with, or None.
+        tolerance (float): The relative change in time that is still considered noise.
+
+    Returns:
+        dict: The report: "meta", "results", "summary" and, with a baseline, "comparison".
+
+    Raises:
+        ValueError: If a solver is unknown or the baseline was measured on another corpus.
+    """
+    for solver in solvers:
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {sorted(SOLVERS)}")
+
+    results = []
+    fingerprint = hashlib.sha256()  # Identifies the corpus, so reports on other corpora are not compared
+    for size in sizes:
+        corpus = make_corpus(size, DEFAULT_DEPTHS.get(size, (10, 20)), per_depth, seed)
+        fingerprint.update(json.dumps([instance["start"] for instance in corpus]).encode())
+        for solver in solvers:
+            for instance in corpus:
+                if solver == "functional" and (size != 3 or instance["depth"] > FUNCTIONAL_MAX_DEPTH):
+                    continue
+                results.append(measure(solver, instance, heuristic, repeats))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeats": repeats,
+            "heuristic": heuristic,
+            "corpus": fingerprint.hexdigest()[:16],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+        "summary": summarize(results),
+    }
+    if baseline is not None:
+        if baseline["meta"].get("corpus") != report["meta"]["corpus"]:
+            raise ValueError("The baseline was measured on a different corpus (sizes, seed or instances per depth).")
+        report["comparison"] = compare(report["summary"], baseline["summary"], tolerance)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sliding puzzle solvers on a seeded corpus.")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=["astar", "functional"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[3, 4])
+    parser.add_argument("--per-depth", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--heuristic", default="manhattan")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file (default: standard output)")
+    parser.add_argument("--baseline", default=None, help="JSON report of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if a group is slower or broken")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    report = run(
+        args.solvers, args.sizes, args.per_depth, args.repeats, args.seed, args.heuristic, baseline, args.tolerance
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    regressions = [key for key, entry in report.get("comparison", {}).items() if entry["status"] in ("slower", "broken")]
+    for key in regressions:
+        print(f"{key}: {report['comparison'][key]['status']}", file=sys.stderr)
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
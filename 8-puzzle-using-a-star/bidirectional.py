@@ -0,0 +1,274 @@
+import time
+
+from a_star_algorithm import path_from_moves
+from board import OPPOSITE, Board
+from heuristics import make_heuristic
+from open_list import make_open_list
+from search_stats import SearchStats
+from solvability import is_solvable
+from transposition_table import TranspositionTable
+
+FORWARD = 0  # Search from the start towards the goal
+BACKWARD = 1  # Search from the goal towards the start
+
+
+class BidirectionalSearch:
+    """
+    This class solves the puzzle by searching from the start and from the goal at the same
+    time until the two frontiers meet. Each direction records the best g-value and the move
+    that reached every state in its own transposition table, and every generated state is
+    looked up in the table of the other direction, so a meeting is found in O(1).
+
+    Two modes are available:
+        "bfs": bidirectional breadth-first search, expanding one whole layer of the smaller frontier at a time.
+        "astar": front-to-end bidirectional A*, where each direction estimates the distance to the
+            opposite end (goal for the forward search, start for the backward one).
+    """
+
+    def __init__(self, size, mode="astar", heuristic="manhattan", stats=False):
+        """
+        Initializes the solver for a puzzle size.
+
+        Args:
+            size (int): The size of the puzzle grid (e.g., 3 for a 3x3 puzzle).
+            mode (str): The default mode ("bfs" or "astar").
+            heuristic (str): The default heuristic of the "astar" mode (see heuristics.HEURISTICS).
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats
+                (the open list is the frontier in "bfs" mode, and both directions are summed).
+        """
+        self.n = size  # Puzzle size (n x n)
+        self.mode = mode  # Name of the default mode
+        self.heuristic_kind = heuristic  # Name of the default heuristic
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.tables = None  # Transposition tables of both directions for the last solve
+        self.expanded = 0  # Number of nodes expanded by the last solve
+
+    def process(
+        self,
+        start,
+        goal,
+        puzzle_display,
+        next_step_callback,
+        mode=None,
+        heuristic=None,
+    ):
+        """
+        Solves the puzzle and returns the optimal sequence of puzzle states, like Puzzle.process.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the solution path once it is found.
+            mode (str): The mode for this solve (defaults to the one given to the constructor).
+            heuristic (str): The heuristic for this solve (defaults to the one given to the constructor).
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, the mode is unknown,
+                or the goal cannot be reached.
+        """
+        board = Board.for_states(start, goal)
+        if board.rows != self.n or board.cols != self.n:
+            raise ValueError(f"Expected a {self.n}x{self.n} puzzle.")
+        if not is_solvable(start, goal):
+            raise ValueError("Puzzle is unsolvable.")
+        ends = (board.encode(start), board.encode(goal))
+
+        mode = mode or self.mode
+        if mode == "bfs":
+            moves = self.bfs(board, ends)
+        elif mode == "astar":
+            moves = self.astar(board, ends, heuristic or self.heuristic_kind)
+        else:
+            raise ValueError(f"Unknown mode '{mode}', expected 'bfs' or 'astar'")
+
+        steps = path_from_moves(board, ends[0][0], ends[0][1], moves)
+        next_step_callback(steps)
+        return steps
+
+    def bfs(self, board, ends):
+        """
+        Runs bidirectional breadth-first search.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            ends (tuple): ((start state, start blank), (goal state, goal blank)).
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+        """
+        self.tables = (TranspositionTable(), TranspositionTable())
+        self.expanded = 0
+        self.stats = None
+        began = time.perf_counter()
+        generated = pushes = 0
+        peak_open = 2
+        frontiers = ([ends[FORWARD]], [ends[BACKWARD]])
+        depths = [0, 0]
+        for direction in (FORWARD, BACKWARD):
+            self.tables[direction].improve(ends[direction][0], 0)
+        if ends[FORWARD][0] == ends[BACKWARD][0]:
+            return ""
+
+        while frontiers[FORWARD] and frontiers[BACKWARD]:
+            # Expand a whole layer of the smaller frontier
+            direction = FORWARD if len(frontiers[FORWARD]) <= len(frontiers[BACKWARD]) else BACKWARD
+            table, other = self.tables[direction], self.tables[1 - direction]
+            depths[direction] += 1
+            g = depths[direction]
+
+            best = None  # (cost, meeting state) of the cheapest meeting in this layer
+            layer = []
+            for state, blank in frontiers[direction]:
+                self.expanded += 1
+                generated += len(board.neighbors[blank])
+                for move, target in board.neighbors[blank]:
+                    child = board.slide(state, blank, target)
+                    if not table.improve(child, g, move):
+                        continue
+                    layer.append((child, target))
+                    other_g = other.lookup(child)
+                    if other_g is not None and (best is None or g + other_g < best[0]):
+                        best = (g + other_g, child)
+            frontiers[direction][:] = layer
+            pushes += len(layer)
+            peak_open = max(peak_open, len(frontiers[FORWARD]) + len(frontiers[BACKWARD]))
+
+            # Every path shorter than the layer's best meeting was already seen, so it is optimal
+            if best is not None:
+                if self.collect_stats:
+                    self.stats = SearchStats(
+                        "bidirectional_bfs",
+                        expanded=self.expanded,
+                        generated=generated,
+                        duplicates=generated - pushes,
+                        pushes=pushes,
+                        pops=self.expanded,
+                        peak_open=peak_open,
+                        seconds=time.perf_counter() - began,
+                    )
+                return self.join(board, best[1])
+
+        raise ValueError("Puzzle is unsolvable.")
+
+    def astar(self, board, ends, heuristic):
+        """
+        Runs front-to-end bidirectional A*. The search stops once the cheapest meeting found
+        costs no more than the larger of the two lowest f-values in the open lists, because
+        every remaining path must cost at least that much.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            ends (tuple): ((start state, start blank), (goal state, goal blank)).
+            heuristic (str): The heuristic to use.
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+        """
+        self.tables = (TranspositionTable(), TranspositionTable())
+        self.expanded = 0
+        self.stats = None
+        began = time.perf_counter()
+        generated = duplicates = pushes = pops = peak_open = 0
+        # The forward search aims at the goal, the backward search at the start
+        estimators = (
+            make_heuristic(heuristic, board, board.unpack(ends[BACKWARD][0])),
+            make_heuristic(heuristic, board, board.unpack(ends[FORWARD][0])),
+        )
+        opens = (make_open_list("heap"), make_open_list("heap"))
+        for direction in (FORWARD, BACKWARD):
+            state, blank = ends[direction]
+            h = estimators[direction].evaluate(board.unpack(state))
+            self.tables[direction].improve(state, 0)
+            opens[direction].push((state, blank, 0, h), h, h)
+            pushes += 1
+
+        best = None  # (cost, meeting state) of the cheapest meeting found so far
+        if ends[FORWARD][0] == ends[BACKWARD][0]:
+            best = (0, ends[FORWARD][0])
+
+        while opens[FORWARD] and opens[BACKWARD]:
+            if best is not None and best[0] <= max(opens[FORWARD].peek(), opens[BACKWARD].peek()):
+                break
+
+            # Expand from the direction with the smaller open list
+            direction = FORWARD if len(opens[FORWARD]) <= len(opens[BACKWARD]) else BACKWARD
+            table, other = self.tables[direction], self.tables[1 - direction]
+            estimator = estimators[direction]
+
+            if len(opens[FORWARD]) + len(opens[BACKWARD]) > peak_open:
+                peak_open = len(opens[FORWARD]) + len(opens[BACKWARD])
+            state, blank, g, h = opens[direction].pop()
+            pops += 1
+            if table.is_stale(state, g):
+                continue
+            self.expanded += 1
+            tiles = board.unpack(state) if estimator.uses_tiles else None
+
+            generated += len(board.neighbors[blank])
+            for move, target in board.neighbors[blank]:
+                child = board.slide(state, blank, target)
+                if not table.improve(child, g + 1, move):
+                    duplicates += 1
+                    continue
+                other_g = other.lookup(child)
+                if other_g is not None and (best is None or g + 1 + other_g < best[0]):
+                    best = (g + 1 + other_g, child)
+                child_h = h + estimator.delta(tiles, board.tile_at(child, blank), target, blank)
+                if best is not None and g + 1 + child_h >= best[0]:
+                    continue  # Cannot lead to a cheaper meeting
+                opens[direction].push((child, target, g + 1, child_h), g + 1 + child_h, child_h)
+                pushes += 1
+
+        if best is None:
+            raise ValueError("Puzzle is unsolvable.")
+        if self.collect_stats:
+            self.stats = SearchStats(
+                "bidirectional_astar",
+                expanded=self.expanded,
+                generated=generated,
+                duplicates=duplicates,
+                pushes=pushes,
+                pops=pops,
+                peak_open=peak_open,
+                seconds=time.perf_counter() - began,
+            )
+        return self.join(board, best[1])
+
+    def join(self, board, meeting):
+        """
+        Builds the moves from start to goal through the state where the two searches met.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            meeting (int): The packed state found by both directions.
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+        """
+        blank = board.find_blank(meeting)
+
+        # Walk back to the start with the forward table
+        forward = []
+        state, cur = meeting, blank
+        move = self.tables[FORWARD].move(state)
+        while move is not None:
+            forward.append(move)
+            state, cur = board.undo(state, cur, move)
+            move = self.tables[FORWARD].move(state)
+        forward.reverse()
+
+        # Walk on to the goal with the backward table, undoing its moves
+        backward = []
+        state, cur = meeting, blank
+        move = self.tables[BACKWARD].move(state)
+        while move is not None:
+            backward.append(OPPOSITE[move])
+            state, cur = board.undo(state, cur, move)
+            move = self.tables[BACKWARD].move(state)
+
+        return "".join(forward) + "".join(backward)
@@ -0,0 +1,218 @@
+BLANK = "_"  # Label of the blank space in the GUI and in 2D puzzle lists
+
+# Moves of the blank space, in the order the search tries them: left, right, up, down
+MOVES = "LRUD"
+MOVE_DELTAS = {"L": (0, -1), "R": (0, 1), "U": (-1, 0), "D": (1, 0)}
+OPPOSITE = {"L": "R", "R": "L", "U": "D", "D": "U"}
+
+
+def label_order(label):
+    """
+    Sort key that orders numeric tile labels naturally ("2" before "10").
+
+    Args:
+        label (str): A tile label.
+
+    Returns:
+        tuple: The sort key.
+    """
+    return (len(label), label)
+
+
+class Board:
+    """
+    This class describes the layout of a rows x cols sliding puzzle and converts puzzle
+    configurations to and from a packed integer. Every cell uses a fixed number of bits
+    (4 for boards up to 4x4, more for larger boards) and holds a tile code, where 0 is the
+    blank space. The move tables list, for every blank position, the cells it can swap with,
+    so a move is a couple of shifts and XORs instead of a grid copy.
+    """
+
+    def __init__(self, rows, cols=None, labels=None):
+        """
+        Initializes the board layout and precomputes the move tables.
+
+        Args:
+            rows (int): The number of rows.
+            cols (int): The number of columns (defaults to rows for a square board).
+            labels (list of str): Label of every tile code, labels[0] is the blank space.
+                Defaults to "_", "1", "2", ... up to rows * cols - 1.
+        """
+        self.rows = rows
+        self.cols = cols or rows
+        self.cells = self.rows * self.cols
+        self.bits = max(4, (self.cells - 1).bit_length())  # Bits used by each cell
+        self.mask = (1 << self.bits) - 1  # Mask for a single cell
+        self.shifts = tuple(i * self.bits for i in range(self.cells))
+
+        if labels is None:
+            labels = [BLANK] + [str(i) for i in range(1, self.cells)]
+        if len(labels) != self.cells:
+            raise ValueError(f"Expected {self.cells} tile labels, got {len(labels)}")
+        self.labels = list(labels)  # Tile code -> label
+        self.codes = {label: code for code, label in enumerate(self.labels)}  # Label -> tile code
+
+        # neighbors[blank] lists (move, target cell) for every legal move of the blank space
+        self.neighbors = []
+        for index in range(self.cells):
+            row, col = divmod(index, self.cols)
+            moves = []
+            for move in MOVES:
+                drow, dcol = MOVE_DELTAS[move]
+                if 0 <= row + drow < self.rows and 0 <= col + dcol < self.cols:
+                    moves.append((move, (row + drow) * self.cols + col + dcol))
+            self.neighbors.append(tuple(moves))
+        self.neighbors = tuple(self.neighbors)
+        self.targets = tuple(dict(moves) for moves in self.neighbors)  # targets[blank][move] -> cell
+
+    @classmethod
+    def for_states(cls, start, goal):
+        """
+        Creates a board layout for a start and goal configuration, checking that both have
+        the same shape and the same set of tiles with exactly one blank space.
+
+        Args:
+            start (list of list): The start puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+
+        Returns:
+            Board: A layout whose tile codes follow the natural order of the labels.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles or do not match.
+        """
+        rows = len(goal)
+        cols = len(goal[0]) if rows else 0
+        for grid in (start, goal):
+            if len(grid) != rows or any(len(row) != cols for row in grid):
+                raise ValueError("Start and goal states must have the same shape.")
+        start_labels = sorted((label for row in start for label in row), key=label_order)
+        goal_labels = sorted((label for row in goal for label in row), key=label_order)
+        if start_labels != goal_labels:
+            raise ValueError("Start and goal states must contain the same tiles.")
+        if goal_labels.count(BLANK) != 1:
+            raise ValueError(f"The puzzle must contain exactly one blank space '{BLANK}'.")
+        if len(set(goal_labels)) != len(goal_labels):
+            raise ValueError("Every tile must appear only once.")
+        goal_labels.remove(BLANK)
+        return cls(rows, cols, [BLANK] + goal_labels)
+
+    def encode(self, grid):
+        """
+        Packs a 2D puzzle configuration into an integer.
+
+        Args:
+            grid (list of list): The puzzle configuration.
+
+        Returns:
+            tuple: (state, blank) where state is the packed integer and blank is the index of the blank cell.
+        """
+        state = 0
+        blank = None
+        for index, label in enumerate(label for row in grid for label in row):
+            code = self.codes[label]
+            if code == 0:
+                blank = index
+            state |= code << self.shifts[index]
+        return state, blank
+
+    def pack(self, tiles):
+        """
+        Packs a flat sequence of tile codes into an integer.
+
+        Args:
+            tiles (sequence of int): The tile code of every cell in reading order.
+
+        Returns:
+            int: The packed state.
+        """
+        state = 0
+        for index, code in enumerate(tiles):
+            state |= code << self.shifts[index]
+        return state
+
+    def unpack(self, state):
+        """
+        Unpacks an integer into a flat tuple of tile codes.
+
+        Args:
+            state (int): The packed state.
+
+        Returns:
+            tuple of int: The tile code of every cell in reading order.
+        """
+        mask = self.mask
+        return tuple((state >> shift) & mask for shift in self.shifts)
+
+    def decode(self, state):
+        """
+        Unpacks an integer into a 2D puzzle configuration with the original labels.
+
+        Args:
+            state (int): The packed state.
+
+        Returns:
+            list of list: The puzzle configuration.
+        """
+        tiles = [self.labels[code] for code in self.unpack(state)]
+        return [tiles[i : i + self.cols] for i in range(0, self.cells, self.cols)]
+
+    def tile_at(self, state, index):
+        """
+        Returns the tile code stored in a cell.
+
+        Args:
+            state (int): The packed state.
+            index (int): The cell index in reading order.
+
+        Returns:
+            int: The tile code (0 for the blank space).
+        """
+        return (state >> self.shifts[index]) & self.mask
+
+    def slide(self, state, blank, target):
+        """
+        Moves the blank space to a neighboring cell by swapping it with the tile there.
+
+        Args:
+            state (int): The packed state.
+            blank (int): The cell index of the blank space.
+            target (int): The cell index the blank space moves to.
+
+        Returns:
+            int: The packed state after the move.
+        """
+        tile = (state >> self.shifts[target]) & self.mask
+        # The blank cell holds 0, so XOR moves the tile without touching other cells
+        return state ^ (tile << self.shifts[target]) ^ (tile << self.shifts[blank])
+
+    def undo(self, state, blank, move):
+        """
+        Undoes a move of the blank space.
+
+        Args:
+            state (int): The packed state after the move.
+            blank (int): The cell index of the blank space after the move.
+            move (str): The move that was made ("L", "R", "U" or "D").
+
+        Returns:
+            tuple: (state, blank) before the move.
+        """
+        previous = self.targets[blank][OPPOSITE[move]]
+        return self.slide(state, blank, previous), previous
+
+    def find_blank(self, state):
+        """
+        Finds the cell index of the blank space in a packed state.
+
+        Args:
+            state (int): The packed state.
+
+        Returns:
+            int: The cell index of the blank space.
+        """
+        mask = self.mask
+        for index, shift in enumerate(self.shifts):
+            if not (state >> shift) & mask:
+                return index
+        raise ValueError("The state has no blank space.")
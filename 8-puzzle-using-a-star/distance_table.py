@@ -0,0 +1,357 @@
+import mmap
+import os
+import struct
+import tempfile
+import time
+from math import factorial
+
+from a_star_algorithm import path_from_moves
+from board import Board
+from search_stats import SearchStats
+
+MAGIC = b"DST1"
+HEADER = struct.Struct("<4sBBB")  # magic, rows, cols, goal cell of the blank space
+UNREACHABLE = 255  # Table value of a permutation that cannot reach the goal
+MAX_CELLS = 10  # Largest board with a table (10! bytes); bigger boards need a search
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+
+def lehmer_rank(tiles):
+    """
+    Ranks a permutation by its Lehmer code: digit i is the number of later tiles that are
+    smaller than tile i, and digits are weighted by factorials.
+
+    Args:
+        tiles (sequence of int): A permutation of 0 .. len(tiles) - 1.
+
+    Returns:
+        int: The rank, from 0 to len(tiles)! - 1.
+    """
+    n = len(tiles)
+    rank = 0
+    seen = 0  # Bit mask of the tiles already placed
+    for i, tile in enumerate(tiles):
+        smaller_before = bin(seen & ((1 << tile) - 1)).count("1")
+        rank = rank * (n - i) + tile - smaller_before
+        seen |= 1 << tile
+    return rank
+
+
+def canonical_goal(cells, blank):
+    """
+    Returns the canonical goal with the blank space in a given cell: the other cells hold
+    the tiles 1, 2, 3, ... in reading order.
+
+    Args:
+        cells (int): The number of cells of the board.
+        blank (int): The cell of the blank space.
+
+    Returns:
+        tuple of int: The tile code of every cell.
+    """
+    tiles = list(range(1, cells))
+    tiles.insert(blank, 0)
+    return tuple(tiles)
+
+
+class DistanceTable:
+    """
+    This class holds the exact number of moves to a canonical goal for every configuration of
+    a small board (181,440 reachable states on the 3x3 board). It is built once by
+    breadth-first search from the goal, indexed by the Lehmer rank of the configuration and
+    stored on disk as one byte per rank, which is read through mmap.
+
+    Any other goal with the blank space in the same cell is handled by renaming the tiles so
+    the goal becomes the canonical one; there is one table per cell of the blank space.
+    """
+
+    def __init__(self, rows, cols, blank, table):
+        """
+        Initializes the distance table.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+            table (bytes-like): The distance of every Lehmer rank.
+        """
+        self.board = Board(rows, cols)
+        self.blank = blank
+        self.goal = canonical_goal(self.board.cells, blank)
+        self.table = table
+
+    @staticmethod
+    def file_name(rows, cols, blank):
+        """
+        Returns the file name used for a distance table in a directory.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+
+        Returns:
+            str: The file name.
+        """
+        return f"{rows}x{cols}-b{blank}.dst"
+
+    @classmethod
+    def build(cls, rows, cols, blank):
+        """
+        Builds the table by breadth-first search from the canonical goal.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+
+        Returns:
+            DistanceTable: The distance table.
+        """
+        board = Board(rows, cols)
+        goal = canonical_goal(board.cells, blank)
+        table = bytearray([UNREACHABLE]) * factorial(board.cells)
+        table[lehmer_rank(goal)] = 0
+
+        depth = 0
+        frontier = [(board.pack(goal), blank)]
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for state, cur in frontier:
+                for move, target in board.neighbors[cur]:
+                    child = board.slide(state, cur, target)
+                    rank = lehmer_rank(board.unpack(child))
+                    if table[rank] == UNREACHABLE:
+                        table[rank] = depth
+                        next_frontier.append((child, target))
+            frontier = next_frontier
+
+        return cls(rows, cols, blank, table)
+
+    def save(self, path):
+        """
+        Writes the distance table to a file.
+
+        Args:
+            path (str): The file to write.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Every writer has its own temp file, so processes building the same file at once do not clash
+        fd, temp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, self.board.rows, self.board.cols, self.blank))
+                f.write(self.table)
+            os.replace(temp_path, path)  # Readers never see a partly written file
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Maps a distance table file into memory.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            DistanceTable: The distance table.
+
+        Raises:
+            ValueError: If the file is not a distance table.
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rows, cols, blank = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a distance table file.")
+        table = memoryview(data)[HEADER.size :]
+        if len(table) != factorial(rows * cols):
+            raise ValueError(f"{path} is truncated.")
+        return cls(rows, cols, blank, table)
+
+    @classmethod
+    def open(cls, rows, cols, blank, directory=DEFAULT_DIRECTORY):
+        """
+        Loads a distance table from a directory, building and saving it first if needed.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+            directory (str): The directory of the table files.
+
+        Returns:
+            DistanceTable: The distance table.
+        """
+        path = os.path.join(directory, cls.file_name(rows, cols, blank))
+        if not os.path.exists(path):
+            cls.build(rows, cols, blank).save(path)
+        return cls.load(path)
+
+    def distance(self, tiles):
+        """
+        Returns the number of moves from a configuration to the canonical goal.
+
+        Args:
+            tiles (sequence of int): The tile code of every cell, relative to the canonical goal.
+
+        Returns:
+            int or None: The number of moves, or None if the goal cannot be reached.
+        """
+        value = self.table[lehmer_rank(tiles)]
+        return None if value == UNREACHABLE else value
+
+    def moves(self, tiles, lookups=None):
+        """
+        Follows the table downhill from a configuration to the canonical goal: at every
+        step exactly one table lookup per neighbor, no search.
+
+        Args:
+            tiles (sequence of int): The tile code of every cell, relative to the canonical goal.
+            lookups (list): If given, lookups[0] is increased by the number of neighbors looked up.
+
+        Returns:
+            str: The moves of the blank space of an optimal solution.
+
+        Raises:
+            ValueError: If the goal cannot be reached, or the table has no downhill neighbor on the way.
+        """
+        distance = self.distance(tiles)
+        if distance is None:
+            raise ValueError("Puzzle is unsolvable.")
+
+        tiles = list(tiles)
+        blank = tiles.index(0)
+        moves = []
+        while distance:
+            for move, target in self.board.neighbors[blank]:
+                tiles[blank], tiles[target] = tiles[target], 0
+                if lookups is not None:
+                    lookups[0] += 1
+                if self.table[lehmer_rank(tiles)] == distance - 1:
+                    break
+                tiles[target], tiles[blank] = tiles[blank], 0  # Not downhill, take it back
+            else:
+                raise ValueError("corrupt distance table")  # No neighbor is one move closer
+            moves.append(move)
+            blank = target
+            distance -= 1
+        return "".join(moves)
+
+
+class DistanceTableSolver:
+    """
+    This class answers (start, goal) queries on small boards with precomputed distance
+    tables instead of a search, with the same process() interface as Puzzle.
+    """
+
+    def __init__(self, size, directory=DEFAULT_DIRECTORY, stats=False):
+        """
+        Initializes the solver for a puzzle size. Tables are loaded on first use.
+
+        Args:
+            size (int): The size of the puzzle grid (3 for the 8-puzzle).
+            directory (str): The directory of the table files.
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats
+                (a node of the walk down the table counts as expanded, every neighbor looked up
+                as generated).
+        """
+        self.n = size  # Puzzle size (n x n)
+        self.directory = directory
+        self.tables = {}  # Loaded tables by goal cell of the blank space
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.expanded = 0  # Number of nodes walked by the last solve
+
+    def relabel(self, start, goal):
+        """
+        Renames the tiles so the goal becomes the canonical goal of its blank cell.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+
+        Returns:
+            tuple: (board, table, tiles) where tiles is the relabeled start configuration.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size or the board is too large.
+        """
+        board = Board.for_states(start, goal)
+        if board.rows != self.n or board.cols != self.n:
+            raise ValueError(f"Expected a {self.n}x{self.n} puzzle.")
+        if board.cells > MAX_CELLS:
+            raise ValueError(f"Distance tables only cover boards of up to {MAX_CELLS} cells.")
+        goal_tiles = board.unpack(board.encode(goal)[0])
+        blank = goal_tiles.index(0)
+
+        table = self.tables.get(blank)
+        if table is None:
+            table = DistanceTable.open(board.rows, board.cols, blank, self.directory)
+            self.tables[blank] = table
+
+        rename = [0] * board.cells  # Tile code -> canonical tile code
+        for cell, tile in enumerate(goal_tiles):
+            rename[tile] = table.goal[cell]
+        tiles = [rename[tile] for tile in board.unpack(board.encode(start)[0])]
+        return board, table, tiles
+
+    def distance(self, start, goal):
+        """
+        Returns the optimal number of moves between two configurations.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+
+        Returns:
+            int or None: The number of moves, or None if the goal cannot be reached.
+        """
+        board, table, tiles = self.relabel(start, goal)
+        return table.distance(tiles)
+
+    def process(self, start, goal, puzzle_display, next_step_callback):
+        """
+        Returns the optimal sequence of puzzle states, like Puzzle.process.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the solution path.
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, or the goal cannot be reached.
+        """
+        self.stats = None
+        began = time.perf_counter()
+        board, table, tiles = self.relabel(start, goal)
+        lookups = [0]
+        moves = table.moves(tiles, lookups)  # Moves are the same once the tiles are renamed back
+        self.expanded = len(moves)
+        if self.collect_stats:
+            self.stats = SearchStats(
+                "table",
+                expanded=self.expanded,
+                generated=lookups[0],
+                seconds=time.perf_counter() - began,
+            )
+        state, blank = board.encode(start)
+        steps = path_from_moves(board, state, blank, moves)
+        next_step_callback(steps)
+        return steps
+
+
+if __name__ == "__main__":
+    # Build every 3x3 table ahead of time
+    for blank_cell in range(9):
+        values = [v for v in DistanceTable.open(3, 3, blank_cell).table if v != UNREACHABLE]
+        print(f"blank in cell {blank_cell}: {len(values)} states, up to {max(values)} moves")
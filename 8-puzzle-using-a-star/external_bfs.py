@@ -0,0 +1,336 @@
+import heapq
+import os
+import sys
+import time
+from array import array
+
+from board import Board
+from distance_table import canonical_goal
+
+RECORD = array("Q").itemsize  # Bytes of a state in a layer or run file (unsigned 64-bit, little-endian)
+# Children buffered before they are written as a run: 2 MiB packed, about 12 MiB while the run is
+# sorted (sorting makes a list of Python ints, 40 bytes per child)
+BUFFER_RECORDS = 1 << 18
+BLOCK_RECORDS = 1 << 13  # States read or written at once per file (64 KiB)
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bfs")
+
+
+def read_records(path, block_records=BLOCK_RECORDS):
+    """
+    Streams the states of a layer or run file, one block at a time.
+
+    Args:
+        path (str): The file to read.
+        block_records (int): The number of states read at once.
+
+    Yields:
+        int: The packed states, in file order.
+    """
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(block_records * RECORD)
+            if not data:
+                return
+            block = array("Q")
+            block.frombytes(data)
+            if sys.byteorder == "big":
+                block.byteswap()  # Files are little-endian
+            yield from block
+
+
+class RecordWriter:
+    """
+    This class writes states to a file through a block buffer, so the disk only sees large
+    sequential writes. It is a context manager that flushes and closes the file on exit.
+    """
+
+    def __init__(self, path, block_records=BLOCK_RECORDS):
+        """
+        Opens a file for writing.
+
+        Args:
+            path (str): The file to write.
+            block_records (int): The number of states written at once.
+        """
+        self.file = open(path, "wb")
+        self.block_records = block_records
+        self.block = array("Q")
+        self.count = 0  # Number of states written
+
+    def write(self, state):
+        """
+        Appends a state.
+
+        Args:
+            state (int): The packed state.
+        """
+        self.block.append(state)
+        self.count += 1
+        if len(self.block) >= self.block_records:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered states to the file.
+        """
+        if sys.byteorder == "big":
+            self.block.byteswap()
+        self.block.tofile(self.file)
+        self.block = array("Q")
+
+    def close(self):
+        """
+        Writes the buffered states and closes the file.
+        """
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def merge_unique(streams):
+    """
+    Merges sorted streams of states into one sorted stream without duplicates.
+
+    Args:
+        streams (list of iterable): The sorted streams.
+
+    Yields:
+        int: Every distinct state, in increasing order.
+    """
+    previous = None
+    for state in heapq.merge(*streams):
+        if state != previous:
+            yield state
+            previous = state
+
+
+def difference(states, excluded):
+    """
+    Removes the states of a sorted stream from another sorted stream, reading each once.
+
+    Args:
+        states (iterable): The sorted states to keep.
+        excluded (iterable): The sorted states to remove.
+
+    Yields:
+        int: The states of states that are not in excluded.
+    """
+    excluded = iter(excluded)
+    current = next(excluded, None)
+    for state in states:
+        while current is not None and current < state:
+            current = next(excluded, None)
+        if state != current:
+            yield state
+
+
+class ExternalBFS:
+    """
+    This class enumerates a state space by breadth-first search from the goal with the layers
+    kept on disk, so the memory used does not grow with the number of states. Every layer is
+    a file of sorted packed states. The children of a layer are generated while it is
+    streamed, sorted in memory in bounded buffers and written as sorted runs; the runs are
+    then merged, which removes duplicates, and the previous layer is subtracted by the same
+    streaming merge (delayed duplicate detection). Every move changes the color of the blank
+    cell on a checkerboard, so the graph is bipartite and the children of layer d can only be
+    in layers d - 1 and d + 1: the two last layers are all that is ever read.
+
+    The space is either the full puzzle or a pattern space, where only some tiles are told
+    apart and the others are interchangeable, which gives the distance histograms of partial
+    4x4 patterns that do not fit in memory as a set of states.
+    """
+
+    def __init__(
+        self,
+        rows,
+        cols=None,
+        blank=None,
+        pattern=None,
+        directory=DEFAULT_DIRECTORY,
+        buffer_records=BUFFER_RECORDS,
+        block_records=BLOCK_RECORDS,
+        keep_layers=False,
+    ):
+        """
+        Initializes the search.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board (defaults to rows).
+            blank (int): The goal cell of the blank space (defaults to the last cell).
+            pattern (sequence of int): The goal cells of the tiles told apart, or None for every tile.
+            directory (str): The directory of the layer and run files.
+            buffer_records (int): The number of children sorted in memory before a run is written.
+            block_records (int): The number of states read or written at once per file.
+            keep_layers (bool): Whether the layer files are left on disk after the search.
+
+        Raises:
+            ValueError: If a packed state does not fit in 64 bits or the pattern is not valid.
+        """
+        self.board = Board(rows, cols)
+        cells = self.board.cells
+        if self.board.bits * cells > 64:
+            raise ValueError("External BFS needs states of at most 64 bits.")
+        self.blank = cells - 1 if blank is None else blank
+        self.pattern = None if pattern is None else tuple(pattern)
+        if self.pattern is not None and (
+            len(set(self.pattern)) != len(self.pattern)
+            or any(not 0 <= cell < cells or cell == self.blank for cell in self.pattern)
+        ):
+            raise ValueError("Pattern cells must be distinct tile cells of the board.")
+        self.goal = self.abstract_goal()
+        self.directory = directory
+        self.buffer_records = buffer_records
+        self.block_records = block_records
+        self.keep_layers = keep_layers
+        self.histogram = []  # Number of states at every distance from the goal
+        self.bytes_written = 0  # Bytes written to run and layer files by the last search
+
+    def abstract_goal(self):
+        """
+        Returns the goal of the space. In a pattern space, the pattern tiles get the codes
+        1, 2, ... in pattern order and every other tile the next code.
+
+        Returns:
+            tuple of int: The tile code of every cell.
+        """
+        cells = self.board.cells
+        if self.pattern is None or len(self.pattern) == cells - 1:
+            return canonical_goal(cells, self.blank)
+        codes = {cell: i + 1 for i, cell in enumerate(self.pattern)}
+        other = len(self.pattern) + 1
+        return tuple(0 if cell == self.blank else codes.get(cell, other) for cell in range(cells))
+
+    def work_directory(self):
+        """
+        Returns the directory of the files of this space.
+
+        Returns:
+            str: The directory.
+        """
+        pattern = "all" if self.pattern is None else "-".join(map(str, self.pattern))
+        return os.path.join(self.directory, f"{self.board.rows}x{self.board.cols}-b{self.blank}-{pattern}")
+
+    def layer_path(self, depth):
+        """
+        Returns the file of a layer.
+
+        Args:
+            depth (int): The distance from the goal.
+
+        Returns:
+            str: The path.
+        """
+        return os.path.join(self.work_directory(), f"layer-{depth:03d}.bin")
+
+    def layer(self, depth):
+        """
+        Streams the states of a layer left on disk (see keep_layers).
+
+        Args:
+            depth (int): The distance from the goal.
+
+        Yields:
+            int: The packed states, in increasing order.
+        """
+        yield from read_records(self.layer_path(depth), self.block_records)
+
+    def write_run(self, path, children):
+        """
+        Sorts a buffer of children and writes it as a run, dropping duplicates as they come
+        out next to each other. The sort is the only copy of the buffer that is made.
+
+        Args:
+            path (str): The run file.
+            children (array): The packed children.
+
+        Returns:
+            str: The path of the run.
+        """
+        previous = None
+        with RecordWriter(path, self.block_records) as writer:
+            for state in sorted(children):
+                if state != previous:
+                    writer.write(state)
+                    previous = state
+        self.bytes_written += writer.count * RECORD
+        return path
+
+    def run(self, max_depth=None):
+        """
+        Runs the search until a layer is empty or max_depth is reached.
+
+        Args:
+            max_depth (int): The last distance to enumerate, or None for the whole space.
+
+        Returns:
+            list of int: The number of states at every distance from the goal.
+        """
+        board = self.board
+        neighbors = board.neighbors
+        work = self.work_directory()
+        os.makedirs(work, exist_ok=True)
+        self.histogram = [1]
+        self.bytes_written = RECORD
+        with RecordWriter(self.layer_path(0), self.block_records) as writer:
+            writer.write(board.pack(self.goal))
+
+        depth = 0
+        while max_depth is None or depth < max_depth:
+            # Expand the layer into sorted runs of bounded size
+            runs = []
+            children = array("Q")
+            for state in self.layer(depth):
+                blank = board.find_blank(state)
+                for _, target in neighbors[blank]:
+                    children.append(board.slide(state, blank, target))
+                if len(children) >= self.buffer_records:
+                    runs.append(self.write_run(os.path.join(work, f"run-{len(runs):04d}.bin"), children))
+                    children = array("Q")
+            if children:
+                runs.append(self.write_run(os.path.join(work, f"run-{len(runs):04d}.bin"), children))
+            del children
+
+            # Merge the runs and drop the states of the previous layer
+            streams = [read_records(path, self.block_records) for path in runs]
+            previous = self.layer(depth - 1) if depth > 0 else ()
+            with RecordWriter(self.layer_path(depth + 1), self.block_records) as writer:
+                for state in difference(merge_unique(streams), previous):
+                    writer.write(state)
+            self.bytes_written += writer.count * RECORD
+            for path in runs:
+                os.remove(path)
+            if depth > 0 and not self.keep_layers:
+                os.remove(self.layer_path(depth - 1))
+            if writer.count == 0:
+                os.remove(self.layer_path(depth + 1))
+                break
+            self.histogram.append(writer.count)
+            depth += 1
+
+        if not self.keep_layers:
+            for stale in (depth - 1, depth):
+                if stale >= 0 and os.path.exists(self.layer_path(stale)):
+                    os.remove(self.layer_path(stale))
+            if not os.listdir(work):
+                os.rmdir(work)
+        return self.histogram
+
+
+if __name__ == "__main__":
+    for name, search in (
+        ("3x3", ExternalBFS(3)),
+        ("4x4 pattern 0-1-2-3", ExternalBFS(4, pattern=(0, 1, 2, 3), buffer_records=1 << 18)),
+    ):
+        began = time.perf_counter()
+        histogram = search.run()
+        print(
+            f"{name}: {sum(histogram)} states, deepest {len(histogram) - 1}, "
+            f"{search.bytes_written / 2**20:.1f} MiB written, {time.perf_counter() - began:.1f}s"
+        )
+        print("  " + " ".join(map(str, histogram)))
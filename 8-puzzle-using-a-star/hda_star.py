@@ -0,0 +1,384 @@
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+
+from a_star_algorithm import path_from_moves
+from board import Board
+from heuristics import make_heuristic
+from search_stats import SearchStats
+from solvability import is_solvable
+from transposition_table import TranspositionTable
+
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15  # Fibonacci hashing: spreads nearby packed states over the workers
+MASK_64 = (1 << 64) - 1
+CHUNK = 64  # Nodes a worker expands between two looks at its inbox
+FLUSH_EVERY = 8  # Chunks after which every outgoing batch is sent, full or not
+PROBE_INTERVAL = 0.01  # Seconds the coordinator waits for messages before it starts a termination wave
+
+
+def owner(state, workers):
+    """
+    Returns the worker that owns a state.
+
+    Args:
+        state (int): The packed state.
+        workers (int): The number of workers.
+
+    Returns:
+        int: The index of the worker.
+    """
+    return (((state * HASH_MULTIPLIER) & MASK_64) >> 32) % workers
+
+
+def worker_main(index, workers, rows, cols, goal, heuristic, batch_size, inboxes, results):
+    """
+    Runs one HDA* worker until it is told to stop. The worker keeps an open list and a
+    transposition table of the states it owns. Children it does not own are buffered per
+    owner and sent in batches of "nodes" messages.
+
+    Messages in the inbox:
+        ("nodes", batch): nodes (state, blank, g, h, move) whose owner is this worker.
+        ("bound", cost): the cost of the best solution found so far; nodes with f >= cost are dropped.
+        ("probe", wave): reply with ("count", wave, index, idle, sent, received, counters).
+        ("move", state): reply with ("move", state, move that reached it on its cheapest path).
+        ("stop",): exit.
+
+    Args:
+        index (int): The index of this worker.
+        workers (int): The number of workers.
+        rows (int): The number of rows of the board.
+        cols (int): The number of columns of the board.
+        goal (int): The packed goal configuration.
+        heuristic (str): The heuristic name.
+        batch_size (int): The number of nodes sent to another worker at once.
+        inboxes (list of Queue): The inbox of every worker.
+        results (Queue): The queue of the coordinator.
+    """
+    try:
+        board = Board(rows, cols)
+        estimator = make_heuristic(heuristic, board, board.unpack(goal))
+        table = TranspositionTable()
+        open_heap = []  # (f, h, state, blank, g): lowest f first, lowest h on ties
+        outgoing = [[] for _ in range(workers)]  # Buffered children of every other worker
+        bound = float("inf")  # Cost of the best known solution
+        sent = received = 0  # Batches of nodes, for the termination check
+        expanded = generated = duplicates = pushes = pops = peak_open = 0
+
+        def accept(state, blank, g, h, move):
+            nonlocal duplicates, pushes, peak_open
+            if g + h >= bound or not table.improve(state, g, move):
+                duplicates += 1
+                return
+            heapq.heappush(open_heap, (g + h, h, state, blank, g))
+            pushes += 1
+            if len(open_heap) > peak_open:
+                peak_open = len(open_heap)
+
+        def flush(full_only):
+            nonlocal sent
+            for target, batch in enumerate(outgoing):
+                if batch and (not full_only or len(batch) >= batch_size):
+                    inboxes[target].put(("nodes", batch))
+                    outgoing[target] = []
+                    sent += 1
+
+        def handle(message):
+            nonlocal bound, received
+            kind = message[0]
+            if kind == "nodes":
+                received += 1
+                for node in message[1]:
+                    accept(*node)
+            elif kind == "bound":
+                bound = min(bound, message[1])
+            elif kind == "probe":
+                flush(False)
+                idle = not open_heap or open_heap[0][0] >= bound
+                counters = (expanded, generated, duplicates, pushes, pops, peak_open)
+                results.put(("count", message[1], index, idle, sent, received, counters))
+            elif kind == "move":
+                results.put(("move", message[1], table.move(message[1])))
+            return kind != "stop"
+
+        chunks = 0
+        while True:
+            # Read everything that arrived, then block only when there is nothing worth expanding
+            try:
+                while True:
+                    if not handle(inboxes[index].get_nowait()):
+                        return
+            except queue.Empty:
+                pass
+            if not open_heap or open_heap[0][0] >= bound:
+                flush(False)
+                if not handle(inboxes[index].get()):
+                    return
+                continue
+
+            for _ in range(CHUNK):
+                if not open_heap or open_heap[0][0] >= bound:
+                    break
+                f, h, state, blank, g = heapq.heappop(open_heap)
+                pops += 1
+                if table.is_stale(state, g):
+                    continue
+                if state == goal:
+                    bound = g  # Every other node left here has f >= g
+                    results.put(("goal", index, g))
+                    continue
+                expanded += 1
+                tiles = board.unpack(state) if estimator.uses_tiles else None
+                for move, target in board.neighbors[blank]:
+                    child = board.slide(state, blank, target)
+                    generated += 1
+                    child_h = h + estimator.delta(tiles, board.tile_at(child, blank), target, blank)
+                    destination = owner(child, workers)
+                    if destination == index:
+                        accept(child, target, g + 1, child_h, move)
+                    elif g + 1 + child_h < bound:
+                        outgoing[destination].append((child, target, g + 1, child_h, move))
+            chunks += 1
+            flush(chunks % FLUSH_EVERY != 0)
+    except Exception:
+        results.put(("error", index, traceback.format_exc()))
+
+
+class HDAStar:
+    """
+    This class solves the puzzle with hash-distributed A* (HDA*) across worker processes.
+    Every state is owned by the worker picked by a hash of its packed value, which keeps the
+    open list and the transposition table for its states, so duplicates are detected without
+    any shared memory. Children owned by another worker are sent to it in batches.
+
+    The worker that owns the goal reports every cheaper solution it expands, and the bound is
+    sent to all workers, which drop nodes that cannot beat it. The search is over when every
+    worker has no node below the bound and no batch is in flight: the coordinator (the calling
+    process) checks this with waves of probes, and only trusts two consecutive waves with the
+    same message counters, so a batch in flight between two replies cannot be missed. The
+    solution is optimal with an admissible heuristic. The path is rebuilt by asking the owner
+    of every state on it for the move that reached it.
+    """
+
+    def __init__(self, size, heuristic="manhattan", workers=None, batch_size=256, stats=False):
+        """
+        Initializes the solver for a puzzle size.
+
+        Args:
+            size (int): The size of the puzzle grid (e.g., 4 for a 4x4 puzzle).
+            heuristic (str): The heuristic name (see heuristics.HEURISTICS); every worker builds its own.
+            workers (int): The number of worker processes (defaults to the number of cores).
+            batch_size (int): The number of nodes sent to another worker at once.
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats
+                (counters summed over the workers, peak_open of the largest open list).
+        """
+        self.n = size  # Puzzle size (n x n)
+        self.heuristic_kind = heuristic  # Name of the default heuristic
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.expanded = 0  # Number of nodes expanded by the last solve, over all workers
+        self.worker_expanded = []  # Number of nodes expanded by every worker in the last solve
+
+    def process(self, start, goal, puzzle_display, next_step_callback, heuristic=None):
+        """
+        Solves the puzzle and returns the optimal sequence of puzzle states, like Puzzle.process.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the solution path once it is found.
+            heuristic (str): The heuristic for this solve (defaults to the one given to the constructor).
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, or the goal cannot be reached.
+            RuntimeError: If a worker process failed.
+        """
+        board = Board.for_states(start, goal)
+        if board.rows != self.n or board.cols != self.n:
+            raise ValueError(f"Expected a {self.n}x{self.n} puzzle.")
+        if not is_solvable(start, goal):
+            raise ValueError("Puzzle is unsolvable.")
+        start_state, start_blank = board.encode(start)
+        goal_state, _ = board.encode(goal)
+
+        moves = self.search(board, start_state, start_blank, goal_state, heuristic or self.heuristic_kind)
+        steps = path_from_moves(board, start_state, start_blank, moves)
+        next_step_callback(steps)
+        return steps
+
+    def search(self, board, start, blank, goal, heuristic):
+        """
+        Starts the workers, coordinates the search and rebuilds the solution.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            blank (int): The cell of the blank space in the start configuration.
+            goal (int): The packed goal configuration.
+            heuristic (str): The heuristic name.
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+
+        Raises:
+            ValueError: If the goal cannot be reached.
+            RuntimeError: If a worker process failed.
+        """
+        self.stats = None
+        self.expanded = 0
+        self.worker_expanded = []
+        if start == goal:
+            return ""
+        began = time.perf_counter()
+        workers = self.workers
+        inboxes = [multiprocessing.Queue() for _ in range(workers)]
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=worker_main,
+                args=(i, workers, board.rows, board.cols, goal, heuristic, self.batch_size, inboxes, results),
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            h = make_heuristic(heuristic, board, board.unpack(goal)).evaluate(board.unpack(start))
+            inboxes[owner(start, workers)].put(("nodes", [(start, blank, 0, h, None)]))
+            cost, counters = self.coordinate(inboxes, results)
+            if cost is None:
+                raise ValueError("Puzzle is unsolvable.")
+
+            # Walk back from the goal, asking the owner of every state for its move
+            moves = []
+            state, cur = goal, board.find_blank(goal)
+            while True:
+                inboxes[owner(state, workers)].put(("move", state))
+                move = self.receive(results, "move")[2]
+                if move is None:
+                    break
+                moves.append(move)
+                state, cur = board.undo(state, cur, move)
+            moves.reverse()
+        finally:
+            for inbox in inboxes:
+                inbox.put(("stop",))
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        self.worker_expanded = [worker[0] for worker in counters]
+        self.expanded = sum(self.worker_expanded)
+        if self.collect_stats:
+            self.stats = SearchStats(
+                "hda",
+                expanded=self.expanded,
+                generated=sum(worker[1] for worker in counters),
+                duplicates=sum(worker[2] for worker in counters),
+                pushes=sum(worker[3] for worker in counters),
+                pops=sum(worker[4] for worker in counters),
+                peak_open=max(worker[5] for worker in counters),
+                seconds=time.perf_counter() - began,
+            )
+        return "".join(moves)
+
+    def coordinate(self, inboxes, results):
+        """
+        Forwards better solution costs to the workers and detects the end of the search.
+
+        Args:
+            inboxes (list of Queue): The inbox of every worker.
+            results (Queue): The queue of the coordinator.
+
+        Returns:
+            tuple: (cost, counters) where cost is the optimal solution cost (None if the goal was
+            never reached) and counters the search counters of every worker.
+
+        Raises:
+            RuntimeError: If a worker process failed.
+        """
+        workers = len(inboxes)
+        best = None
+        wave = 0
+        previous = None  # Counters of the last complete wave
+        while True:
+            try:
+                message = self.receive(results, None, PROBE_INTERVAL)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                if message[0] == "goal" and (best is None or message[2] < best):
+                    best = message[2]
+                    for inbox in inboxes:
+                        inbox.put(("bound", best))
+                continue
+
+            # Nothing happened for a while: ask every worker whether it is done
+            wave += 1
+            for inbox in inboxes:
+                inbox.put(("probe", wave))
+            replies = {}
+            while len(replies) < workers:
+                message = self.receive(results, None)
+                if message[0] == "count" and message[1] == wave:
+                    replies[message[2]] = message[3:]
+                elif message[0] == "goal" and (best is None or message[2] < best):
+                    best = message[2]
+                    for inbox in inboxes:
+                        inbox.put(("bound", best))
+
+            idle = all(reply[0] for reply in replies.values())
+            counts = [reply[1:3] for _, reply in sorted(replies.items())]
+            sent = 1 + sum(count[0] for count in counts)  # The coordinator sent the start node
+            received = sum(count[1] for count in counts)
+            if idle and sent == received and counts == previous:
+                return best, [reply[3] for _, reply in sorted(replies.items())]
+            previous = counts if idle and sent == received else None
+
+    @staticmethod
+    def receive(results, kind, timeout=None):
+        """
+        Takes the next message from the coordinator queue, raising worker failures.
+
+        Args:
+            results (Queue): The queue of the coordinator.
+            kind (str): The message kind expected (None for any).
+            timeout (float): How long to wait, or None to wait forever.
+
+        Returns:
+            tuple: The message.
+
+        Raises:
+            queue.Empty: If nothing arrived within the timeout.
+            RuntimeError: If a worker process failed.
+        """
+        while True:
+            message = results.get(timeout=timeout)
+            if message[0] == "error":
+                raise RuntimeError(f"HDA* worker {message[1]} failed:\n{message[2]}")
+            if kind is None or message[0] == kind:
+                return message
+
+
+if __name__ == "__main__":
+    start_grid = [["13", "2", "10", "3"], ["1", "12", "8", "4"], ["5", "_", "9", "6"], ["15", "14", "11", "7"]]
+    goal_grid = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "12"], ["13", "14", "15", "_"]]
+    for worker_count in sorted({1, 2, os.cpu_count() or 1}):
+        solver = HDAStar(4, heuristic="linear_conflict", workers=worker_count)
+        began = time.perf_counter()
+        path = solver.process(start_grid, goal_grid, None, lambda steps: None)
+        print(
+            f"{worker_count:>2} workers: {len(path) - 1} moves, {solver.expanded} expanded "
+            f"({solver.worker_expanded}), {time.perf_counter() - began:.2f}s"
+        )
@@ -0,0 +1,231 @@
+class Heuristic:
+    """
+    This class is the interface of the heuristic engine. A heuristic is built once per
+    goal configuration and precomputes the goal cell of every tile, so a child node gets its
+    value as a small delta from its parent instead of a scan of the whole board.
+
+    Tiles are tile codes as produced by Board.unpack (0 is the blank space).
+    """
+
+    name = None
+    uses_tiles = False  # True if delta() needs the parent tiles
+
+    def __init__(self, board, goal):
+        """
+        Initializes the heuristic for a goal configuration.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            goal (sequence of int): The tile code of every cell in the goal configuration.
+        """
+        self.board = board
+        self.goal = tuple(goal)
+        self.goal_index = [0] * board.cells  # Goal cell of every tile code
+        for index, tile in enumerate(self.goal):
+            self.goal_index[tile] = index
+
+    def evaluate(self, tiles):
+        """
+        Computes the heuristic value of a configuration from scratch.
+
+        Args:
+            tiles (sequence of int): The tile code of every cell.
+
+        Returns:
+            int: The estimated number of moves to the goal.
+        """
+        raise NotImplementedError
+
+    def delta(self, tiles, tile, src, dst):
+        """
+        Computes how the heuristic value changes when a tile slides into the blank space.
+
+        Args:
+            tiles (sequence of int): The tile codes before the move (only read if uses_tiles is True).
+            tile (int): The code of the tile that moves.
+            src (int): The cell the tile leaves (the blank space moves there).
+            dst (int): The cell the tile moves to (the old blank space).
+
+        Returns:
+            int: The heuristic value of the child minus that of the parent.
+        """
+        raise NotImplementedError
+
+
+class MisplacedTiles(Heuristic):
+    """
+    Counts the tiles that are not in their goal cell, excluding the blank space.
+    """
+
+    name = "misplaced"
+
+    def evaluate(self, tiles):
+        goal = self.goal
+        return sum(1 for index, tile in enumerate(tiles) if tile and tile != goal[index])
+
+    def delta(self, tiles, tile, src, dst):
+        goal_index = self.goal_index[tile]
+        return (dst != goal_index) - (src != goal_index)
+
+
+class Manhattan(Heuristic):
+    """
+    Sums the grid distance of every tile to its goal cell, excluding the blank space.
+    The distance of every (tile, cell) pair is looked up in a precomputed table.
+    """
+
+    name = "manhattan"
+
+    def __init__(self, board, goal):
+        super().__init__(board, goal)
+        cols = board.cols
+        # distance[tile][cell] is the number of moves the tile needs from cell to its goal cell
+        self.distance = [[0] * board.cells for _ in range(board.cells)]
+        for tile in range(1, board.cells):
+            goal_row, goal_col = divmod(self.goal_index[tile], cols)
+            for cell in range(board.cells):
+                row, col = divmod(cell, cols)
+                self.distance[tile][cell] = abs(row - goal_row) + abs(col - goal_col)
+
+    def evaluate(self, tiles):
+        distance = self.distance
+        return sum(distance[tile][index] for index, tile in enumerate(tiles) if tile)
+
+    def delta(self, tiles, tile, src, dst):
+        distance = self.distance[tile]
+        return distance[dst] - distance[src]
+
+
+class LinearConflict(Manhattan):
+    """
+    Manhattan distance plus two moves for every tile that has to leave its goal row (or column)
+    to let another tile of that line pass it. The conflict count of a line is the number of
+    its goal tiles that are not part of the longest correctly ordered subsequence, so the
+    estimate stays admissible. Line values are memoized, so a move costs one lookup for each
+    of the two lines it changes.
+    """
+
+    name = "linear_conflict"
+    uses_tiles = True
+
+    def __init__(self, board, goal):
+        super().__init__(board, goal)
+        cols = board.cols
+        self.goal_row = [index // cols for index in self.goal_index]
+        self.goal_col = [index % cols for index in self.goal_index]
+        self.rows = [tuple(range(r * cols, (r + 1) * cols)) for r in range(board.rows)]
+        self.cols = [tuple(range(c, board.cells, cols)) for c in range(cols)]
+        self.memo = {}  # (is_row, line index, tiles of the line) -> conflict count
+
+    def line_conflicts(self, is_row, line, line_tiles):
+        """
+        Counts the tiles of a line that must leave it to resolve the conflicts.
+
+        Args:
+            is_row (bool): True for a row, False for a column.
+            line (int): The row or column index.
+            line_tiles (tuple of int): The tile codes of the line in order.
+
+        Returns:
+            int: The number of tiles that are not part of the longest ordered subsequence.
+        """
+        key = (is_row, line, line_tiles)
+        value = self.memo.get(key)
+        if value is None:
+            goal_line, goal_pos = (
+                (self.goal_row, self.goal_col) if is_row else (self.goal_col, self.goal_row)
+            )
+            # Goal positions, in line order, of the tiles whose goal is on this line
+            order = [goal_pos[t] for t in line_tiles if t and goal_line[t] == line]
+            # Longest increasing subsequence by patience sorting
+            piles = []
+            for pos in order:
+                low, high = 0, len(piles)
+                while low < high:
+                    mid = (low + high) // 2
+                    if piles[mid] < pos:
+                        low = mid + 1
+                    else:
+                        high = mid
+                if low == len(piles):
+                    piles.append(pos)
+                else:
+                    piles[low] = pos
+            value = len(order) - len(piles)
+            self.memo[key] = value
+        return value
+
+    def evaluate(self, tiles):
+        conflicts = 0
+        for is_row, lines in ((True, self.rows), (False, self.cols)):
+            for line, cells in enumerate(lines):
+                conflicts += self.line_conflicts(is_row, line, tuple(tiles[i] for i in cells))
+        return super().evaluate(tiles) + 2 * conflicts
+
+    def delta(self, tiles, tile, src, dst):
+        cols = self.board.cols
+        src_row, src_col = divmod(src, cols)
+        dst_row, dst_col = divmod(dst, cols)
+        # A vertical move changes two rows, a horizontal move changes two columns
+        if src_col == dst_col:
+            is_row, lines = True, self.rows
+            changes = ((src_row, src_col, 0), (dst_row, dst_col, tile))
+        else:
+            is_row, lines = False, self.cols
+            changes = ((src_col, src_row, 0), (dst_col, dst_row, tile))
+
+        before = 0
+        after = 0
+        for line, offset, value in changes:
+            line_tiles = [tiles[i] for i in lines[line]]
+            before += self.line_conflicts(is_row, line, tuple(line_tiles))
+            line_tiles[offset] = value  # The tile leaves one line and enters the other
+            after += self.line_conflicts(is_row, line, tuple(line_tiles))
+
+        return self.distance[tile][dst] - self.distance[tile][src] + 2 * (after - before)
+
+
+# Heuristics that can be selected by name
+HEURISTICS = {
+    MisplacedTiles.name: MisplacedTiles,
+    Manhattan.name: Manhattan,
+    LinearConflict.name: LinearConflict,
+}
+
+
+def make_heuristic(kind, board, goal):
+    """
+    Creates a heuristic of the given kind for a goal configuration.
+
+    Args:
+        kind (str or Heuristic): One of the names in HEURISTICS, or an already built heuristic.
+        board (Board): The layout of the puzzle.
+        goal (sequence of int): The tile code of every cell in the goal configuration.
+
+    Returns:
+        Heuristic: The heuristic.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    if isinstance(kind, Heuristic):
+        return kind
+    try:
+        heuristic_class = HEURISTICS[kind]
+    except KeyError:
+        raise ValueError(
+            f"Unknown heuristic '{kind}', expected one of {sorted(HEURISTICS)}"
+        ) from None
+    return heuristic_class(board, goal)  # Outside the try, so a KeyError it raises is not misreported
+
+
+if __name__ == "__main__":
+    from a_star_algorithm import Puzzle
+
+    goal_state = [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]]
+    for text in ("41325_786", "_87654321", "867254_31"):
+        start_state = [list(text[i : i + 3]) for i in (0, 3, 6)]
+        for kind in HEURISTICS:
+            puzzle = Puzzle(3, heuristic=kind)
+            puzzle.process(start_state, goal_state, None, lambda steps: None)
+            print(f"{text} {kind:>16}: {puzzle.expanded} nodes expanded")
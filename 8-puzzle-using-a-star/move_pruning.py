@@ -0,0 +1,335 @@
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import deque
+
+from board import MOVES
+
+MAGIC = b"FSM1"
+HEADER = struct.Struct("<4sBBI")  # magic, longest redundant string, strict flag, number of states
+ROOT = 0  # Automaton state of the empty move string (the start of every search)
+REJECT = -1  # Transition of a move that completes a redundant string
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+STEPS = {"L": (0, -1), "R": (0, 1), "U": (-1, 0), "D": (1, 0)}
+
+
+def bounding_box(moves):
+    """
+    Returns the rows and columns visited by the blank space along a move string, relative to
+    its first cell.
+
+    Args:
+        moves (str): The moves of the blank space.
+
+    Returns:
+        tuple: (top, bottom, left, right).
+    """
+    r = c = top = bottom = left = right = 0
+    for move in moves:
+        dr, dc = STEPS[move]
+        r += dr
+        c += dc
+        top, bottom, left, right = min(top, r), max(bottom, r), min(left, c), max(right, c)
+    return top, bottom, left, right
+
+
+def find_redundant_strings(max_length, strict=False):
+    """
+    Finds the move strings that can always be replaced by a smaller equivalent one.
+
+    Every string of moves of the blank space up to max_length is applied, from the shortest
+    to the longest and in MOVES order within a length, to a board large enough to have no
+    edges. Two strings are equivalent when they leave the blank space and every tile in the
+    same place. A string is redundant when an earlier equivalent string stays within the rows
+    and columns it visits, so the equivalent string is legal wherever the redundant one is.
+    Only minimal redundant strings are kept: no kept string contains another one.
+
+    Pruning these strings keeps, for every state, the first of its shortest paths, which is
+    enough for a depth-first search without a table of seen states (IDA*). A search that keeps
+    one path per state (A*) needs strict=True, which only keeps strings with a strictly
+    shorter equivalent: a path that can be shortened is never the one the search needs.
+
+    Args:
+        max_length (int): The length of the longest string to try (memory and time grow about 3x per move).
+        strict (bool): Whether only strings with a strictly shorter equivalent are redundant.
+
+    Returns:
+        list of str: The redundant strings, shortest first.
+    """
+    width = 2 * max_length + 1  # Cells of a window the blank space cannot leave
+    offsets = {move: dr * width + dc for move, (dr, dc) in STEPS.items()}
+    center = max_length * width + max_length
+
+    redundant = set()
+    seen = {center: [""]}  # Effect of a string -> the kept strings with that effect
+    layer = [("", center, ())]  # Kept strings of the current length: (moves, blank cell, moved tiles)
+    for length in range(1, max_length + 1):
+        next_layer = []
+        for moves, blank, tiles in layer:
+            for move in MOVES:
+                string = moves + move
+                # Strings that end with a redundant one are not minimal (their prefix was kept)
+                if any(string[i:] in redundant for i in range(1, length - 1)):
+                    continue
+
+                target = blank + offsets[move]
+                moved = dict(tiles)  # Cell -> cell its tile came from, for tiles that moved
+                source = moved.pop(target, target)
+                if source != blank:
+                    moved[blank] = source
+                tiles_after = tuple(sorted(moved.items()))
+                effect = target
+                for cell, source in tiles_after:
+                    effect = (effect << 20) | (cell << 10) | source  # Cells fit in 10 bits
+
+                others = seen.get(effect)
+                if others is not None:
+                    box = bounding_box(string)
+                    if any(
+                        (len(other) < length or not strict) and inside(bounding_box(other), box)
+                        for other in others
+                    ):
+                        redundant.add(string)
+                        continue
+                    others.append(string)
+                else:
+                    seen[effect] = [string]
+                if length < max_length:
+                    next_layer.append((string, target, tiles_after))
+        layer = next_layer
+    return sorted(redundant, key=lambda string: (len(string), [MOVES.index(move) for move in string]))
+
+
+def inside(inner, outer):
+    """
+    Tells whether a bounding box (see bounding_box) lies within another one.
+
+    Args:
+        inner (tuple): The bounding box that should be inside.
+        outer (tuple): The enclosing bounding box.
+
+    Returns:
+        bool: True if inner is within outer.
+    """
+    return inner[0] >= outer[0] and inner[1] <= outer[1] and inner[2] >= outer[2] and inner[3] <= outer[3]
+
+
+class MoveAutomaton:
+    """
+    This class is a finite-state machine over moves of the blank space that rejects every
+    move completing a redundant move string (see find_redundant_strings). It is the
+    Aho-Corasick automaton of the redundant strings, stored as a flat transition table with
+    4 ints per state, so a search only carries one small int per node and needs no memory
+    for the states it visited.
+
+    The automaton of the strings of length 2 (max_length=2) only rejects the move that undoes
+    the previous one.
+    """
+
+    def __init__(self, max_length, strict, table):
+        """
+        Initializes the automaton.
+
+        Args:
+            max_length (int): The length of the longest redundant string it was built from.
+            strict (bool): Whether it was built from strictly redundant strings only.
+            table (array): The transitions: table[state * 4 + move index] is the next state or REJECT.
+        """
+        self.max_length = max_length
+        self.strict = strict
+        self.table = table
+        self.states = len(table) // len(MOVES)
+        # The same transitions as one dict per state, which is what the searches look up
+        self.rows = []
+        for state in range(self.states):
+            targets = table[state * len(MOVES) : (state + 1) * len(MOVES)]
+            self.rows.append({move: target for move, target in zip(MOVES, targets) if target != REJECT})
+
+    @staticmethod
+    def file_name(max_length, strict):
+        """
+        Returns the file name used for an automaton in a directory.
+
+        Args:
+            max_length (int): The length of the longest redundant string.
+            strict (bool): Whether only strictly redundant strings are rejected.
+
+        Returns:
+            str: The file name.
+        """
+        return f"moves-{max_length}{'-strict' if strict else ''}.fsm"
+
+    @classmethod
+    def build(cls, max_length, strict=False):
+        """
+        Builds the automaton of the redundant strings up to a length.
+
+        Args:
+            max_length (int): The length of the longest redundant string.
+            strict (bool): Whether only strictly redundant strings are rejected (for A*).
+
+        Returns:
+            MoveAutomaton: The automaton.
+        """
+        # Trie of the strings; no string contains another, so only the leaves reject
+        children = [{}]
+        final = [False]
+        for string in find_redundant_strings(max_length, strict):
+            node = 0
+            for move in string:
+                if move not in children[node]:
+                    children[node][move] = len(children)
+                    children.append({})
+                    final.append(False)
+                node = children[node][move]
+            final[node] = True
+
+        # Complete the transitions with the failure links, breadth first
+        goto = [dict(node) for node in children]
+        failure = [0] * len(children)
+        queue = deque()
+        for move in MOVES:
+            if move in goto[0]:
+                queue.append(goto[0][move])
+            else:
+                goto[0][move] = 0
+        while queue:
+            node = queue.popleft()
+            for move in MOVES:
+                child = children[node].get(move)
+                if child is None:
+                    goto[node][move] = goto[failure[node]][move]
+                else:
+                    failure[child] = goto[failure[node]][move]
+                    queue.append(child)
+
+        # Number the states that do not reject, in trie order (the root stays 0)
+        numbers = {}
+        for node in range(len(children)):
+            if not final[node]:
+                numbers[node] = len(numbers)
+        table = array("i")
+        for node in numbers:
+            for move in MOVES:
+                table.append(numbers.get(goto[node][move], REJECT))
+        return cls(max_length, strict, table)
+
+    def save(self, path):
+        """
+        Writes the automaton to a file.
+
+        Args:
+            path (str): The file to write.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table = array("i", self.table)
+        if sys.byteorder == "big":
+            table.byteswap()  # Files are little-endian
+        # Every writer has its own temp file, so processes building the same file at once do not clash
+        fd, temp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, self.max_length, self.strict, self.states))
+                f.write(table.tobytes())
+            os.replace(temp_path, path)  # Readers never see a partly written file
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an automaton file.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            MoveAutomaton: The automaton.
+
+        Raises:
+            ValueError: If the file is not an automaton file.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, max_length, strict, states = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a move automaton file.")
+        table = array("i")
+        table.frombytes(data[HEADER.size :])
+        if sys.byteorder == "big":
+            table.byteswap()
+        if len(table) != states * len(MOVES):
+            raise ValueError(f"{path} is truncated.")
+        return cls(max_length, bool(strict), table)
+
+    @classmethod
+    def open(cls, max_length, strict=False, directory=DEFAULT_DIRECTORY):
+        """
+        Loads an automaton from a directory, building and saving it first if needed. Short
+        automata (up to length 2) are cheap and always built in memory.
+
+        Args:
+            max_length (int): The length of the longest redundant string.
+            strict (bool): Whether only strictly redundant strings are rejected.
+            directory (str): The directory of the automaton files.
+
+        Returns:
+            MoveAutomaton: The automaton.
+        """
+        if max_length <= 2:
+            return cls.build(max_length, strict)
+        path = os.path.join(directory, cls.file_name(max_length, strict))
+        if not os.path.exists(path):
+            cls.build(max_length, strict).save(path)
+        return cls.load(path)
+
+    def step(self, state, move):
+        """
+        Returns the state after a move.
+
+        Args:
+            state (int): The current state (ROOT at the start of the search).
+            move (str): The move of the blank space.
+
+        Returns:
+            int: The next state, or REJECT if the move completes a redundant string.
+        """
+        return self.table[state * len(MOVES) + MOVES.index(move)]
+
+    def accepts(self, moves):
+        """
+        Tells whether a move string contains no redundant string.
+
+        Args:
+            moves (str): The moves of the blank space.
+
+        Returns:
+            bool: True if no move of the string is rejected.
+        """
+        state = ROOT
+        for move in moves:
+            state = self.step(state, move)
+            if state == REJECT:
+                return False
+        return True
+
+    def __len__(self):
+        return self.states
+
+
+if __name__ == "__main__":
+    import time
+
+    for length in (2, 6, 8, 10):
+        for strict_mode in (False, True):
+            began = time.perf_counter()
+            automaton = MoveAutomaton.open(length, strict_mode)
+            print(
+                f"length {length:>2}{' (strict)' if strict_mode else ''}: {len(automaton)} states, "
+                f"{len(automaton.table) * automaton.table.itemsize} bytes, {time.perf_counter() - began:.2f}s"
+            )
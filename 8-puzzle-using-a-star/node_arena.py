@@ -0,0 +1,275 @@
+"""
+Struct-of-arrays node storage for A*.
+
+Puzzle (a_star_algorithm.py) keeps its Node objects: its search is a generator that hands
+nodes to the GUI in progress events, keeps them in the interchangeable open list backends
+and carries per-node symmetry and move automaton slots, none of which fit a row of ints.
+ArenaPuzzle is the same A* with every node a row of a NodeArena instead, so the two can be
+compared on equal terms and the arena used where memory matters more than the GUI.
+"""
+
+import heapq
+import time
+from array import array
+
+from a_star_algorithm import path_from_moves
+from board import MOVES, Board
+from heuristics import make_heuristic
+from search_stats import SearchStats
+from solvability import is_solvable
+from transposition_table import NO_MOVE
+
+HANDLE_BITS = 32  # Bits of the node handle in an open list key (the parent column is 32-bit as well)
+H_BITS = 16  # Bits of the heuristic value in an open list key (for tie-breaking only)
+
+
+class NodeArena:
+    """
+    This class stores search nodes as a struct of arrays: one typed array (column) per field
+    (packed state, blank cell, g, f, parent and move) and one row per node. A node is just
+    its int handle (row index), so no per-node Python object is created and the garbage
+    collector has nothing to track. Columns double in size when they are full.
+
+    States fit in an unsigned 64-bit column up to 16 cells; larger boards keep them in a list.
+    Costs are 16-bit and handles 32-bit, so a row takes 19 bytes on boards up to 4x4.
+    """
+
+    def __init__(self, board, capacity=1024):
+        """
+        Initializes an empty arena.
+
+        Args:
+            board (Board): The layout of the puzzle (decides the width of the state column).
+            capacity (int): The number of rows allocated up front.
+        """
+        self.board = board
+        self.capacity = capacity
+        self.size = 0  # Number of nodes stored
+        wide = board.bits * board.cells > 64
+        self.states = [0] * capacity if wide else array("Q", bytes(8 * capacity))
+        self.blanks = array("H", bytes(2 * capacity))
+        self.g = array("H", bytes(2 * capacity))
+        self.f = array("H", bytes(2 * capacity))  # g + h, so a popped node's h is f - g
+        self.parents = array("i", bytes(4 * capacity))  # -1 for the root
+        self.moves = array("B", bytes(capacity))  # Index in MOVES, NO_MOVE for the root
+
+    def add(self, state, blank, g, f, parent=-1, move=None):
+        """
+        Stores a node.
+
+        Args:
+            state (int): The packed configuration.
+            blank (int): The cell of the blank space.
+            g (int): The cost from the start.
+            f (int): g plus the heuristic estimate.
+            parent (int): The handle of the parent (-1 for the root).
+            move (str): The move of the blank space that reached the node (None for the root).
+
+        Returns:
+            int: The handle of the node.
+        """
+        if self.size == self.capacity:
+            self.grow()
+        handle = self.size
+        self.states[handle] = state
+        self.blanks[handle] = blank
+        self.g[handle] = g
+        self.f[handle] = f
+        self.parents[handle] = parent
+        self.moves[handle] = NO_MOVE if move is None else MOVES.index(move)
+        self.size += 1
+        return handle
+
+    def grow(self):
+        """
+        Doubles the capacity of every column, in place so references to the columns stay valid.
+        """
+        extra = self.capacity
+        for column in (self.states, self.blanks, self.g, self.f, self.parents, self.moves):
+            if isinstance(column, array):
+                column.frombytes(bytes(column.itemsize * extra))
+            else:
+                column.extend([0] * extra)
+        self.capacity += extra
+
+    def path(self, handle):
+        """
+        Follows the parent column from a node back to the root.
+
+        Args:
+            handle (int): The handle of the last node.
+
+        Returns:
+            str: The moves of the blank space from the root to the node.
+        """
+        moves = []
+        while self.parents[handle] >= 0:
+            moves.append(MOVES[self.moves[handle]])
+            handle = self.parents[handle]
+        moves.reverse()
+        return "".join(moves)
+
+    def nbytes(self):
+        """
+        Returns the memory used by the columns (states in a list count 8 bytes per pointer only).
+
+        Returns:
+            int: The number of bytes.
+        """
+        return sum(
+            len(column) * (column.itemsize if isinstance(column, array) else 8)
+            for column in (self.states, self.blanks, self.g, self.f, self.parents, self.moves)
+        )
+
+    def __len__(self):
+        return self.size
+
+
+class ArenaPuzzle:
+    """
+    This class runs the same A* search as Puzzle, with nodes stored in a NodeArena. The open
+    list is a heap of plain ints that pack (f, h, handle), and the table of seen states maps a
+    packed state to its lowest g-value (a small, shared int), so a solve allocates no object
+    per node apart from the dict entry and the heap key.
+    """
+
+    def __init__(self, size, heuristic="manhattan", stats=False):
+        """
+        Initializes the solver for a puzzle size.
+
+        Args:
+            size (int): The size of the puzzle grid (e.g., 3 for a 3x3 puzzle).
+            heuristic (str or Heuristic): The default heuristic (see heuristics.HEURISTICS).
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats.
+        """
+        self.n = size  # Puzzle size (n x n)
+        self.heuristic_kind = heuristic  # Name of the default heuristic
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.arena = None  # Nodes of the last solve
+        self.expanded = 0  # Number of nodes expanded by the last solve
+
+    def process(self, start, goal, puzzle_display, next_step_callback, heuristic=None):
+        """
+        Solves the puzzle and returns the optimal sequence of puzzle states, like Puzzle.process.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the solution path once it is found.
+            heuristic (str or Heuristic): The heuristic for this solve (defaults to the one given to the constructor).
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, or the goal cannot be reached.
+        """
+        board = Board.for_states(start, goal)
+        if board.rows != self.n or board.cols != self.n:
+            raise ValueError(f"Expected a {self.n}x{self.n} puzzle.")
+        if not is_solvable(start, goal):
+            raise ValueError("Puzzle is unsolvable.")
+        start_state, start_blank = board.encode(start)
+        goal_state, _ = board.encode(goal)
+
+        moves = self.search(board, start_state, start_blank, goal_state, heuristic or self.heuristic_kind)
+        steps = path_from_moves(board, start_state, start_blank, moves)
+        next_step_callback(steps)
+        return steps
+
+    def search(self, board, start, blank, goal, heuristic):
+        """
+        Runs A* on packed states with nodes in an arena.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            blank (int): The cell of the blank space in the start configuration.
+            goal (int): The packed goal configuration.
+            heuristic (str or Heuristic): The heuristic to use.
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+        """
+        estimator = make_heuristic(heuristic, board, board.unpack(goal))
+        arena = self.arena = NodeArena(board)
+        states, blanks, g_column, f_column = arena.states, arena.blanks, arena.g, arena.f
+        neighbors = board.neighbors
+        self.expanded = 0
+        self.stats = None
+        began = time.perf_counter()
+        generated = pops = peak_open = 0  # Search counters (pushes are the arena rows)
+
+        h = estimator.evaluate(board.unpack(start))
+        root = arena.add(start, blank, 0, h)
+        best = {start: 0}  # Packed state -> lowest g-value
+        handle_mask = (1 << HANDLE_BITS) - 1
+        # Keys sort by f, then h, then handle (older nodes first)
+        open_heap = [(h << (H_BITS + HANDLE_BITS)) | (h << HANDLE_BITS) | root]
+
+        while open_heap:
+            if len(open_heap) > peak_open:
+                peak_open = len(open_heap)
+            key = heapq.heappop(open_heap)
+            pops += 1
+            handle = key & handle_mask
+            state = states[handle]
+            if best[state] < g_column[handle]:
+                continue  # Superseded by a cheaper node for the same state
+            self.expanded += 1
+            if state == goal:
+                if self.collect_stats:
+                    self.stats = SearchStats(
+                        "arena",
+                        expanded=self.expanded,
+                        generated=generated,
+                        duplicates=generated - len(arena) + 1,
+                        pushes=len(arena),
+                        pops=pops,
+                        peak_open=peak_open,
+                        seconds=time.perf_counter() - began,
+                    )
+                return arena.path(handle)
+
+            g = g_column[handle]
+            h = f_column[handle] - g
+            g += 1
+            cur = blanks[handle]
+            tiles = board.unpack(state) if estimator.uses_tiles else None
+            generated += len(neighbors[cur])
+            for move, target in neighbors[cur]:
+                child = board.slide(state, cur, target)
+                known = best.get(child)
+                if known is not None and known <= g:
+                    continue
+                child_h = h + estimator.delta(tiles, board.tile_at(child, cur), target, cur)
+                child_handle = arena.add(child, target, g, g + child_h, handle, move)
+                best[child] = g
+                heapq.heappush(
+                    open_heap,
+                    ((g + child_h) << (H_BITS + HANDLE_BITS)) | (child_h << HANDLE_BITS) | child_handle,
+                )
+
+        raise ValueError("Puzzle is unsolvable.")
+
+
+if __name__ == "__main__":
+    import tracemalloc
+
+    from a_star_algorithm import Puzzle
+
+    start_grid = [["13", "2", "10", "3"], ["1", "12", "8", "4"], ["5", "_", "9", "6"], ["15", "14", "11", "7"]]
+    goal_grid = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "12"], ["13", "14", "15", "_"]]
+    for name, solver in (
+        ("Node objects", Puzzle(4, heuristic="linear_conflict")),
+        ("node arena", ArenaPuzzle(4, heuristic="linear_conflict")),
+    ):
+        tracemalloc.start()
+        began = time.perf_counter()
+        path = solver.process(start_grid, goal_grid, None, lambda steps: None)
+        seconds = time.perf_counter() - began
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:>12}: {len(path) - 1} moves, {solver.expanded} expanded, {seconds:.2f}s, peak {peak / 2**20:.1f} MiB")
@@ -0,0 +1,332 @@
+import heapq
+import random
+import time
+from itertools import count
+
+REMOVED = object()  # Placeholder left in an entry that was lazily deleted
+
+
+class SortedOpenList:
+    """
+    This class keeps the open list as a plain Python list that is re-sorted by f-value
+    before every pop. It is the original behaviour of Puzzle.process and is kept as a
+    reference backend for benchmarks.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty open list.
+        """
+        self.entries = []  # Entries in insertion order until the next sort
+        self.size = 0  # Number of entries that have not been removed
+        self.dirty = False  # True when entries were pushed since the last sort
+
+    def push(self, item, f, h):
+        """
+        Adds an item to the open list.
+
+        Args:
+            item (object): The item to store (usually a Node).
+            f (int or float): The priority of the item (lower is popped first).
+            h (int or float): The heuristic value of the item (not used by this backend).
+
+        Returns:
+            list: The entry of the item, which can be passed to remove().
+        """
+        entry = [f, h, item]
+        self.entries.append(entry)
+        self.size += 1
+        self.dirty = True
+        return entry
+
+    def pop(self):
+        """
+        Removes and returns the item with the lowest f-value.
+
+        Returns:
+            object: The item with the lowest f-value.
+
+        Raises:
+            IndexError: If the open list is empty.
+        """
+        if self.dirty:
+            # Stable sort on f only, exactly like the original open list
+            self.entries.sort(key=lambda entry: entry[0])
+            self.dirty = False
+        while self.entries:
+            entry = self.entries.pop(0)
+            if entry[-1] is not REMOVED:
+                self.size -= 1
+                return entry[-1]
+        raise IndexError("pop from an empty open list")
+
+    def peek(self):
+        """
+        Returns the lowest f-value in the open list without removing its item.
+
+        Returns:
+            int or float or None: The lowest f-value, or None if the open list is empty.
+        """
+        if self.dirty:
+            self.entries.sort(key=lambda entry: entry[0])
+            self.dirty = False
+        for entry in self.entries:
+            if entry[-1] is not REMOVED:
+                return entry[0]
+        return None
+
+    def remove(self, entry):
+        """
+        Lazily deletes an entry; it is skipped when it reaches the front of the list.
+
+        Args:
+            entry (list): The entry returned by push().
+        """
+        if entry[-1] is not REMOVED:
+            entry[-1] = REMOVED
+            self.size -= 1
+
+    def __len__(self):
+        return self.size
+
+
+class HeapOpenList:
+    """
+    This class keeps the open list as a binary heap (heapq). Entries are ordered by f-value,
+    then by h-value so that nodes closer to the goal are expanded first, then by insertion
+    order. Removed entries stay in the heap and are skipped when popped (lazy deletion).
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty heap.
+        """
+        self.heap = []  # Heap of [f, h, sequence, item] entries
+        self.counter = count()  # Insertion order, makes every entry unique
+        self.size = 0  # Number of entries that have not been removed
+
+    def push(self, item, f, h):
+        """
+        Adds an item to the heap in O(log n).
+
+        Args:
+            item (object): The item to store (usually a Node).
+            f (int or float): The priority of the item (lower is popped first).
+            h (int or float): The heuristic value of the item, used to break ties on f.
+
+        Returns:
+            list: The entry of the item, which can be passed to remove().
+        """
+        entry = [f, h, next(self.counter), item]
+        heapq.heappush(self.heap, entry)
+        self.size += 1
+        return entry
+
+    def pop(self):
+        """
+        Removes and returns the item with the lowest (f, h) in O(log n) amortized.
+
+        Returns:
+            object: The item with the lowest (f, h).
+
+        Raises:
+            IndexError: If the heap is empty.
+        """
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            if entry[-1] is not REMOVED:
+                self.size -= 1
+                return entry[-1]
+        raise IndexError("pop from an empty open list")
+
+    def peek(self):
+        """
+        Returns the lowest f-value in the heap without removing its item.
+
+        Returns:
+            int or float or None: The lowest f-value, or None if the heap is empty.
+        """
+        while self.heap and self.heap[0][-1] is REMOVED:
+            heapq.heappop(self.heap)  # Drop deleted entries from the top
+        return self.heap[0][0] if self.heap else None
+
+    def remove(self, entry):
+        """
+        Lazily deletes an entry in O(1).
+
+        Args:
+            entry (list): The entry returned by push().
+        """
+        if entry[-1] is not REMOVED:
+            entry[-1] = REMOVED
+            self.size -= 1
+
+    def __len__(self):
+        return self.size
+
+
+class BucketOpenList:
+    """
+    This class keeps the open list as a two-level bucket queue. Since f and h are small
+    non-negative integers for the sliding puzzle, every entry is stored in a stack at
+    buckets[f][h] and push/pop cost O(1) apart from the scan for the next non-empty bucket.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty bucket queue.
+        """
+        self.buckets = []  # buckets[f][h] is a stack of entries
+        self.min_f = 0  # No live entry has an f-value lower than this
+        self.size = 0  # Number of entries that have not been removed
+
+    def push(self, item, f, h):
+        """
+        Adds an item to the bucket for its (f, h) pair in O(1) amortized.
+
+        Args:
+            item (object): The item to store (usually a Node).
+            f (int): The priority of the item (lower is popped first).
+            h (int): The heuristic value of the item, used to break ties on f.
+
+        Returns:
+            list: The entry of the item, which can be passed to remove().
+
+        Raises:
+            ValueError: If f or h is not a non-negative integer.
+        """
+        if not isinstance(f, int) or not isinstance(h, int) or f < 0 or h < 0:
+            raise ValueError("BucketOpenList needs non-negative integer f and h values")
+
+        # Grow the bucket arrays on demand
+        while len(self.buckets) <= f:
+            self.buckets.append([])
+        row = self.buckets[f]
+        while len(row) <= h:
+            row.append([])
+
+        entry = [item]
+        row[h].append(entry)
+        self.size += 1
+        if self.size == 1 or f < self.min_f:
+            self.min_f = f
+        return entry
+
+    def pop(self):
+        """
+        Removes and returns an item with the lowest (f, h), newest first within a bucket.
+
+        Returns:
+            object: The item with the lowest (f, h).
+
+        Raises:
+            IndexError: If the bucket queue is empty.
+        """
+        while self.size:
+            row = self.buckets[self.min_f]
+            for stack in row:
+                while stack:
+                    entry = stack.pop()
+                    if entry[-1] is not REMOVED:
+                        self.size -= 1
+                        return entry[-1]
+            self.min_f += 1  # Every bucket for this f-value is empty, move on
+        raise IndexError("pop from an empty open list")
+
+    def peek(self):
+        """
+        Returns the lowest f-value in the bucket queue without removing its item.
+
+        Returns:
+            int or None: The lowest f-value, or None if the bucket queue is empty.
+        """
+        while self.size:
+            for stack in self.buckets[self.min_f]:
+                while stack and stack[-1][-1] is REMOVED:
+                    stack.pop()  # Drop deleted entries from the top
+                if stack:
+                    return self.min_f
+            self.min_f += 1
+        return None
+
+    def remove(self, entry):
+        """
+        Lazily deletes an entry in O(1).
+
+        Args:
+            entry (list): The entry returned by push().
+        """
+        if entry[-1] is not REMOVED:
+            entry[-1] = REMOVED
+            self.size -= 1
+
+    def __len__(self):
+        return self.size
+
+
+# Open list backends that can be selected by name
+OPEN_LISTS = {
+    "sorted": SortedOpenList,
+    "heap": HeapOpenList,
+    "bucket": BucketOpenList,
+}
+
+
+def make_open_list(kind):
+    """
+    Creates an empty open list of the given kind.
+
+    Args:
+        kind (str): One of the names in OPEN_LISTS ("sorted", "heap" or "bucket").
+
+    Returns:
+        object: A new, empty open list.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    try:
+        return OPEN_LISTS[kind]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown open list '{kind}', expected one of {sorted(OPEN_LISTS)}"
+        ) from None
+
+
+def benchmark(kinds=None, operations=200000, max_f=60, seed=0):
+    """
+    Times every open list backend on the same synthetic A*-like workload: each pop is
+    followed by up to four pushes whose f-value is close to the popped one.
+
+    Args:
+        kinds (list of str): The backends to time (all of them by default).
+        operations (int): The number of pops to perform.
+        max_f (int): The largest f-value that is generated.
+        seed (int): Seed for the random workload, so every backend sees the same input.
+
+    Returns:
+        dict: The elapsed time in seconds for every backend.
+    """
+    results = {}
+    for kind in kinds or OPEN_LISTS:
+        rng = random.Random(seed)
+        open_list = make_open_list(kind)
+        start = time.perf_counter()
+        open_list.push(0, 0, 0)
+        for _ in range(operations):
+            if not open_list:
+                break
+            f = open_list.pop()
+            for _ in range(rng.randint(1, 4)):
+                child_f = min(max_f, f + rng.choice((0, 0, 2)))
+                open_list.push(child_f, child_f, rng.randint(0, child_f))
+        results[kind] = time.perf_counter() - start
+    return results
+
+
+if __name__ == "__main__":
+    # The sorted backend is quadratic, so keep the default run short for it
+    for kind, seconds in benchmark(["sorted"], operations=5000).items():
+        print(f"{kind:>8}: {seconds:.3f}s (5000 pops)")
+    for kind, seconds in benchmark(["heap", "bucket"]).items():
+        print(f"{kind:>8}: {seconds:.3f}s (200000 pops)")
@@ -0,0 +1,445 @@
+import mmap
+import os
+import struct
+import tempfile
+
+from heuristics import HEURISTICS, Manhattan
+
+MAGIC = b"PDB1"
+HEADER = struct.Struct("<4sBBBB")  # magic, rows, cols, blank cell, number of pattern cells
+UNKNOWN = 255  # Table value of a placement that was not reached
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb")
+AUTO_BUILD_LIMIT = 10000  # Largest table (in placements) open() builds without being asked, well under a second
+
+
+def placement_count(cells, k):
+    """
+    Returns the number of ways to place k distinct tiles on a board.
+
+    Args:
+        cells (int): The number of cells of the board.
+        k (int): The number of tiles.
+
+    Returns:
+        int: cells * (cells - 1) * ... * (cells - k + 1).
+    """
+    total = 1
+    for i in range(k):
+        total *= cells - i
+    return total
+
+
+def rank_placement(positions, cells):
+    """
+    Ranks a placement of distinct tiles (a partial permutation) into 0 .. placement_count - 1.
+    Each position is replaced by the number of free cells before it, which gives a mixed-radix number.
+
+    Args:
+        positions (sequence of int): The cell of every pattern tile, in pattern order.
+        cells (int): The number of cells of the board.
+
+    Returns:
+        int: The rank of the placement.
+    """
+    used = 0
+    rank = 0
+    for i, cell in enumerate(positions):
+        rank = rank * (cells - i) + cell - bin(used & ((1 << cell) - 1)).count("1")
+        used |= 1 << cell
+    return rank
+
+
+def unrank_placement(rank, k, cells):
+    """
+    Inverts rank_placement.
+
+    Args:
+        rank (int): The rank of the placement.
+        k (int): The number of pattern tiles.
+        cells (int): The number of cells of the board.
+
+    Returns:
+        list of int: The cell of every pattern tile, in pattern order.
+    """
+    digits = []
+    for i in range(k - 1, -1, -1):
+        rank, digit = divmod(rank, cells - i)
+        digits.append(digit)
+    digits.reverse()
+
+    free = list(range(cells))
+    return [free.pop(digit) for digit in digits]
+
+
+class PatternDatabase:
+    """
+    This class is a pattern database: the exact number of moves of the pattern tiles needed to
+    bring them to their goal cells, for every placement of those tiles. Moves of the other
+    tiles are free, so the values of disjoint patterns can be added and stay admissible.
+
+    A pattern is given by the goal cells of its tiles, so the same table serves every goal
+    with the same pattern cells and blank cell. The table is stored on disk as a header
+    followed by one byte per placement rank and read through mmap.
+    """
+
+    def __init__(self, rows, cols, blank, pattern, table):
+        """
+        Initializes the pattern database from a table.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+            pattern (tuple of int): The goal cells of the pattern tiles.
+            table (bytes-like): The distance of every placement rank.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.blank = blank
+        self.pattern = tuple(pattern)
+        self.table = table
+
+    @staticmethod
+    def file_name(rows, cols, blank, pattern):
+        """
+        Returns the file name used for a pattern database in a directory.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+            pattern (tuple of int): The goal cells of the pattern tiles.
+
+        Returns:
+            str: The file name.
+        """
+        return f"{rows}x{cols}-b{blank}-{'-'.join(map(str, pattern))}.pdb"
+
+    @classmethod
+    def build(cls, rows, cols, blank, pattern, progress=None):
+        """
+        Builds a pattern database by breadth-first search backwards from the goal placement.
+        A search state is a placement of the pattern tiles and the region of cells the blank
+        space can reach without moving a pattern tile; every layer of the search is one move
+        of a pattern tile.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+            pattern (sequence of int): The goal cells of the pattern tiles.
+            progress (function): Called after every layer with (depth, placements reached so far, total placements).
+
+        Returns:
+            PatternDatabase: The pattern database.
+        """
+        cells = rows * cols
+        k = len(pattern)
+        neighbors = [[] for _ in range(cells)]
+        for cell in range(cells):
+            row, col = divmod(cell, cols)
+            if row > 0:
+                neighbors[cell].append(cell - cols)
+            if row < rows - 1:
+                neighbors[cell].append(cell + cols)
+            if col > 0:
+                neighbors[cell].append(cell - 1)
+            if col < cols - 1:
+                neighbors[cell].append(cell + 1)
+
+        def region(start, occupied):
+            # Cells the blank space can reach from start without moving a pattern tile
+            seen = 1 << start
+            stack = [start]
+            while stack:
+                cell = stack.pop()
+                for neighbor in neighbors[cell]:
+                    bit = 1 << neighbor
+                    if not (seen | occupied) & bit:
+                        seen |= bit
+                        stack.append(neighbor)
+            return seen
+
+        def lowest(mask):
+            return (mask & -mask).bit_length() - 1
+
+        table = bytearray([UNKNOWN]) * placement_count(cells, k)
+        visited = bytearray((len(table) * cells + 7) // 8)  # One bit per (placement, region)
+
+        positions = list(pattern)
+        occupied = sum(1 << cell for cell in positions)
+        rank = rank_placement(positions, cells)
+        table[rank] = 0
+        state = rank * cells + lowest(region(blank, occupied))
+        visited[state >> 3] |= 1 << (state & 7)
+
+        depth = 0
+        reached = 1  # Placements with a value
+        frontier = [state]
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for state in frontier:
+                rank, start = divmod(state, cells)
+                positions = unrank_placement(rank, k, cells)
+                occupied = sum(1 << cell for cell in positions)
+                owner = {cell: i for i, cell in enumerate(positions)}
+
+                reachable = region(start, occupied)
+                mask = reachable
+                while mask:
+                    cell = lowest(mask)
+                    mask &= mask - 1
+                    for neighbor in neighbors[cell]:
+                        i = owner.get(neighbor)
+                        if i is None:
+                            continue
+                        # Slide pattern tile i from neighbor into the blank region
+                        positions[i] = cell
+                        child_occupied = occupied ^ (1 << neighbor) ^ (1 << cell)
+                        child_rank = rank_placement(positions, cells)
+                        child = child_rank * cells + lowest(region(neighbor, child_occupied))
+                        positions[i] = neighbor
+                        if visited[child >> 3] & (1 << (child & 7)):
+                            continue
+                        visited[child >> 3] |= 1 << (child & 7)
+                        if table[child_rank] == UNKNOWN:
+                            table[child_rank] = depth
+                            reached += 1
+                        next_frontier.append(child)
+            frontier = next_frontier
+            if progress is not None:
+                progress(depth, reached, len(table))
+
+        return cls(rows, cols, blank, pattern, table)
+
+    def save(self, path):
+        """
+        Writes the pattern database to a file.
+
+        Args:
+            path (str): The file to write.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Every writer has its own temp file, so processes building the same file at once do not clash
+        fd, temp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, self.rows, self.cols, self.blank, len(self.pattern)))
+                f.write(bytes(self.pattern))
+                f.write(self.table)
+            os.replace(temp_path, path)  # Readers never see a partly written file
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Maps a pattern database file into memory. Pages are loaded on demand and shared
+        between every process that maps the same file.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            PatternDatabase: The pattern database.
+
+        Raises:
+            ValueError: If the file is not a pattern database.
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rows, cols, blank, k = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a pattern database file.")
+        offset = HEADER.size + k
+        pattern = tuple(data[HEADER.size : offset])
+        table = memoryview(data)[offset:]
+        if len(table) != placement_count(rows * cols, k):
+            raise ValueError(f"{path} is truncated.")
+        return cls(rows, cols, blank, pattern, table)
+
+    @classmethod
+    def open(cls, rows, cols, blank, pattern, directory=DEFAULT_DIRECTORY, build=False, progress=None):
+        """
+        Loads a pattern database from a directory. A missing file is built and saved first if
+        the table is small (AUTO_BUILD_LIMIT placements) or build is True; larger tables take
+        minutes in pure Python (a 6-tile 4x4 pattern), so they are never built by surprise.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board.
+            blank (int): The goal cell of the blank space.
+            pattern (sequence of int): The goal cells of the pattern tiles.
+            directory (str): The directory of the pattern database files.
+            build (bool): Whether a missing file of any size is built.
+            progress (function): Passed to build (see build).
+
+        Returns:
+            PatternDatabase: The pattern database.
+
+        Raises:
+            FileNotFoundError: If the file is missing, too large to build by default and build is False.
+        """
+        path = os.path.join(directory, cls.file_name(rows, cols, blank, tuple(pattern)))
+        if not os.path.exists(path):
+            if not build and placement_count(rows * cols, len(pattern)) > AUTO_BUILD_LIMIT:
+                raise FileNotFoundError(
+                    f"Pattern database {path} is missing. Build it ahead of time with "
+                    f"'python pattern_database.py {rows} {cols}' (this takes minutes for 6-tile patterns)."
+                )
+            cls.build(rows, cols, blank, pattern, progress).save(path)
+        return cls.load(path)
+
+    def lookup(self, positions):
+        """
+        Returns the number of pattern moves needed from a placement.
+
+        Args:
+            positions (sequence of int): The current cell of every pattern tile, in pattern order.
+
+        Returns:
+            int: The exact distance of the placement.
+        """
+        return self.table[rank_placement(positions, self.cells)]
+
+
+def default_partition(rows, cols, blank):
+    """
+    Returns the disjoint patterns used when none is given: 4-4 on the 8-puzzle, 6-6-3 on the
+    15-puzzle with the blank space in the last cell, and groups of up to five cells otherwise.
+
+    Args:
+        rows (int): The number of rows of the board.
+        cols (int): The number of columns of the board.
+        blank (int): The goal cell of the blank space.
+
+    Returns:
+        list of tuple of int: The goal cells of every pattern.
+    """
+    if (rows, cols, blank) == (4, 4, 15):
+        return [(0, 4, 5, 8, 9, 12), (6, 7, 10, 11, 13, 14), (1, 2, 3)]
+    cells = [cell for cell in range(rows * cols) if cell != blank]
+    size = 4 if rows * cols <= 9 else 5
+    return [tuple(cells[i : i + size]) for i in range(0, len(cells), size)]
+
+
+class PatternDatabaseHeuristic(Manhattan):
+    """
+    Sums the values of disjoint pattern databases. Tiles that are not part of any pattern
+    add their Manhattan distance, which keeps the sum admissible. A move only changes the
+    value of the pattern that contains the moving tile. The cell of every tile and the value
+    of every pattern are computed once per parent and reused for all its children.
+    """
+
+    name = "pdb"
+    uses_tiles = True
+
+    def __init__(self, board, goal, partition=None, directory=DEFAULT_DIRECTORY, build=False):
+        """
+        Initializes the heuristic, loading (or building) the pattern databases of a partition.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            goal (sequence of int): The tile code of every cell in the goal configuration.
+            partition (list of sequence of int): The goal cells of every pattern (see default_partition).
+            directory (str): The directory of the pattern database files.
+            build (bool): Whether missing large databases are built (see PatternDatabase.open).
+
+        Raises:
+            FileNotFoundError: If a large database is missing and build is False.
+        """
+        super().__init__(board, goal)
+        blank = self.goal_index[0]
+        if partition is None:
+            partition = default_partition(board.rows, board.cols, blank)
+        self.databases = [
+            PatternDatabase.open(board.rows, board.cols, blank, cells, directory, build)
+            for cells in partition
+        ]
+
+        # Tile codes of every pattern, and the pattern of every tile (None for Manhattan tiles)
+        self.patterns = [tuple(self.goal[cell] for cell in cells) for cells in partition]
+        self.owner = [None] * board.cells
+        self.slot = [None] * board.cells  # Index of every tile in its pattern
+        for i, tiles in enumerate(self.patterns):
+            for slot, tile in enumerate(tiles):
+                self.owner[tile] = i
+                self.slot[tile] = slot
+
+        self.parent = None  # Tiles of the last configuration whose tile cells were computed
+        self.parent_where = None  # Its cell of every tile code
+        self.parent_values = None  # Its value of every pattern, filled on first use
+
+    def where(self, tiles):
+        """
+        Returns the cell of every tile of a configuration.
+
+        Args:
+            tiles (sequence of int): The tile code of every cell.
+
+        Returns:
+            list of int: The cell of every tile code.
+        """
+        key = tiles if type(tiles) is tuple else tuple(tiles)  # Searches may change a list in place
+        if key != self.parent:
+            where = [0] * self.board.cells
+            for index, tile in enumerate(key):
+                where[tile] = index
+            self.parent = key
+            self.parent_where = where
+            self.parent_values = [None] * len(self.databases)
+        return self.parent_where
+
+    def evaluate(self, tiles):
+        where = self.where(tiles)
+        distance = self.distance
+        value = sum(
+            distance[tile][where[tile]]
+            for tile in range(1, self.board.cells)
+            if self.owner[tile] is None
+        )
+        for database, pattern in zip(self.databases, self.patterns):
+            value += database.lookup([where[tile] for tile in pattern])
+        return value
+
+    def delta(self, tiles, tile, src, dst):
+        i = self.owner[tile]
+        if i is None:
+            return self.distance[tile][dst] - self.distance[tile][src]
+
+        where = self.where(tiles)
+        positions = [where[t] for t in self.patterns[i]]
+        before = self.parent_values[i]
+        if before is None:
+            before = self.parent_values[i] = self.databases[i].lookup(positions)
+        positions[self.slot[tile]] = dst
+        return self.databases[i].lookup(positions) - before
+
+
+HEURISTICS[PatternDatabaseHeuristic.name] = PatternDatabaseHeuristic
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Build the default pattern databases ahead of time: python pattern_database.py 4 4
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else rows
+    blank = rows * cols - 1
+    for cells in default_partition(rows, cols, blank):
+        database = PatternDatabase.open(
+            rows,
+            cols,
+            blank,
+            cells,
+            build=True,
+            progress=lambda depth, reached, total: print(
+                f"  depth {depth}: {reached}/{total} placements", end="\r", flush=True
+            ),
+        )
+        print(f"pattern {cells}: {len(database.table)} entries, max {max(database.table)}".ljust(40))
@@ -0,0 +1,327 @@
+import heapq
+import time
+
+from a_star_algorithm import path_from_moves
+from board import OPPOSITE, Board
+from heuristics import make_heuristic
+from search_stats import SearchStats
+from solvability import is_solvable
+
+INFINITY = float("inf")  # f-value of a node that cannot lead to a solution within the budget
+COMPACT_FACTOR = 4  # Heaps are rebuilt once they hold this many entries per node in memory
+
+
+class SearchNode:
+    """
+    This class is a node of the SMA* search tree. Besides its state and costs it keeps its
+    parent, the children that are still in memory and the backed-up f-values of the children
+    that were forgotten, so they can be generated again later.
+    """
+
+    __slots__ = ("id", "state", "blank", "g", "h", "f", "depth", "parent", "move", "children", "forgotten", "expanded")
+
+    def __init__(self, id, state, blank, g, h, f, parent=None, move=None):
+        self.id = id  # Creation number, the key of the node in the heaps
+        self.state = state  # Packed configuration
+        self.blank = blank  # Cell of the blank space
+        self.g = g  # Cost from the start
+        self.h = h  # Heuristic value
+        self.f = f  # Estimated solution cost, raised by backups
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.parent = parent
+        self.move = move  # Move of the blank space that reached this node
+        self.children = []  # Children in memory
+        self.forgotten = {}  # Move -> backed-up f-value of a forgotten child
+        self.expanded = False  # True once the children were generated
+
+    def open_f(self):
+        """
+        Returns the priority of the node in the open list: its own f-value before the first
+        expansion, then the lowest f-value of its forgotten children.
+
+        Returns:
+            float or None: The priority, or None if the node has nothing left to generate.
+        """
+        if not self.expanded:
+            return self.f
+        return min(self.forgotten.values()) if self.forgotten else None
+
+
+class SMAStar:
+    """
+    This class solves the puzzle with simplified memory-bounded A* (SMA*). It never keeps more
+    than a fixed number of nodes: when the budget is reached, the leaf with the highest f-value
+    (the shallowest one on ties) is forgotten and its f-value is backed up into its parent, which
+    regenerates it later only if everything else looks worse. Solutions are optimal whenever the
+    budget can hold the optimal path. Boards can be rectangular.
+    """
+
+    def __init__(self, rows, cols=None, heuristic="manhattan", budget=100000, stats=False):
+        """
+        Initializes the solver for a board shape.
+
+        Args:
+            rows (int): The number of rows of the board.
+            cols (int): The number of columns of the board (defaults to rows).
+            heuristic (str or Heuristic): The default heuristic (see heuristics.HEURISTICS).
+            budget (int): The largest number of nodes kept in memory (at least 2).
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats
+                (its peak_open is the peak number of nodes in memory).
+        """
+        self.rows = rows
+        self.cols = cols or rows
+        self.heuristic_kind = heuristic  # Name of the default heuristic
+        self.budget = budget
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.expanded = 0  # Number of nodes expanded by the last solve
+        self.forgotten = 0  # Number of nodes forgotten by the last solve
+        self.peak = 0  # Largest number of nodes in memory during the last solve
+
+    def process(
+        self,
+        start,
+        goal,
+        puzzle_display,
+        next_step_callback,
+        heuristic=None,
+        budget=None,
+    ):
+        """
+        Solves the puzzle within the node budget, like Puzzle.process.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the solution path once it is found.
+            heuristic (str or Heuristic): The heuristic for this solve (defaults to the one given to the constructor).
+            budget (int): The node budget for this solve (defaults to the one given to the constructor).
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this shape, the goal cannot
+                be reached, or no solution fits in the budget.
+        """
+        board = Board.for_states(start, goal)
+        if board.rows != self.rows or board.cols != self.cols:
+            raise ValueError(f"Expected a {self.rows}x{self.cols} puzzle.")
+        if not is_solvable(start, goal):
+            raise ValueError("Puzzle is unsolvable.")
+        budget = budget or self.budget
+        if budget < 2:
+            raise ValueError("The node budget must be at least 2.")
+        start_state, start_blank = board.encode(start)
+        goal_state, _ = board.encode(goal)
+
+        moves = self.search(
+            board, start_state, start_blank, goal_state, heuristic or self.heuristic_kind, budget
+        )
+        steps = path_from_moves(board, start_state, start_blank, moves)
+        next_step_callback(steps)
+        return steps
+
+    def search(self, board, start, blank, goal, heuristic, budget):
+        """
+        Runs SMA* on packed states.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            blank (int): The cell of the blank space in the start configuration.
+            goal (int): The packed goal configuration.
+            heuristic (str or Heuristic): The heuristic to use.
+            budget (int): The largest number of nodes kept in memory.
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+
+        Raises:
+            ValueError: If no solution fits in the budget.
+        """
+        estimator = make_heuristic(heuristic, board, board.unpack(goal))
+        max_depth = budget - 1  # Deepest node whose whole path still fits in memory
+        # Both heaps are lazy: entries hold node ids and are checked against the node when they
+        # come out, so a forgotten node is freed at once; stale entries are dropped by compact()
+        nodes = {}  # Id -> node, for the nodes in memory
+        open_heap = []  # (open f, -depth, id): lowest f first, deepest on ties
+        leaf_heap = []  # (-f, depth, id): highest f first, shallowest on ties
+        self.expanded = 0
+        self.forgotten = 0
+        self.stats = None
+        began = time.perf_counter()
+        generated = pushes = pops = 0
+
+        h = estimator.evaluate(board.unpack(start))
+        root = SearchNode(0, start, blank, 0, h, h)
+        nodes[0] = root
+        next_id = 1
+        heapq.heappush(open_heap, (root.f, 0, 0))
+        pushes = 1
+        self.peak = 1
+
+        while open_heap:
+            key, _, node_id = heapq.heappop(open_heap)
+            pops += 1
+            node = nodes.get(node_id)
+            if node is None or node.open_f() != key:
+                continue  # Forgotten node or outdated priority
+            if key == INFINITY:
+                break  # Every remaining path is deeper than the budget allows
+            if node.state == goal:
+                if self.collect_stats:
+                    self.stats = SearchStats(
+                        "sma",
+                        expanded=self.expanded,
+                        generated=generated,
+                        pushes=pushes,
+                        pops=pops,
+                        peak_open=self.peak,
+                        seconds=time.perf_counter() - began,
+                    )
+                return self.moves(node)
+            self.expanded += 1
+
+            # Generate the children that are not in memory: all of them the first time, the forgotten ones after that
+            if node.expanded:
+                targets = [(move, board.targets[node.blank][move]) for move in node.forgotten]
+            else:
+                undo = None if node.move is None else OPPOSITE[node.move]
+                targets = [(move, target) for move, target in board.neighbors[node.blank] if move != undo]
+            tiles = board.unpack(node.state) if estimator.uses_tiles else None
+            generated += len(targets)
+            pushes += len(targets)
+            for move, target in targets:
+                state = board.slide(node.state, node.blank, target)
+                child_h = node.h + estimator.delta(tiles, board.tile_at(state, node.blank), target, node.blank)
+                if state != goal and node.depth + 1 >= max_depth:
+                    f = INFINITY  # Its path would not fit in memory
+                else:
+                    f = max(node.f, node.g + 1 + child_h)  # f-values never decrease along a path
+                f = max(f, node.forgotten.get(move, 0))  # Keep what was learned before forgetting it
+                child = SearchNode(next_id, state, target, node.g + 1, child_h, f, node, move)
+                nodes[next_id] = child
+                next_id += 1
+                node.children.append(child)
+                heapq.heappush(open_heap, (f, -child.depth, child.id))
+                heapq.heappush(leaf_heap, (-f, child.depth, child.id))
+            node.expanded = True
+            node.forgotten = {}
+            self.backup(node)
+            if not node.children:
+                heapq.heappush(leaf_heap, (-node.f, node.depth, node.id))
+
+            # Forget the worst leaves until the tree fits in the budget again
+            while len(nodes) > budget:
+                leaf = self.worst_leaf(leaf_heap, nodes)
+                parent = leaf.parent
+                del nodes[leaf.id]
+                parent.children.remove(leaf)
+                parent.forgotten[leaf.move] = min(leaf.f, parent.forgotten.get(leaf.move, INFINITY))
+                heapq.heappush(open_heap, (parent.open_f(), -parent.depth, parent.id))
+                pushes += 1
+                if not parent.children:
+                    heapq.heappush(leaf_heap, (-parent.f, parent.depth, parent.id))
+                self.forgotten += 1
+            self.peak = max(self.peak, len(nodes))
+            if len(open_heap) + len(leaf_heap) > COMPACT_FACTOR * len(nodes):
+                open_heap, leaf_heap = self.compact(nodes)
+
+        raise ValueError(f"No solution found within a budget of {budget} nodes.")
+
+    @staticmethod
+    def backup(node):
+        """
+        Raises the f-values of a node and its ancestors to the lowest f-value of their children,
+        including the forgotten ones, after the node was expanded.
+
+        Args:
+            node (SearchNode): The expanded node.
+        """
+        while node is not None:
+            values = [child.f for child in node.children]
+            values.extend(node.forgotten.values())
+            f = min(values) if values else INFINITY
+            if f == node.f:
+                break  # Ancestors are unchanged as well
+            node.f = f
+            node = node.parent
+
+    @staticmethod
+    def compact(nodes):
+        """
+        Rebuilds both heaps with one entry per node in memory, dropping the stale entries.
+        Heaps are only rebuilt once they outgrow the nodes by COMPACT_FACTOR, so the work is
+        paid for by the pushes since the last rebuild and memory stays proportional to the budget.
+
+        Args:
+            nodes (dict): Id -> node, for the nodes in memory.
+
+        Returns:
+            tuple: (open heap, leaf heap).
+        """
+        open_heap = []
+        leaf_heap = []
+        for node in nodes.values():
+            key = node.open_f()
+            if key is not None:
+                open_heap.append((key, -node.depth, node.id))
+            if not node.children:
+                leaf_heap.append((-node.f, node.depth, node.id))
+        heapq.heapify(open_heap)
+        heapq.heapify(leaf_heap)
+        return open_heap, leaf_heap
+
+    @staticmethod
+    def worst_leaf(leaf_heap, nodes):
+        """
+        Pops the leaf with the highest f-value, the shallowest on ties. The root is never forgotten.
+
+        Args:
+            leaf_heap (list): The lazy heap of leaves.
+            nodes (dict): Id -> node, for the nodes in memory (the root has id 0).
+
+        Returns:
+            SearchNode: The leaf to forget.
+
+        Raises:
+            ValueError: If only the root is left, so the budget is too small.
+        """
+        while leaf_heap:
+            key, _, node_id = heapq.heappop(leaf_heap)
+            node = nodes.get(node_id)
+            if node is not None and not node.children and node_id != 0 and -key == node.f:
+                return node
+        raise ValueError("The node budget is too small for this puzzle.")
+
+    @staticmethod
+    def moves(node):
+        """
+        Walks the parents back from a node to the root.
+
+        Args:
+            node (SearchNode): The last node of the path.
+
+        Returns:
+            str: The moves of the blank space from the root to the node.
+        """
+        moves = []
+        while node.parent is not None:
+            moves.append(node.move)
+            node = node.parent
+        moves.reverse()
+        return "".join(moves)
+
+
+if __name__ == "__main__":
+    start_grid = [["1", "11", "2", "4"], ["10", "3", "5", "7"], ["6", "9", "8", "_"]]  # 3x4 board
+    goal_grid = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "_"]]
+    for node_budget in (100000, 2000, 200):
+        solver = SMAStar(3, 4, budget=node_budget)
+        path = solver.process(start_grid, goal_grid, None, lambda steps: None)
+        print(
+            f"budget {node_budget:>6}: {len(path) - 1} moves, {solver.expanded} expanded, "
+            f"{solver.forgotten} forgotten, peak {solver.peak} nodes"
+        )
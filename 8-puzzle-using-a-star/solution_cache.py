@@ -0,0 +1,269 @@
+import os
+import sqlite3
+from collections import OrderedDict
+
+from a_star_algorithm import path_from_moves
+from board import Board
+from symmetry import BoardSymmetry
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "solutions.sqlite")
+
+
+class SolutionCache:
+    """
+    This class caches solutions as strings of moves of the blank space, in two tiers: an
+    in-memory LRU dict of limited size in front of an SQLite file that survives restarts.
+    Entries found on disk are promoted to memory; entries evicted from memory stay on disk.
+
+    find() and store() also merge queries whose starts are mirror images for the goal (see
+    symmetry.BoardSymmetry): the moves are stored in the frame of the canonical start.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, capacity=1024, symmetry=True):
+        """
+        Opens (or creates) the cache.
+
+        Args:
+            path (str): The SQLite file of the persistent tier, or None for a memory-only cache.
+            capacity (int): The largest number of solutions kept in memory.
+            symmetry (bool): Whether find() and store() merge symmetric starts into one entry.
+        """
+        self.capacity = capacity
+        self.symmetry = symmetry
+        self.symmetries = {}  # (rows, cols, goal) -> BoardSymmetry of the goal
+        self.memory = OrderedDict()  # Key -> moves, least recently used first
+        self.hits = 0  # Queries answered from memory
+        self.disk_hits = 0  # Queries answered from the SQLite file
+        self.misses = 0  # Queries not in the cache
+        self.evictions = 0  # Entries dropped from memory to respect the capacity
+
+        self.connection = None
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(path, timeout=30)
+            self.connection.execute("PRAGMA journal_mode=WAL")  # Readers do not block the writer
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, moves TEXT NOT NULL)"
+            )
+            self.connection.commit()
+
+    @staticmethod
+    def key(board, start, goal):
+        """
+        Returns the canonical key of a (start, goal) query. Tile codes follow the natural order of
+        the labels, so puzzles that only differ by their labels share a key (and a solution).
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            goal (int): The packed goal configuration.
+
+        Returns:
+            str: The key, e.g. "3x3:8765...:1234...".
+        """
+        return f"{board.rows}x{board.cols}:{start:x}:{goal:x}"
+
+    def canonical(self, board, start, goal):
+        """
+        Returns the key of a query with its start replaced by the canonical start of its symmetry class.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            goal (int): The packed goal configuration.
+
+        Returns:
+            tuple: (key, symmetry, index) where symmetry is the BoardSymmetry of the goal (None if
+            symmetry is off) and index the transform from the start to the canonical start.
+        """
+        if not self.symmetry:
+            return self.key(board, start, goal), None, 0
+        symmetry = self.symmetries.get((board.rows, board.cols, goal))
+        if symmetry is None:
+            symmetry = BoardSymmetry(board, board.unpack(goal))
+            self.symmetries[(board.rows, board.cols, goal)] = symmetry
+        canonical, index = symmetry.canonical(start)
+        return self.key(board, canonical, goal), symmetry, index
+
+    def find(self, board, start, goal):
+        """
+        Looks up the solution of a query, or of a symmetric one.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            goal (int): The packed goal configuration.
+
+        Returns:
+            str or None: The moves of the blank space from start to goal, or None if not cached.
+        """
+        key, symmetry, index = self.canonical(board, start, goal)
+        moves = self.get(key)
+        if moves is None or symmetry is None:
+            return moves
+        return "".join(symmetry.move_from_canonical(index, move) for move in moves)
+
+    def store(self, board, start, goal, moves):
+        """
+        Stores the solution of a query, for it and every symmetric one.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            start (int): The packed start configuration.
+            goal (int): The packed goal configuration.
+            moves (str): The moves of the blank space from start to goal.
+        """
+        key, symmetry, index = self.canonical(board, start, goal)
+        if symmetry is not None:
+            moves = "".join(symmetry.move_to_canonical(index, move) for move in moves)
+        self.put(key, moves)
+
+    def get(self, key):
+        """
+        Looks a query up, first in memory and then on disk.
+
+        Args:
+            key (str): The key of the query (see key).
+
+        Returns:
+            str or None: The moves of the blank space, or None if the query is not cached.
+        """
+        moves = self.memory.get(key)
+        if moves is not None:
+            self.memory.move_to_end(key)  # Most recently used
+            self.hits += 1
+            return moves
+
+        if self.connection is not None:
+            row = self.connection.execute("SELECT moves FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self.remember(key, row[0])
+                return row[0]
+
+        self.misses += 1
+        return None
+
+    def put(self, key, moves):
+        """
+        Stores a solution in both tiers.
+
+        Args:
+            key (str): The key of the query (see key).
+            moves (str): The moves of the blank space from start to goal.
+        """
+        self.remember(key, moves)
+        if self.connection is not None:
+            with self.connection:  # Commits the insert
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO solutions (key, moves) VALUES (?, ?)", (key, moves)
+                )
+
+    def remember(self, key, moves):
+        """
+        Stores a solution in memory, evicting the least recently used ones beyond the capacity.
+
+        Args:
+            key (str): The key of the query.
+            moves (str): The moves of the blank space.
+        """
+        self.memory[key] = moves
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: "hits", "disk_hits", "misses", "evictions" and "size" (entries in memory).
+        """
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.memory),
+        }
+
+    def close(self):
+        """
+        Closes the SQLite file.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class CachedSolver:
+    """
+    This class puts a SolutionCache in front of any solver with a process() method (Puzzle,
+    IDAStar, ...). Cached queries are answered by replaying the stored moves, without a search.
+    """
+
+    def __init__(self, solver, cache):
+        """
+        Initializes the wrapper.
+
+        Args:
+            solver (object): The solver used on cache misses.
+            cache (SolutionCache): The cache.
+        """
+        self.solver = solver
+        self.cache = cache
+        self.expanded = 0  # Number of nodes expanded by the last solve (0 on a cache hit)
+        self.stats = None  # SearchStats of the last solve, if the solver collects them (None on a cache hit)
+
+    def process(self, start, goal, puzzle_display, next_step_callback):
+        """
+        Returns the cached solution if there is one, otherwise solves the puzzle and caches it.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the solution path.
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the solver rejects the puzzle.
+        """
+        board = Board.for_states(start, goal)
+        start_state, start_blank = board.encode(start)
+        goal_state, _ = board.encode(goal)
+
+        moves = self.cache.find(board, start_state, goal_state)
+        if moves is None:
+            steps = self.solver.process(start, goal, puzzle_display, lambda steps: None)
+            self.expanded = getattr(self.solver, "expanded", 0)
+            self.stats = getattr(self.solver, "stats", None)
+            self.cache.store(board, start_state, goal_state, "".join(step.move for step in steps[1:]))
+        else:
+            steps = path_from_moves(board, start_state, start_blank, moves)
+            self.expanded = 0
+            self.stats = None
+
+        next_step_callback(steps)
+        return steps
+
+
+if __name__ == "__main__":
+    import time
+
+    from a_star_algorithm import Puzzle
+
+    start_grid = [["8", "6", "7"], ["2", "5", "4"], ["3", "_", "1"]]
+    goal_grid = [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]]
+    solver = CachedSolver(Puzzle(3, heuristic="manhattan"), SolutionCache())
+    for attempt in range(3):
+        began = time.perf_counter()
+        path = solver.process(start_grid, goal_grid, None, lambda steps: None)
+        print(f"{len(path) - 1} moves in {(time.perf_counter() - began) * 1000:.2f} ms, {solver.expanded} expanded")
+    print(solver.cache.stats())
+    solver.cache.close()
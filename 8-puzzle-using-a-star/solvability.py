@@ -0,0 +1,129 @@
+from board import BLANK, label_order
+
+
+def count_inversions(sequence):
+    """
+    Counts the pairs i < j with sequence[i] > sequence[j] in O(n log n) with a Fenwick
+    (binary indexed) tree, scanning from the right and counting the smaller values seen so far.
+
+    Args:
+        sequence (sequence of int): Distinct integers from 0 to len(sequence) - 1.
+
+    Returns:
+        int: The number of inversions.
+    """
+    size = len(sequence)
+    tree = [0] * (size + 1)  # tree[i] counts the values seen in a range ending at i - 1
+    inversions = 0
+    for value in reversed(sequence):
+        # Number of values smaller than this one that are already in the tree
+        i = value
+        while i > 0:
+            inversions += tree[i]
+            i -= i & -i
+        # Add this value
+        i = value + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+def default_goal(start):
+    """
+    Returns the usual goal for a configuration: tiles in natural order with the blank space in the last cell.
+
+    Args:
+        start (list of list): A puzzle configuration.
+
+    Returns:
+        list of list: The goal configuration, with the same shape as start.
+    """
+    cols = len(start[0])
+    labels = sorted((label for row in start for label in row if label != BLANK), key=label_order)
+    labels.append(BLANK)
+    return [labels[i : i + cols] for i in range(0, len(labels), cols)]
+
+
+def is_solvable(start, goal=None):
+    """
+    Checks if the goal can be reached from the start on a board of any shape.
+
+    The tiles of the start are renamed by their position in the goal, so the goal has no
+    inversions and any goal can be used. A move of the blank space along a row never changes
+    the number of inversions; a move along a column jumps over cols - 1 tiles, which keeps its
+    parity on odd-width boards and flips it on even-width boards. The puzzle is therefore
+    solvable if the inversions are even (odd width), or if the inversions plus the number of
+    rows between the blank spaces of start and goal are even (even width). On a board with a
+    single row or column, tiles can never pass each other, so their order must already match.
+
+    Args:
+        start (list of list): The initial puzzle configuration.
+        goal (list of list): The goal puzzle configuration (defaults to default_goal(start)).
+
+    Returns:
+        bool: True if solvable, False otherwise.
+
+    Raises:
+        ValueError: If start and goal do not hold the same tiles.
+    """
+    if goal is None:
+        goal = default_goal(start)
+    rows, cols = len(goal), len(goal[0])
+
+    goal_index = {}  # Label -> rank among the tiles of the goal in reading order
+    goal_blank_row = None
+    for r, row in enumerate(goal):
+        for label in row:
+            if label == BLANK:
+                goal_blank_row = r
+            else:
+                goal_index[label] = len(goal_index)
+
+    sequence = []
+    start_blank_row = None
+    try:
+        for r, row in enumerate(start):
+            for label in row:
+                if label == BLANK:
+                    start_blank_row = r
+                else:
+                    sequence.append(goal_index[label])
+    except KeyError as e:
+        raise ValueError(f"Tile {e} of the start state is not in the goal state.") from None
+    if (
+        start_blank_row is None
+        or goal_blank_row is None
+        or len(sequence) != len(goal_index)
+        or len(set(sequence)) != len(sequence)
+    ):
+        raise ValueError("Start and goal states must contain the same tiles.")
+
+    if rows == 1 or cols == 1:
+        return sequence == sorted(sequence)
+
+    parity = count_inversions(sequence)
+    if cols % 2 == 0:
+        parity += abs(start_blank_row - goal_blank_row)
+    return parity % 2 == 0
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    # On a 4x4 board a vertical move changes the inversion parity, which the blank row makes up for
+    rows_4x4 = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "12"], ["13", "14", "15", "_"]]
+    moved_blank = [row[:] for row in rows_4x4]
+    moved_blank[2][3], moved_blank[3][3] = "_", "12"  # One legal move: still solvable
+    print(is_solvable(moved_blank, rows_4x4))
+    moved_blank[3][3], moved_blank[3][2] = "15", "12"  # Now 15 and 12 are swapped
+    print(is_solvable(moved_blank, rows_4x4))
+
+    size = 100
+    labels = [str(i) for i in range(1, size * size)] + [BLANK]
+    random.shuffle(labels)
+    big = [labels[i : i + size] for i in range(0, len(labels), size)]
+    began = time.perf_counter()
+    result = is_solvable(big)
+    print(f"{size}x{size}: {result} in {(time.perf_counter() - began) * 1000:.1f} ms")
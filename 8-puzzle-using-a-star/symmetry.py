@@ -0,0 +1,126 @@
+from board import MOVES
+
+# Geometric transforms of a rows x cols board: (row, col, rows, cols) -> (row, col)
+TRANSFORMS = {
+    "identity": lambda r, c, rows, cols: (r, c),
+    "flip_horizontal": lambda r, c, rows, cols: (r, cols - 1 - c),
+    "flip_vertical": lambda r, c, rows, cols: (rows - 1 - r, c),
+    "rotate_180": lambda r, c, rows, cols: (rows - 1 - r, cols - 1 - c),
+}
+# Transforms that swap rows and columns, only defined on square boards
+SQUARE_TRANSFORMS = {
+    "transpose": lambda r, c, rows, cols: (c, r),
+    "anti_transpose": lambda r, c, rows, cols: (cols - 1 - c, rows - 1 - r),
+    "rotate_90": lambda r, c, rows, cols: (c, rows - 1 - r),
+    "rotate_270": lambda r, c, rows, cols: (cols - 1 - c, r),
+}
+
+
+class BoardSymmetry:
+    """
+    This class maps puzzle states to a canonical representative of their symmetry class.
+
+    Mirroring or rotating the whole board (tiles and blank space together) and then renaming
+    the tiles does not change the number of moves between two states. A transform that keeps
+    the blank cell of the goal in place can be followed by the renaming that turns the mirrored
+    goal back into the goal itself, so it maps every state to a state at the same distance from
+    the goal. The canonical key of a state is the smallest packed state among its images under
+    these transforms: up to 8 states share one key on a square board (the blank space in the
+    center of a 3x3 goal), 2 for the usual goal with the blank space in a corner.
+
+    Moves change direction under a transform, so moves are stored in the frame of the canonical
+    state and mapped back with the transform of the state at hand.
+    """
+
+    def __init__(self, board, goal):
+        """
+        Finds the transforms that keep the goal and precomputes their cell and move maps.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            goal (sequence of int): The tile code of every cell in the goal configuration.
+        """
+        self.board = board
+        transforms = dict(TRANSFORMS)
+        if board.rows == board.cols:
+            transforms.update(SQUARE_TRANSFORMS)
+
+        blank = list(goal).index(0)
+        self.names = []  # Name of every transform that keeps the goal
+        self.shifts = []  # shifts[t][cell] is the bit offset of the image of the cell
+        self.renames = []  # renames[t][tile] is the tile code after renaming
+        self.to_canonical = []  # to_canonical[t][move] is the move in the transformed frame
+        self.from_canonical = []  # from_canonical[t][move] is the inverse map
+        for name, transform in transforms.items():
+            cells = []
+            for cell in range(board.cells):
+                r, c = transform(*divmod(cell, board.cols), board.rows, board.cols)
+                cells.append(r * board.cols + c)
+            if cells[blank] != blank:
+                continue  # The mirrored goal would have its blank space elsewhere
+
+            rename = [0] * board.cells
+            for cell, tile in enumerate(goal):
+                rename[tile] = goal[cells[cell]]  # The tile landing on cells[cell] becomes the goal tile there
+            moves = {}
+            for move in MOVES:
+                # Any cell where the move is legal shows where the transform sends its direction
+                cell = next(cell for cell in range(board.cells) if move in board.targets[cell])
+                target = cells[board.targets[cell][move]]
+                moves[move] = next(m for m, t in board.neighbors[cells[cell]] if t == target)
+
+            self.names.append(name)
+            self.shifts.append(tuple(board.shifts[cells[cell]] for cell in range(board.cells)))
+            self.renames.append(tuple(rename))
+            self.to_canonical.append(moves)
+            self.from_canonical.append({image: move for move, image in moves.items()})
+
+    def __len__(self):
+        return len(self.names)
+
+    def canonical(self, state):
+        """
+        Returns the canonical key of a state and the transform that produces it.
+
+        Args:
+            state (int): The packed state.
+
+        Returns:
+            tuple: (key, transform index) where key is the smallest packed image of the state.
+        """
+        tiles = self.board.unpack(state)
+        best, best_index = state, 0  # The identity transform always keeps the goal
+        for index in range(1, len(self.names)):
+            rename = self.renames[index]
+            image = 0
+            for tile, shift in zip(tiles, self.shifts[index]):
+                image |= rename[tile] << shift
+            if image < best:
+                best, best_index = image, index
+        return best, best_index
+
+    def move_to_canonical(self, index, move):
+        """
+        Maps a move made in a state to the frame of its canonical state.
+
+        Args:
+            index (int): The transform index returned by canonical().
+            move (str): The move of the blank space.
+
+        Returns:
+            str: The same move seen in the canonical frame.
+        """
+        return self.to_canonical[index][move]
+
+    def move_from_canonical(self, index, move):
+        """
+        Maps a move made in a canonical state back to the frame of a state of its class.
+
+        Args:
+            index (int): The transform index returned by canonical() for that state.
+            move (str): The move in the canonical frame.
+
+        Returns:
+            str: The move to make in the state.
+        """
+        return self.from_canonical[index][move]
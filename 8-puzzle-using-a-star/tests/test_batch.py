@@ -0,0 +1,34 @@
+import io
+import json
+
+import batch
+
+
+def test_malformed_lines_do_not_stop_the_run():
+    lines = [
+        '{"id": 1, "start": 123}\n',
+        '{"id": 2, "start": "1234_5786"}\n',
+        '{"id": 3, "start": "12345"}\n',
+        "not a puzzle\n",
+        '{"id": 5, "start": "12345678_"}\n',
+    ]
+    output = io.StringIO()
+    written = batch.run(lines, output, solver="astar", workers=2, chunk_size=1)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert written == 5
+    assert [result["line"] for result in results] == [1, 2, 3, 4, 5]
+    assert "error" in results[0] and "error" in results[2] and "error" in results[3]
+    assert results[1]["length"] == 2
+    assert results[4]["length"] == 0
+
+
+def test_results_keep_input_order():
+    walks = ["12345678_", "1234567_8", "123456_78", "123_56478", "_23156478", "2_3156478", "23_156478"]
+    lines = [json.dumps({"id": i, "start": start}) + "\n" for i, start in enumerate(walks * 3)]
+    output = io.StringIO()
+    batch.run(lines, output, solver="ida", workers=3, chunk_size=2)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert [result["id"] for result in results] == list(range(len(lines)))
+    assert all("error" not in result for result in results)
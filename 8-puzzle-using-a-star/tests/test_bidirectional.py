@@ -0,0 +1,32 @@
+import random
+
+from bidirectional import BidirectionalSearch
+from board import Board
+from distance_table import DistanceTableSolver
+
+GOALS = (
+    [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]],
+    [["1", "2", "3"], ["8", "_", "4"], ["7", "6", "5"]],
+)
+
+
+def test_lengths_match_distance_table():
+    oracle = DistanceTableSolver(3)
+    board = Board(3)
+    rng = random.Random(8)
+    for goal in GOALS:
+        goal_state, goal_blank = board.encode(goal)
+        starts = [goal, board.decode(board.slide(goal_state, goal_blank, board.neighbors[goal_blank][0][1]))]
+        for _ in range(6):
+            state, blank = goal_state, goal_blank
+            for _ in range(rng.randrange(20, 80)):
+                _, target = rng.choice(board.neighbors[blank])
+                state, blank = board.slide(state, blank, target), target
+            starts.append(board.decode(state))
+
+        for start in starts:
+            expected = oracle.distance(start, goal)
+            for mode, heuristic in (("bfs", None), ("astar", "manhattan"), ("astar", "linear_conflict")):
+                path = BidirectionalSearch(3).process(start, goal, None, lambda steps: None, mode, heuristic)
+                assert len(path) - 1 == expected, (start, goal, mode, heuristic)
+                assert path[-1].state == goal_state
@@ -0,0 +1,35 @@
+import random
+
+from a_star_algorithm import Puzzle
+from board import BLANK
+from node_arena import ArenaPuzzle
+
+GOAL = [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]]
+START_4X4 = [["5", "1", "2", "4"], ["9", "6", "3", "8"], ["13", "10", "7", "12"], ["_", "14", "11", "15"]]
+GOAL_4X4 = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "12"], ["13", "14", "15", "_"]]
+
+
+def scramble(goal, moves, rng):
+    grid = [row[:] for row in goal]
+    size = len(grid)
+    row, col = next((r, c) for r in range(size) for c in range(size) if grid[r][c] == BLANK)
+    for _ in range(moves):
+        r, c = rng.choice(
+            [(r, c) for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)) if 0 <= r < size and 0 <= c < size]
+        )
+        grid[row][col], grid[r][c] = grid[r][c], BLANK
+        row, col = r, c
+    return grid
+
+
+def test_same_path_lengths_as_puzzle():
+    rng = random.Random(7)
+    cases = [(scramble(GOAL, 60, rng), GOAL) for _ in range(8)] + [(START_4X4, GOAL_4X4)]
+    for start, goal in cases:
+        size = len(start)
+        expected = Puzzle(size).process(start, goal, None, lambda steps: None)
+        solver = ArenaPuzzle(size)
+        path = solver.process(start, goal, None, lambda steps: None)
+        assert len(path) - 1 == len(expected) - 1
+        assert path[-1].state == expected[-1].state
+        assert len(solver.arena) >= solver.expanded
@@ -0,0 +1,17 @@
+from search_stats import SearchStats, StatsAggregator
+
+
+def test_aggregator_sums_per_label_set():
+    aggregator = StatsAggregator()
+    for expanded in range(1000):
+        aggregator.add(SearchStats("astar", expanded=expanded, peak_open=expanded % 7, seconds=0.005))
+    aggregator.add(SearchStats("ida", expanded=50, seconds=2.0))
+
+    assert len(aggregator.groups) == 2
+    text = aggregator.to_prometheus()
+    assert 'puzzle_search_solves_total{solver="astar"} 1000' in text
+    assert f'puzzle_search_expanded_total{{solver="astar"}} {sum(range(1000))}' in text
+    assert 'puzzle_search_peak_open{solver="astar"} 6' in text
+    assert 'puzzle_search_solve_expanded_bucket{solver="astar",le="100"} 101' in text
+    assert 'puzzle_search_solve_seconds_bucket{solver="ida",le="1.0"} 0' in text
+    assert 'puzzle_search_solve_seconds_bucket{solver="ida",le="+Inf"} 1' in text
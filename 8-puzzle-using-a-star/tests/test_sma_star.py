@@ -0,0 +1,33 @@
+import heapq
+import tracemalloc
+
+import sma_star
+from sma_star import COMPACT_FACTOR, SMAStar
+
+START = [["2", "5", "10", "6"], ["3", "7", "8", "4"], ["1", "_", "9", "11"]]  # 30 moves from GOAL
+GOAL = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "_"]]
+
+
+def test_memory_stays_within_budget(monkeypatch):
+    budget = 500
+    peak_heap = [0]
+    push = heapq.heappush
+
+    def counting_push(heap, entry):
+        push(heap, entry)
+        peak_heap[0] = max(peak_heap[0], len(heap))
+
+    monkeypatch.setattr(sma_star.heapq, "heappush", counting_push)
+    solver = SMAStar(3, 4, budget=budget)
+    tracemalloc.start()
+    try:
+        path = solver.process(START, GOAL, None, lambda steps: None)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert len(path) - 1 == 30
+    assert solver.peak <= budget
+    assert solver.expanded > 10 * budget  # Enough re-expansions for stale entries to pile up
+    assert peak_heap[0] <= COMPACT_FACTOR * budget + 8
+    assert peak_memory < 2 * 2**20
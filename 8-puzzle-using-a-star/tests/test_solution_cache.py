@@ -0,0 +1,50 @@
+from a_star_algorithm import Puzzle
+from solution_cache import CachedSolver, SolutionCache
+
+START = [["8", "6", "7"], ["2", "5", "4"], ["3", "_", "1"]]
+MIRRORED_START = [["6", "4", "7"], ["8", "5", "_"], ["3", "2", "1"]]  # START transposed, tiles renamed to keep GOAL
+GOAL = [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]]
+
+
+def solve(solver, start):
+    return solver.process(start, GOAL, None, lambda steps: None)
+
+
+def test_hit_and_miss(tmp_path):
+    path = str(tmp_path / "solutions.sqlite")
+    cache = SolutionCache(path)
+    solver = CachedSolver(Puzzle(3), cache)
+
+    first = solve(solver, START)
+    assert cache.stats()["misses"] == 1 and solver.expanded > 0
+
+    second = solve(solver, START)
+    assert cache.stats()["hits"] == 1 and solver.expanded == 0 and solver.stats is None
+    assert [step.move for step in second] == [step.move for step in first]
+
+    # A mirror image of the start is the same entry, with its moves mapped to its own frame
+    mirrored = solve(solver, MIRRORED_START)
+    assert cache.stats()["hits"] == 2 and solver.expanded == 0
+    assert len(mirrored) == len(first)
+    assert mirrored[-1].state == first[-1].state
+    cache.close()
+
+    # A new cache on the same file starts with an empty memory tier and finds it on disk
+    reopened = SolutionCache(path)
+    third = solve(CachedSolver(Puzzle(3), reopened), START)
+    assert reopened.stats()["disk_hits"] == 1 and reopened.stats()["misses"] == 0
+    assert len(third) == len(first)
+    reopened.close()
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SolutionCache(None, capacity=2)
+    cache.put("a", "L")
+    cache.put("b", "R")
+    assert cache.get("a") == "L"  # Now b is the least recently used entry
+    cache.put("c", "U")
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == "L" and cache.get("c") == "U"
+    assert cache.stats() == {"hits": 3, "disk_hits": 0, "misses": 1, "evictions": 1, "size": 2}
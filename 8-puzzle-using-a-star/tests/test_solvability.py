@@ -0,0 +1,38 @@
+import random
+
+from distance_table import DistanceTableSolver
+from solvability import is_solvable
+
+SPIRAL_GOAL = [["1", "2", "3"], ["8", "_", "4"], ["7", "6", "5"]]  # Blank space in the center
+BLANK_FIRST_GOAL = [["_", "1", "2", "3"], ["4", "5", "6", "7"], ["8", "9", "10", "11"], ["12", "13", "14", "15"]]
+
+
+def swap_tiles(grid, a, b):
+    return [[b if label == a else a if label == b else label for label in row] for row in grid]
+
+
+def test_odd_width_with_non_default_goal():
+    start = [["1", "_", "3"], ["8", "2", "4"], ["7", "6", "5"]]  # One move from the goal
+    assert is_solvable(start, SPIRAL_GOAL)
+    assert not is_solvable(swap_tiles(start, "1", "3"), SPIRAL_GOAL)
+    assert not is_solvable(SPIRAL_GOAL)  # Against the default goal, 1 2 3 4 5 6 7 8 _
+
+    # Every permutation agrees with the distance table, which knows which states are reachable
+    oracle = DistanceTableSolver(3)
+    labels = [label for row in SPIRAL_GOAL for label in row]
+    rng = random.Random(12)
+    for _ in range(50):
+        rng.shuffle(labels)
+        start = [labels[i : i + 3] for i in range(0, 9, 3)]
+        assert is_solvable(start, SPIRAL_GOAL) == (oracle.distance(start, SPIRAL_GOAL) is not None)
+
+
+def test_even_width_counts_blank_rows():
+    # Moving the blank space down a row jumps it over 3 tiles: odd inversions, one row apart
+    start = [["4", "1", "2", "3"], ["_", "5", "6", "7"], ["8", "9", "10", "11"], ["12", "13", "14", "15"]]
+    assert is_solvable(start, BLANK_FIRST_GOAL)
+    assert not is_solvable(swap_tiles(start, "1", "2"), BLANK_FIRST_GOAL)
+
+    # The same tile order with the blank space back in the goal row is unsolvable
+    start = [["_", "4", "1", "2"], ["3", "5", "6", "7"], ["8", "9", "10", "11"], ["12", "13", "14", "15"]]
+    assert not is_solvable(start, BLANK_FIRST_GOAL)
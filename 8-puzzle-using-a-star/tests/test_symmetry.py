@@ -0,0 +1,69 @@
+import random
+
+from a_star_algorithm import Puzzle
+from board import Board
+from distance_table import DistanceTableSolver
+from symmetry import BoardSymmetry
+
+CENTER_GOAL = [["1", "2", "3"], ["4", "_", "5"], ["6", "7", "8"]]  # Kept by all 8 transforms
+GOAL = [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]]  # Kept by identity and transpose
+
+
+def image(symmetry, state, index):
+    tiles = symmetry.board.unpack(state)
+    rename = symmetry.renames[index]
+    return sum(rename[tile] << shift for tile, shift in zip(tiles, symmetry.shifts[index]))
+
+
+def random_state(board, goal, rng, moves=40):
+    state, blank = board.encode(goal)
+    for _ in range(moves):
+        _, target = rng.choice(board.neighbors[blank])
+        state, blank = board.slide(state, blank, target), target
+    return state, blank
+
+
+def test_canonical_round_trip():
+    board = Board(3)
+    goal_state, _ = board.encode(CENTER_GOAL)
+    symmetry = BoardSymmetry(board, board.unpack(goal_state))
+    assert len(symmetry) == 8
+    assert symmetry.canonical(goal_state) == (goal_state, 0)
+
+    rng = random.Random(18)
+    for _ in range(30):
+        state, blank = random_state(board, CENTER_GOAL, rng)
+        key, index = symmetry.canonical(state)
+        assert image(symmetry, state, index) == key
+        assert symmetry.canonical(key)[0] == key
+        for other in range(len(symmetry)):  # Every image of the state has the same key
+            assert symmetry.canonical(image(symmetry, state, other))[0] == key
+
+        for move, target in board.neighbors[blank]:
+            mapped = symmetry.move_to_canonical(index, move)
+            assert symmetry.move_from_canonical(index, mapped) == move
+            # The mapped move made in the canonical state leads to the image of the child
+            key_blank = board.find_blank(key)
+            child = board.slide(state, blank, target)
+            key_child = board.slide(key, key_blank, board.targets[key_blank][mapped])
+            assert symmetry.canonical(child)[0] == symmetry.canonical(key_child)[0]
+
+
+def test_symmetric_search_reaches_the_goal():
+    oracle = DistanceTableSolver(3)
+    board = Board(3)
+    rng = random.Random(81)
+    for goal in (GOAL, CENTER_GOAL):
+        goal_state, _ = board.encode(goal)
+        for _ in range(5):
+            state, _ = random_state(board, goal, rng, moves=60)
+            start = board.decode(state)
+            path = Puzzle(3, symmetry=True).process(start, goal, None, lambda steps: None)
+
+            # Replay the remapped moves from the start, one legal move at a time
+            state, blank = board.encode(start)
+            for step in path[1:]:
+                target = board.targets[blank][step.move]
+                state, blank = board.slide(state, blank, target), target
+            assert state == goal_state
+            assert len(path) - 1 == oracle.distance(start, goal)
@@ -0,0 +1,89 @@
+from board import MOVES
+
+NO_MOVE = len(MOVES)  # Move code of a state that was not reached by a move (the start state)
+
+
+class TranspositionTable:
+    """
+    This class is a hashed table of every puzzle state the search has generated.
+    For each state it remembers the lowest cost (g-value) found so far, which lets the
+    search drop duplicates that are not cheaper and reopen states reached by a cheaper path.
+
+    It also remembers the move that reached each state on its cheapest path. Moves can be
+    undone, so this is enough to walk back from the goal to the start and rebuild the
+    solution without keeping any expanded node alive. Both values are packed into one int.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty table.
+        """
+        self.best = {}  # Maps a state key to (lowest g-value << 3) | move code
+        self.duplicates = 0  # Number of generated states dropped as duplicates
+        self.reopened = 0  # Number of states reached again by a cheaper path
+
+    def lookup(self, key):
+        """
+        Returns the lowest g-value recorded for a state.
+
+        Args:
+            key (hashable): The state key (see Node.key).
+
+        Returns:
+            int or None: The best g-value, or None if the state has not been seen.
+        """
+        entry = self.best.get(key)
+        return None if entry is None else entry >> 3
+
+    def move(self, key):
+        """
+        Returns the move of the blank space that reached a state on its cheapest known path.
+
+        Args:
+            key (hashable): The state key (see Node.key).
+
+        Returns:
+            str or None: "L", "R", "U" or "D", or None for the start state.
+        """
+        code = self.best[key] & 7
+        return None if code == NO_MOVE else MOVES[code]
+
+    def improve(self, key, g, move=None):
+        """
+        Records a new path to a state if it is cheaper than every path seen before.
+
+        Args:
+            key (hashable): The state key (see Node.key).
+            g (int): The cost of the new path.
+            move (str): The move of the blank space that reached the state (None for the start state).
+
+        Returns:
+            bool: True if the path was recorded (new or cheaper state), False if it is a duplicate.
+        """
+        known = self.best.get(key)
+        if known is not None:
+            if known >> 3 <= g:
+                self.duplicates += 1  # Not cheaper: the search can drop it
+                return False
+            self.reopened += 1  # Cheaper path to a known state
+        self.best[key] = (g << 3) | (NO_MOVE if move is None else MOVES.index(move))
+        return True
+
+    def is_stale(self, key, g):
+        """
+        Checks whether a node popped from the open list was superseded by a cheaper path.
+
+        Args:
+            key (hashable): The state key (see Node.key).
+            g (int): The cost of the popped node.
+
+        Returns:
+            bool: True if a cheaper path to the state is known.
+        """
+        return self.best[key] >> 3 < g
+
+    def __contains__(self, key):
+        return key in self.best
+
+    def __len__(self):
+        return len(self.best)
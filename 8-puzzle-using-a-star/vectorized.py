@@ -0,0 +1,296 @@
+import time
+
+try:
+    import numpy as np
+except ImportError as e:  # NumPy is only needed by this module
+    raise ImportError("Batched expansion needs NumPy (pip install numpy).") from e
+
+from a_star_algorithm import path_from_moves
+from board import MOVES, Board
+from search_stats import SearchStats
+from solvability import is_solvable
+
+
+class BatchExpander:
+    """
+    This class expands whole blocks of puzzle states at once with NumPy. A block is a 2D
+    uint8 array with one state per row and one tile code per column; all legal moves of the
+    blank space are generated with fancy indexing from a precomputed move table, and the
+    heuristic of every row is computed in one vectorized call. This removes the per-node
+    interpreter overhead of Node.generate_child in level-synchronous searches.
+    """
+
+    def __init__(self, board, goal):
+        """
+        Initializes the move and heuristic tables.
+
+        Args:
+            board (Board): The layout of the puzzle (at most 16 cells, so a state fits in 64 bits).
+            goal (sequence of int): The tile code of every cell in the goal configuration.
+
+        Raises:
+            ValueError: If the board has more than 16 cells.
+        """
+        if board.cells > 16:
+            raise ValueError("Batched expansion supports boards of up to 16 cells.")
+        self.board = board
+        self.goal = np.array(goal, dtype=np.uint8)
+
+        # targets[blank, move] is the cell the blank space moves to, or -1 if the move is illegal
+        self.targets = np.full((board.cells, len(MOVES)), -1, dtype=np.int64)
+        for blank, moves in enumerate(board.neighbors):
+            for move, target in moves:
+                self.targets[blank, MOVES.index(move)] = target
+
+        # distance[tile, cell] is the Manhattan distance of the tile from cell to its goal cell
+        goal_index = np.argsort(self.goal)
+        cells = np.arange(board.cells)
+        rows, cols = np.divmod(cells, board.cols)
+        goal_rows, goal_cols = np.divmod(goal_index, board.cols)
+        self.distance = (
+            np.abs(rows[None, :] - goal_rows[:, None]) + np.abs(cols[None, :] - goal_cols[:, None])
+        ).astype(np.uint8)
+        self.distance[0, :] = 0  # The blank space does not count
+        self.columns = cells
+        self.shifts = (cells * board.bits).astype(np.uint64)
+
+    def expand(self, states, blanks):
+        """
+        Generates the children of every state of a block.
+
+        Args:
+            states (numpy.ndarray): uint8 array of shape (n, cells).
+            blanks (numpy.ndarray): The cell of the blank space of every state, shape (n,).
+
+        Returns:
+            tuple: (children, child_blanks, parents, moves) where parents is the row of the parent
+            of every child in states and moves is the index of the move in board.MOVES.
+        """
+        children, child_blanks, parents, moves = [], [], [], []
+        for move in range(len(MOVES)):
+            target = self.targets[blanks, move]
+            rows = np.nonzero(target >= 0)[0]
+            if not len(rows):
+                continue
+            target = target[rows]
+            blank = blanks[rows]
+            block = states[rows]  # Fancy indexing copies the parent rows
+            index = np.arange(len(rows))
+            block[index, blank] = block[index, target]  # The tile slides into the blank cell
+            block[index, target] = 0
+            children.append(block)
+            child_blanks.append(target)
+            parents.append(rows)
+            moves.append(np.full(len(rows), move, dtype=np.uint8))
+
+        if not children:
+            empty = np.empty(0, dtype=np.int64)
+            return states[:0], empty, empty, empty.astype(np.uint8)
+        return (
+            np.concatenate(children),
+            np.concatenate(child_blanks),
+            np.concatenate(parents),
+            np.concatenate(moves),
+        )
+
+    def heuristic(self, states, kind="manhattan"):
+        """
+        Computes the heuristic of every state of a block.
+
+        Args:
+            states (numpy.ndarray): uint8 array of shape (n, cells).
+            kind (str): "manhattan" or "misplaced".
+
+        Returns:
+            numpy.ndarray: The heuristic value of every row.
+
+        Raises:
+            ValueError: If the kind is unknown.
+        """
+        if kind == "manhattan":
+            return self.distance[states, self.columns].sum(axis=1, dtype=np.int64)
+        if kind == "misplaced":
+            return ((states != self.goal) & (states != 0)).sum(axis=1)
+        raise ValueError(f"Unknown batched heuristic '{kind}', expected 'manhattan' or 'misplaced'")
+
+    def keys(self, states):
+        """
+        Packs every state of a block into a 64-bit key (the same value as Board.pack).
+
+        Args:
+            states (numpy.ndarray): uint8 array of shape (n, cells).
+
+        Returns:
+            numpy.ndarray: uint64 array of shape (n,).
+        """
+        return np.bitwise_or.reduce(states.astype(np.uint64) << self.shifts, axis=1)
+
+
+class BatchSearch:
+    """
+    This class runs level-synchronous searches on top of BatchExpander, with the same
+    process() interface as Puzzle:
+        "bfs": breadth-first search, one whole layer per step; duplicates are removed with
+            np.unique and by comparing with the two previous layers (enough on an undirected graph).
+        "beam": keeps only the beam_width children with the lowest heuristic in every layer;
+            much faster on deep puzzles, but the solution may be longer than optimal.
+    """
+
+    def __init__(self, size, mode="bfs", heuristic="manhattan", beam_width=1024, stats=False):
+        """
+        Initializes the solver for a puzzle size.
+
+        Args:
+            size (int): The size of the puzzle grid (3 or 4).
+            mode (str): The default mode ("bfs" or "beam").
+            heuristic (str): The heuristic of the "beam" mode ("manhattan" or "misplaced").
+            beam_width (int): The number of states kept per layer in the "beam" mode.
+            stats (bool): Whether every solve leaves a search_stats.SearchStats in self.stats
+                (its open list is the current layer).
+        """
+        self.n = size  # Puzzle size (n x n)
+        self.mode = mode
+        self.heuristic_kind = heuristic
+        self.beam_width = beam_width
+        self.collect_stats = stats  # Whether solves build a SearchStats
+        self.stats = None  # SearchStats of the last solve, when they are collected
+        self.expanded = 0  # Number of nodes expanded by the last solve
+
+    def process(self, start, goal, puzzle_display, next_step_callback, mode=None):
+        """
+        Solves the puzzle, like Puzzle.process.
+
+        Args:
+            start (list of list): The initial puzzle configuration.
+            goal (list of list): The goal puzzle configuration.
+            puzzle_display (function): Function to display the puzzle state (not used in this method but passed for integration).
+            next_step_callback (function): A callback function called with the solution path.
+            mode (str): The mode for this solve (defaults to the one given to the constructor).
+
+        Returns:
+            list: A list of Node objects representing the sequence of puzzle states from start to goal.
+
+        Raises:
+            ValueError: If the configurations are not valid puzzles of this size, the mode is unknown,
+                or no solution was found.
+        """
+        board = Board.for_states(start, goal)
+        if board.rows != self.n or board.cols != self.n:
+            raise ValueError(f"Expected a {self.n}x{self.n} puzzle.")
+        if not is_solvable(start, goal):
+            raise ValueError("Puzzle is unsolvable.")
+        mode = mode or self.mode
+        if mode not in ("bfs", "beam"):
+            raise ValueError(f"Unknown mode '{mode}', expected 'bfs' or 'beam'")
+        start_state, start_blank = board.encode(start)
+        goal_state, _ = board.encode(goal)
+        expander = BatchExpander(board, board.unpack(goal_state))
+
+        moves = self.search(expander, board.unpack(start_state), goal_state, mode)
+        steps = path_from_moves(board, start_state, start_blank, moves)
+        next_step_callback(steps)
+        return steps
+
+    def search(self, expander, start, goal, mode):
+        """
+        Runs the layered search.
+
+        Args:
+            expander (BatchExpander): The batched move generator.
+            start (sequence of int): The tile code of every cell of the start configuration.
+            goal (int): The packed goal configuration.
+            mode (str): "bfs" or "beam".
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+        """
+        goal_key = np.uint64(goal)
+        states = np.array([start], dtype=np.uint8)
+        blanks = np.array([list(start).index(0)], dtype=np.int64)
+        keys = expander.keys(states)
+
+        # Every layer keeps (parent row in the previous layer, move index) for the path
+        layers = [(np.array([-1]), np.array([0], dtype=np.uint8))]
+        previous = np.empty(0, dtype=np.uint64)  # Keys of the layer before the current one
+        seen = keys  # Every key seen so far (beam mode only)
+        self.expanded = 0
+        self.stats = None
+        began = time.perf_counter()
+        generated = duplicates = 0
+        pushes = peak_open = 1
+
+        while True:
+            found = np.nonzero(keys == goal_key)[0]
+            if len(found):
+                if self.collect_stats:
+                    self.stats = SearchStats(
+                        f"batch_{mode}",
+                        expanded=self.expanded,
+                        generated=generated,
+                        duplicates=duplicates,
+                        pushes=pushes,
+                        pops=self.expanded,
+                        peak_open=peak_open,
+                        seconds=time.perf_counter() - began,
+                    )
+                return self.path(layers, int(found[0]))
+            if not len(states):
+                # An exhausted breadth-first search has seen every reachable state
+                raise ValueError("Puzzle is unsolvable." if mode == "bfs" else "Beam search found no solution.")
+
+            self.expanded += len(states)
+            children, child_blanks, parents, moves = expander.expand(states, blanks)
+            child_keys = expander.keys(children)
+
+            # Keep the first copy of every key, then drop keys that were already reached
+            child_keys, first = np.unique(child_keys, return_index=True)
+            if mode == "bfs":
+                fresh = ~np.isin(child_keys, previous) & ~np.isin(child_keys, keys)
+            else:
+                fresh = ~np.isin(child_keys, seen)
+            first = first[fresh]
+            generated += len(children)
+            duplicates += len(children) - len(first)
+
+            if mode == "beam" and len(first) > self.beam_width:
+                h = expander.heuristic(children[first], self.heuristic_kind)
+                first = first[np.argpartition(h, self.beam_width)[: self.beam_width]]
+
+            previous = keys
+            states = children[first]
+            blanks = child_blanks[first]
+            keys = child_keys[fresh] if mode == "bfs" else expander.keys(states)
+            if mode == "beam":
+                seen = np.union1d(seen, keys)
+            layers.append((parents[first], moves[first]))
+            pushes += len(states)
+            peak_open = max(peak_open, len(states))
+
+    @staticmethod
+    def path(layers, row):
+        """
+        Walks the parent rows back from a state of the last layer.
+
+        Args:
+            layers (list of tuple): (parents, moves) arrays of every layer.
+            row (int): The row of the goal in the last layer.
+
+        Returns:
+            str: The moves of the blank space from start to goal.
+        """
+        moves = []
+        for parents, layer_moves in reversed(layers[1:]):
+            moves.append(MOVES[layer_moves[row]])
+            row = int(parents[row])
+        moves.reverse()
+        return "".join(moves)
+
+
+if __name__ == "__main__":
+    start_grid = [["8", "6", "7"], ["2", "5", "4"], ["3", "_", "1"]]  # 31 moves, the hardest 8-puzzle
+    goal_grid = [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]]
+    for mode in ("bfs", "beam"):
+        solver = BatchSearch(3, mode=mode)
+        began = time.perf_counter()
+        path = solver.process(start_grid, goal_grid, None, lambda steps: None)
+        print(f"{mode:>4}: {len(path) - 1} moves, {solver.expanded} expanded, {time.perf_counter() - began:.2f}s")
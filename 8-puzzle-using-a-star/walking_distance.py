@@ -0,0 +1,315 @@
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from heuristics import HEURISTICS, Heuristic
+
+MAGIC = b"WDT1"
+HEADER = struct.Struct("<4sBBBI")  # magic, lines, tiles per line, goal line of the blank space, number of configurations
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+
+class WalkingDistanceTable:
+    """
+    This class holds the walking distance along one axis: the exact number of moves needed to
+    bring every tile back to its goal line (row, or column for the horizontal axis) when only
+    the lines are considered. A configuration is the number of tiles of every goal line in
+    every line plus the line of the blank space, so the whole axis of the 15-puzzle has only
+    24,964 configurations. It is built once by breadth-first search from the goal and stored
+    on disk as the sorted configuration codes followed by one byte of distance per code.
+
+    A configuration code is a mixed-radix number with one digit per (line, goal line) count.
+    The count of the last goal line follows from the others and is left out, and the line of
+    the blank space is the highest digit.
+    """
+
+    def __init__(self, lines, width, blank, codes, distances):
+        """
+        Initializes the table.
+
+        Args:
+            lines (int): The number of lines along the axis (rows for the vertical axis).
+            width (int): The number of tiles of a full line.
+            blank (int): The goal line of the blank space.
+            codes (sequence of int): The configuration codes, in increasing order.
+            distances (bytes-like): The distance of every code.
+        """
+        self.lines = lines
+        self.width = width
+        self.blank = blank
+        self.base = width + 1  # Radix of the count digits
+        self.distance = dict(zip(codes, distances))  # Configuration code -> moves along the axis
+
+    def weight(self, line, goal_line):
+        """
+        Returns what one tile adds to a configuration code.
+
+        Args:
+            line (int): The line the tile is in.
+            goal_line (int): The goal line of the tile.
+
+        Returns:
+            int: The weight of the (line, goal line) digit, 0 for the last goal line.
+        """
+        if goal_line == self.lines - 1:
+            return 0
+        return self.base ** (line * (self.lines - 1) + goal_line)
+
+    def blank_weight(self, line):
+        """
+        Returns what the blank space adds to a configuration code.
+
+        Args:
+            line (int): The line of the blank space.
+
+        Returns:
+            int: The weight of the blank digit.
+        """
+        return line * self.base ** (self.lines * (self.lines - 1))
+
+    @staticmethod
+    def file_name(lines, width, blank):
+        """
+        Returns the file name used for a walking distance table in a directory.
+
+        Args:
+            lines (int): The number of lines along the axis.
+            width (int): The number of tiles of a full line.
+            blank (int): The goal line of the blank space.
+
+        Returns:
+            str: The file name.
+        """
+        return f"wd-{lines}x{width}-b{blank}.wdt"
+
+    @classmethod
+    def build(cls, lines, width, blank):
+        """
+        Builds the table by breadth-first search from the goal configuration. A move takes a
+        tile from a line next to the blank space into the line of the blank space.
+
+        Args:
+            lines (int): The number of lines along the axis.
+            width (int): The number of tiles of a full line.
+            blank (int): The goal line of the blank space.
+
+        Returns:
+            WalkingDistanceTable: The table.
+        """
+        table = cls(lines, width, blank, (), b"")
+
+        def encode(counts, line):
+            code = table.blank_weight(line)
+            for cell, count in enumerate(counts):
+                if count:
+                    code += count * table.weight(*divmod(cell, lines))
+            return code
+
+        counts = [0] * (lines * lines)  # counts[line * lines + goal line]
+        for line in range(lines):
+            counts[line * lines + line] = width - (line == blank)
+        distance = {encode(counts, blank): 0}
+
+        depth = 0
+        frontier = [(tuple(counts), blank)]
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for counts, line in frontier:
+                for source in (line - 1, line + 1):
+                    if not 0 <= source < lines:
+                        continue
+                    for goal_line in range(lines):
+                        if not counts[source * lines + goal_line]:
+                            continue
+                        child = list(counts)
+                        child[source * lines + goal_line] -= 1
+                        child[line * lines + goal_line] += 1
+                        code = encode(child, source)
+                        if code not in distance:
+                            distance[code] = depth
+                            next_frontier.append((tuple(child), source))
+            frontier = next_frontier
+
+        codes = sorted(distance)
+        return cls(lines, width, blank, codes, bytes(distance[code] for code in codes))
+
+    def save(self, path):
+        """
+        Writes the table to a file.
+
+        Args:
+            path (str): The file to write.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        codes = array("Q", sorted(self.distance))
+        distances = bytes(self.distance[code] for code in codes)
+        if sys.byteorder == "big":
+            codes.byteswap()  # Files are little-endian
+        # Every writer has its own temp file, so processes building the same file at once do not clash
+        fd, temp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, self.lines, self.width, self.blank, len(codes)))
+                f.write(codes.tobytes())
+                f.write(distances)
+            os.replace(temp_path, path)  # Readers never see a partly written file
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a walking distance table file.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            WalkingDistanceTable: The table.
+
+        Raises:
+            ValueError: If the file is not a walking distance table.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, lines, width, blank, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a walking distance table file.")
+        codes = array("Q")
+        end = HEADER.size + count * codes.itemsize
+        codes.frombytes(data[HEADER.size : end])
+        if sys.byteorder == "big":
+            codes.byteswap()
+        distances = data[end:]
+        if len(codes) != count or len(distances) != count:
+            raise ValueError(f"{path} is truncated.")
+        return cls(lines, width, blank, codes, distances)
+
+    @classmethod
+    def open(cls, lines, width, blank, directory=DEFAULT_DIRECTORY):
+        """
+        Loads a walking distance table from a directory, building and saving it first if needed.
+
+        Args:
+            lines (int): The number of lines along the axis.
+            width (int): The number of tiles of a full line.
+            blank (int): The goal line of the blank space.
+            directory (str): The directory of the table files.
+
+        Returns:
+            WalkingDistanceTable: The table.
+        """
+        path = os.path.join(directory, cls.file_name(lines, width, blank))
+        if not os.path.exists(path):
+            cls.build(lines, width, blank).save(path)
+        return cls.load(path)
+
+
+class WalkingDistance(Heuristic):
+    """
+    Adds the vertical and the horizontal walking distance. A move only moves one tile along
+    one axis, so each table bounds the moves along its axis and the sum stays admissible. It
+    dominates Manhattan distance, since tiles of the same goal line get in each other's way.
+
+    The code of a configuration along an axis is the sum of a weight per (cell, tile), so a
+    move changes it by four table lookups. The codes of the parent are computed once and
+    reused for all its children.
+    """
+
+    name = "walking_distance"
+    uses_tiles = True
+
+    def __init__(self, board, goal, directory=DEFAULT_DIRECTORY):
+        """
+        Initializes the heuristic, loading (or building) the table of both axes.
+
+        Args:
+            board (Board): The layout of the puzzle.
+            goal (sequence of int): The tile code of every cell in the goal configuration.
+            directory (str): The directory of the table files.
+        """
+        super().__init__(board, goal)
+        rows, cols = board.rows, board.cols
+        blank_row, blank_col = divmod(self.goal_index[0], cols)
+        self.vertical = WalkingDistanceTable.open(rows, cols, blank_row, directory)
+        if (cols, rows, blank_col) == (rows, cols, blank_row):
+            self.horizontal = self.vertical  # Square board with the blank space on the diagonal
+        else:
+            self.horizontal = WalkingDistanceTable.open(cols, rows, blank_col, directory)
+
+        # weights[cell][tile] is what the tile adds to the code of its axis when it is in the cell
+        self.vertical_weights = []
+        self.horizontal_weights = []
+        for cell in range(board.cells):
+            row, col = divmod(cell, cols)
+            vertical = [self.vertical.blank_weight(row)]
+            horizontal = [self.horizontal.blank_weight(col)]
+            for tile in range(1, board.cells):
+                goal_row, goal_col = divmod(self.goal_index[tile], cols)
+                vertical.append(self.vertical.weight(row, goal_row))
+                horizontal.append(self.horizontal.weight(col, goal_col))
+            self.vertical_weights.append(vertical)
+            self.horizontal_weights.append(horizontal)
+
+        self.parent = None  # Tiles of the last configuration whose codes were computed
+        self.parent_codes = None  # Its (vertical, horizontal) codes
+
+    def codes(self, tiles):
+        """
+        Returns the vertical and horizontal configuration codes of a configuration.
+
+        Args:
+            tiles (sequence of int): The tile code of every cell.
+
+        Returns:
+            tuple: (vertical code, horizontal code).
+        """
+        key = tiles if type(tiles) is tuple else tuple(tiles)  # Searches may change a list in place
+        if key != self.parent:
+            self.parent = key
+            self.parent_codes = (
+                sum(map(list.__getitem__, self.vertical_weights, key)),
+                sum(map(list.__getitem__, self.horizontal_weights, key)),
+            )
+        return self.parent_codes
+
+    def evaluate(self, tiles):
+        vertical, horizontal = self.codes(tiles)
+        return self.vertical.distance[vertical] + self.horizontal.distance[horizontal]
+
+    def delta(self, tiles, tile, src, dst):
+        vertical, horizontal = self.codes(tiles)
+        if src % self.board.cols == dst % self.board.cols:
+            code, weights, distance = vertical, self.vertical_weights, self.vertical.distance
+        else:
+            code, weights, distance = horizontal, self.horizontal_weights, self.horizontal.distance
+        # The tile goes from src to dst and the blank space from dst to src
+        child = code - weights[src][tile] + weights[dst][tile] - weights[dst][0] + weights[src][0]
+        return distance[child] - distance[code]
+
+
+HEURISTICS[WalkingDistance.name] = WalkingDistance
+
+
+if __name__ == "__main__":
+    import time
+
+    from a_star_algorithm import Puzzle
+
+    began = time.perf_counter()
+    table = WalkingDistanceTable.open(4, 4, 3)
+    print(f"4x4 table: {len(table.distance)} configurations, {time.perf_counter() - began:.2f}s")
+
+    start_grid = [["13", "2", "10", "3"], ["1", "12", "8", "4"], ["5", "_", "9", "6"], ["15", "14", "11", "7"]]
+    goal_grid = [["1", "2", "3", "4"], ["5", "6", "7", "8"], ["9", "10", "11", "12"], ["13", "14", "15", "_"]]
+    for kind in ("manhattan", "linear_conflict", "walking_distance"):
+        puzzle = Puzzle(4, heuristic=kind)
+        began = time.perf_counter()
+        path = puzzle.process(start_grid, goal_grid, None, lambda steps: None)
+        print(f"{kind:>16}: {len(path) - 1} moves, {puzzle.expanded} expanded, {time.perf_counter() - began:.2f}s")